@@ -0,0 +1,135 @@
+"""
+Benchmark comparing the legacy indented JSON cache against the columnar cache.
+
+Generates a synthetic full-race location pull, writes it in both formats and
+measures load time and peak RSS growth, each load in a fresh process.
+
+Usage:
+    python benchmark_cache.py [rows]
+"""
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from telemetry_cache import (
+    columnar_path,
+    columns_to_records,
+    load_columns,
+    load_schema,
+    records_to_columns,
+    save_columns,
+)
+
+
+def make_location_records(rows: int, drivers: int = 20):
+    """
+    Build synthetic OpenF1 location records.
+    
+    :param rows: Total number of records
+    :param drivers: Number of drivers to spread the records over
+    :returns: List of location records
+    """
+    rng = np.random.default_rng(0)
+    start_us = 1726405200 * 1_000_000
+    offsets_us = np.sort(rng.integers(0, 2 * 3600 * 1_000_000, rows))
+    stamps = np.datetime_as_string((start_us + offsets_us).astype("datetime64[us]"), unit="us")
+    xs = rng.integers(-10000, 10000, rows).tolist()
+    ys = rng.integers(-10000, 10000, rows).tolist()
+    zs = rng.integers(0, 1000, rows).tolist()
+    return [
+        {
+            "date": f"{stamps[i]}+00:00",
+            "driver_number": int(i % drivers) + 1,
+            "meeting_key": 1242,
+            "session_key": 9598,
+            "x": xs[i],
+            "y": ys[i],
+            "z": zs[i],
+        }
+        for i in range(rows)
+    ]
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss survives fork+exec, so it would include the parent's peak; prefer VmHWM
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _load_json(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return len(json.load(f))
+
+
+def _load_columnar_records(path: Path):
+    schema = load_schema(path)
+    return len(columns_to_records(load_columns(path, schema=schema), schema["kinds"]))
+
+
+def _load_columnar_arrays(path: Path):
+    columns = load_columns(path)
+    return len(columns["x"]), float(columns["x"].sum())
+
+
+LOADERS = {
+    "json (list of dicts)": _load_json,
+    "columnar -> list of dicts": _load_columnar_records,
+    "columnar (mmap arrays)": _load_columnar_arrays,
+}
+
+
+def _measure(name: str, path: str, queue) -> None:
+    baseline = _peak_rss_kb()
+    start = time.perf_counter()
+    LOADERS[name](Path(path))
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, _peak_rss_kb() - baseline))
+
+
+def run(rows: int = 400_000) -> None:
+    """
+    Run the benchmark and print a results table.
+    
+    :param rows: Number of synthetic location records
+    """
+    records = make_location_records(rows)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = Path(tmp) / "location_bench.json"
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+        cols_dir = columnar_path(json_file)
+        save_columns(cols_dir, records_to_columns(records))
+        del records
+        
+        json_size = json_file.stat().st_size
+        cols_size = sum(p.stat().st_size for p in cols_dir.iterdir())
+        print(f"Rows: {rows}")
+        print(f"On-disk size: json {json_size / 1e6:.1f} MB, columnar {cols_size / 1e6:.1f} MB")
+        print(f"{'format':<28}{'load (s)':>10}{'peak RSS +MB':>14}")
+        
+        ctx = multiprocessing.get_context("spawn")
+        for name in LOADERS:
+            path = json_file if name.startswith("json") else cols_dir
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_measure, args=(name, str(path), queue))
+            proc.start()
+            elapsed, rss_kb = queue.get()
+            proc.join()
+            print(f"{name:<28}{elapsed:>10.3f}{rss_kb / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 400_000)
@@ -0,0 +1,117 @@
+"""
+Benchmark for the matplotlib car animation frame update.
+
+Compares the previous per-frame approach (copy the trimesh mesh, transform
+it, remove the old artist and create a new plot_trisurf) against posing a
+cached LOD into a preallocated buffer and updating the existing artist in
+place. Both include an Agg canvas draw, so the numbers are full frame times.
+
+Usage:
+    python benchmark_car_frames.py [car.stl] [frames]
+"""
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import trimesh
+
+from mesh_lod import TransformBuffer, build_lods
+from orientation import heading_quaternions, quaternions_to_matrices
+
+
+def _path(frames: int) -> np.ndarray:
+    angles = np.linspace(0, 2 * np.pi, frames)
+    return np.column_stack((100 * np.cos(angles), 100 * np.sin(angles), np.zeros(frames)))
+
+
+def _setup_axes(positions):
+    fig = plt.figure(figsize=(8, 6))
+    ax = fig.add_subplot(111, projection='3d')
+    ax.set_xlim(positions[:, 0].min() - 10, positions[:, 0].max() + 10)
+    ax.set_ylim(positions[:, 1].min() - 10, positions[:, 1].max() + 10)
+    ax.set_zlim(-10, 10)
+    return fig, ax
+
+
+def run_copy_per_frame(car_mesh, positions, rotations):
+    """
+    Time frames using the previous copy-and-recreate approach.
+    
+    :returns: (frames, 2) array of update and full frame times in seconds
+    """
+    fig, ax = _setup_axes(positions)
+    poly = None
+    times = []
+    for position, rotation in zip(positions, rotations):
+        start = time.perf_counter()
+        transform = np.eye(4)
+        transform[:3, :3] = rotation
+        posed = car_mesh.copy()
+        posed.apply_transform(transform)
+        posed.apply_translation(position)
+        if poly is not None:
+            poly.remove()
+        vertices = posed.vertices
+        poly = ax.plot_trisurf(vertices[:, 0], vertices[:, 1], vertices[:, 2],
+                               triangles=posed.faces, color='red', alpha=0.9, shade=True)
+        updated = time.perf_counter()
+        fig.canvas.draw()
+        times.append((updated - start, time.perf_counter() - start))
+    plt.close(fig)
+    return np.array(times)
+
+
+def run_in_place(car_mesh, positions, rotations, max_faces):
+    """
+    Time frames using cached LODs, a transform buffer and in-place artist updates.
+    
+    :returns: (frames, 2) array of update and full frame times in seconds
+    """
+    fig, ax = _setup_axes(positions)
+    buffer = TransformBuffer(*build_lods(car_mesh, (max_faces,)).level(max_faces))
+    buffer.transform(rotations[0], positions[0])
+    poly = ax.plot_trisurf(buffer.world[:, 0], buffer.world[:, 1], buffer.world[:, 2],
+                           triangles=buffer.faces, color='red', alpha=0.9, shade=True)
+    times = []
+    for position, rotation in zip(positions, rotations):
+        start = time.perf_counter()
+        poly.set_verts(buffer.transform(rotation, position))
+        updated = time.perf_counter()
+        fig.canvas.draw()
+        times.append((updated - start, time.perf_counter() - start))
+    plt.close(fig)
+    return np.array(times)
+
+
+def run(car_path: str = None, frames: int = 100, max_faces: int = 5000) -> None:
+    """
+    Run the benchmark and print a results table.
+    
+    :param car_path: Car model file (defaults to a 5120-face sphere)
+    :param frames: Number of frames to time per approach
+    :param max_faces: Face budget for the cached LOD
+    """
+    car_mesh = trimesh.load(car_path) if car_path else trimesh.creation.icosphere(subdivisions=4, radius=3.0)
+    positions = _path(frames)
+    rotations = quaternions_to_matrices(heading_quaternions(positions))
+    
+    results = {
+        "copy + new plot_trisurf": run_copy_per_frame(car_mesh, positions, rotations),
+        "LOD buffer + set_verts": run_in_place(car_mesh, positions, rotations, max_faces),
+    }
+    print(f"Car faces: {len(car_mesh.faces)}, frames: {frames}")
+    print(f"{'approach':<28}{'update (ms)':>12}{'frame (ms)':>12}{'p95 (ms)':>10}{'fps':>8}")
+    for name, times in results.items():
+        update_ms, frame_ms = times[:, 0] * 1000, times[:, 1] * 1000
+        print(f"{name:<28}{update_ms.mean():>12.2f}{frame_ms.mean():>12.1f}"
+              f"{np.percentile(frame_ms, 95):>10.1f}{1000 / frame_ms.mean():>8.1f}")
+
+
+if __name__ == "__main__":
+    run(
+        sys.argv[1] if len(sys.argv) > 1 else None,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    )
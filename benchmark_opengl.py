@@ -0,0 +1,103 @@
+"""
+Benchmark for the ModernGL renderer in a headless offscreen context.
+
+Renders a synthetic oval track and a grid of sphere "cars" with the
+instanced RaceRenderer, for growing numbers of cars, and compares one
+instanced draw call per frame against one draw call per car. Frame times
+include computing the instance matrices from telemetry and reading the
+frame back, so they are comparable with benchmark_car_frames.py. Runs on
+a software GL stack (Mesa llvmpipe through EGL) when no GPU is present.
+
+Usage:
+    python benchmark_opengl.py [frames] [width] [height]
+"""
+import sys
+import time
+
+import numpy as np
+import trimesh
+
+from opengl_race_animation import CarPaths, RaceRenderer, create_offscreen_context
+from playback import PlaybackTimeline
+
+CAR_COUNTS = (1, 5, 10, 20)
+
+
+def _track() -> tuple:
+    """
+    Flat oval ribbon, 3000 x 1500 units.
+    """
+    angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    inner = np.column_stack((2900 * np.cos(angles), 1400 * np.sin(angles), np.zeros_like(angles)))
+    outer = np.column_stack((3100 * np.cos(angles), 1600 * np.sin(angles), np.zeros_like(angles)))
+    count = len(angles)
+    following = (np.arange(count) + 1) % count
+    faces = np.concatenate((
+        np.column_stack((np.arange(count), following, count + np.arange(count))),
+        np.column_stack((following, count + following, count + np.arange(count))),
+    ))
+    return np.vstack((inner, outer)).astype(np.float32), faces.astype(np.int32)
+
+
+def _paths(cars: int, frames: int) -> CarPaths:
+    times = np.arange(frames + 1) / 60.0
+    angles = np.arange(cars)[:, None] * 2 * np.pi / cars + (0.5 + 0.01 * np.arange(cars))[:, None] * times
+    positions = np.stack((3000 * np.cos(angles), 1500 * np.sin(angles), np.full_like(angles, 40.0)), axis=-1)
+    return CarPaths(times, positions)
+
+
+def run_frames(renderer: RaceRenderer, paths: CarPaths, frames: int, instanced: bool = True) -> np.ndarray:
+    """
+    Time frames: pose the cars, draw them and read the frame back.
+    
+    :returns: (frames,) array of frame times in seconds
+    """
+    timeline = PlaybackTimeline(paths.times, loop=False)
+    times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        timeline.seek(paths.times[frame])
+        positions, rotations = paths.pose(timeline)
+        if instanced:
+            renderer.update_cars(positions, rotations)
+            renderer.render()
+        else:
+            renderer.update_cars(positions[:0], rotations[:0])
+            renderer.render()
+            for car in range(paths.cars):
+                renderer.update_cars(positions[car:car + 1], rotations[car:car + 1])
+                renderer.car_vao.render(instances=1)
+        renderer.read_pixels()
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def run(frames: int = 120, size=(1280, 720)) -> None:
+    """
+    Run the benchmark and print a results table.
+    
+    :param frames: Number of frames to time per car count
+    :param size: Framebuffer size in pixels
+    """
+    ctx = create_offscreen_context()
+    car = trimesh.creation.icosphere(subdivisions=4, radius=40.0)
+    renderer = RaceRenderer(ctx, _track(), (car.vertices, car.faces), max_cars=max(CAR_COUNTS), size=size)
+    
+    print(f"Renderer: {ctx.info['GL_RENDERER']}, {size[0]}x{size[1]}, car faces: {len(car.faces)}, frames: {frames}")
+    print(f"{'cars':>5}  {'draw calls':<16}{'frame (ms)':>12}{'p95 (ms)':>10}{'fps':>8}")
+    for cars in CAR_COUNTS:
+        paths = _paths(cars, frames)
+        for name, instanced in (("one per car", False), ("instanced", True)):
+            run_frames(renderer, paths, min(frames, 5), instanced)
+            frame_ms = run_frames(renderer, paths, frames, instanced) * 1000
+            print(f"{cars:>5}  {name:<16}{frame_ms.mean():>12.2f}{np.percentile(frame_ms, 95):>10.2f}"
+                  f"{1000 / frame_ms.mean():>8.1f}")
+    renderer.release()
+    ctx.release()
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 120,
+        (int(sys.argv[2]) if len(sys.argv) > 2 else 1280, int(sys.argv[3]) if len(sys.argv) > 3 else 720)
+    )
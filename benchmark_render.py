@@ -0,0 +1,70 @@
+"""
+Benchmark for offline parallel rendering.
+
+Renders the same stretch of a synthetic multi-car session replay to PNG
+frames with increasing numbers of worker processes and reports total
+throughput, frames per second per worker and speedup over one worker.
+Times include starting the workers and building the scene in each, so
+short runs understate the steady-state speedup.
+
+Usage:
+    python benchmark_render.py [frames] [max_workers]
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from openf1_client import build_animation_scene
+from render import render_frames
+
+
+def make_session(cars: int = 20, seconds: float = 120.0, rate: float = 4.0) -> dict:
+    """
+    Location records for cars lapping an oval at slightly different speeds.
+    
+    :returns: Mapping of driver number to location records
+    """
+    start = datetime(2024, 5, 26, 13, 0, tzinfo=timezone.utc)
+    times = np.arange(0, seconds, 1 / rate)
+    session = {}
+    for car in range(cars):
+        angles = car * 2 * np.pi / cars + (0.05 + 0.001 * car) * times
+        session[car + 1] = [
+            {"date": (start + timedelta(seconds=float(t))).isoformat(), "x": 3000 * np.cos(a),
+             "y": 1500 * np.sin(a), "z": 20 * np.sin(2 * a), "driver_number": car + 1}
+            for t, a in zip(times, angles)
+        ]
+    return session
+
+
+def run(frames: int = 120, max_workers: int = None) -> None:
+    """
+    Run the benchmark and print a results table.
+    
+    :param frames: Number of frames rendered per worker count
+    :param max_workers: Largest pool size tried (defaults to the CPU count, at least 2)
+    """
+    max_workers = max_workers or max(2, os.cpu_count() or 1)
+    counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < max_workers], max_workers})
+    kwargs = {"method": "animate_session_replay", "kwargs": {"telemetry": make_session(), "trail_seconds": 10.0}}
+    
+    print(f"Session replay, 20 cars, {frames} frames, CPUs: {os.cpu_count()}")
+    print(f"{'workers':>8}{'seconds':>10}{'fps':>8}{'fps/worker':>12}{'speedup':>9}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in counts:
+            stats = render_frames(build_animation_scene, kwargs, os.path.join(tmp, f"w{workers}"),
+                                  workers=workers, dpi=80, frame_range=(0, frames))
+            baseline = baseline or stats["fps"]
+            print(f"{workers:>8}{stats['seconds']:>10.2f}{stats['fps']:>8.1f}"
+                  f"{stats['fps_per_worker']:>12.1f}{stats['fps'] / baseline:>9.2f}")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 120,
+        int(sys.argv[2]) if len(sys.argv) > 2 else None
+    )
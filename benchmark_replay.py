@@ -0,0 +1,129 @@
+"""
+Benchmark for the multi-car replay frame update.
+
+Compares drawing every car with its own artists (a quiver removed and
+recreated each frame plus a trail line, as the single-car arrow animation
+does) against the batched CarArtists, which update one scatter and two
+line collections in place. Both include an Agg canvas draw, so the numbers
+are full frame times as cars are added.
+
+Usage:
+    python benchmark_replay.py [frames] [projection]
+"""
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from replay import CarArtists
+
+CAR_COUNTS = (1, 2, 5, 10, 20)
+TRAIL_FRAMES = 100
+
+
+def _grid(cars: int, frames: int) -> tuple:
+    """
+    Cars spread round a circle, each with its own lap time.
+    
+    :returns: (positions, headings), both (cars, frames + TRAIL_FRAMES, 3)
+    """
+    steps = np.arange(frames + TRAIL_FRAMES)
+    speeds = np.linspace(0.010, 0.012, cars)[:, None]
+    angles = np.arange(cars)[:, None] * 2 * np.pi / max(cars, 1) + speeds * steps
+    positions = np.stack((1000 * np.cos(angles), 1000 * np.sin(angles), 10 * np.sin(3 * angles)), axis=-1)
+    headings = np.stack((-np.sin(angles), np.cos(angles), np.zeros_like(angles)), axis=-1)
+    return positions, headings
+
+
+def _setup_axes(projection: str):
+    fig = plt.figure(figsize=(8, 6))
+    ax = fig.add_subplot(111, projection='3d') if projection == "3d" else fig.add_subplot(111)
+    ax.set_xlim(-1100, 1100)
+    ax.set_ylim(-1100, 1100)
+    if projection == "3d":
+        ax.set_zlim(-50, 50)
+    return fig, ax
+
+
+def run_per_car(positions, headings, frames: int, projection: str = "3d"):
+    """
+    Time frames with one quiver and one trail line per car.
+    
+    :returns: (frames, 2) array of update and full frame times in seconds
+    """
+    fig, ax = _setup_axes(projection)
+    is_3d = projection == "3d"
+    axes = 3 if is_3d else 2
+    trails = [ax.plot(*np.zeros((axes, 1)), '-', linewidth=1.5, alpha=0.6)[0] for _ in positions]
+    arrows = [None] * len(positions)
+    times = []
+    for frame in range(TRAIL_FRAMES, TRAIL_FRAMES + frames):
+        start = time.perf_counter()
+        for car in range(len(positions)):
+            if arrows[car] is not None:
+                arrows[car].remove()
+            position = positions[car, frame, :axes]
+            direction = headings[car, frame, :axes] * 150
+            if is_3d:
+                arrows[car] = ax.quiver(*position, *direction, color='red', arrow_length_ratio=0.3, linewidth=3)
+            else:
+                arrows[car] = ax.quiver(*position, *direction, color='red', angles='xy', scale_units='xy', scale=1)
+            trail = positions[car, frame - TRAIL_FRAMES + 1:frame + 1]
+            trails[car].set_data(trail[:, 0], trail[:, 1])
+            if is_3d:
+                trails[car].set_3d_properties(trail[:, 2])
+        updated = time.perf_counter()
+        fig.canvas.draw()
+        times.append((updated - start, time.perf_counter() - start))
+    plt.close(fig)
+    return np.array(times)
+
+
+def run_batched(positions, headings, frames: int, projection: str = "3d"):
+    """
+    Time frames with CarArtists updating all cars in one call.
+    
+    :returns: (frames, 2) array of update and full frame times in seconds
+    """
+    fig, ax = _setup_axes(projection)
+    cars = CarArtists(ax, len(positions))
+    times = []
+    for frame in range(TRAIL_FRAMES, TRAIL_FRAMES + frames):
+        start = time.perf_counter()
+        cars.update(positions[:, frame], headings[:, frame], positions[:, frame - TRAIL_FRAMES + 1:frame + 1])
+        updated = time.perf_counter()
+        fig.canvas.draw()
+        times.append((updated - start, time.perf_counter() - start))
+    plt.close(fig)
+    return np.array(times)
+
+
+def run(frames: int = 50, projection: str = "3d") -> None:
+    """
+    Run the benchmark for growing grids and print a results table.
+    
+    :param frames: Number of frames to time per approach and car count
+    :param projection: '3d' or '2d'
+    """
+    print(f"Projection: {projection}, frames: {frames}, trail: {TRAIL_FRAMES} samples")
+    print(f"{'cars':>5}  {'approach':<22}{'update (ms)':>12}{'frame (ms)':>12}{'p95 (ms)':>10}{'fps':>8}")
+    for cars in CAR_COUNTS:
+        positions, headings = _grid(cars, frames)
+        results = {
+            "per-car artists": run_per_car(positions, headings, frames, projection),
+            "batched CarArtists": run_batched(positions, headings, frames, projection),
+        }
+        for name, times in results.items():
+            update_ms, frame_ms = times[:, 0] * 1000, times[:, 1] * 1000
+            print(f"{cars:>5}  {name:<22}{update_ms.mean():>12.2f}{frame_ms.mean():>12.1f}"
+                  f"{np.percentile(frame_ms, 95):>10.1f}{1000 / frame_ms.mean():>8.1f}")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        sys.argv[2] if len(sys.argv) > 2 else "3d"
+    )
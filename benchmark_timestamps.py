@@ -0,0 +1,84 @@
+"""
+Benchmark for ISO-8601 timestamp parsing.
+
+Compares per-row datetime.fromisoformat against the vectorized
+parse_iso_timestamps on synthetic OpenF1 'date' strings with mixed
+fractional-second precision and offsets, and checks both agree.
+
+Usage:
+    python benchmark_timestamps.py [rows]
+"""
+import sys
+import time
+
+import numpy as np
+
+from telemetry_cache import _parse_iso_timestamp, parse_iso_timestamps, relative_seconds
+
+
+def make_timestamps(rows: int):
+    """
+    Build synthetic OpenF1-style timestamp strings.
+    
+    Mixes whole seconds, millisecond and microsecond fractions, and
+    '+00:00', 'Z' and non-UTC offsets, as seen across API versions.
+    
+    :param rows: Number of strings
+    :returns: List of ISO-8601 strings
+    """
+    rng = np.random.default_rng(0)
+    start_us = 1726405200 * 1_000_000
+    offsets_us = np.sort(rng.integers(0, 2 * 3600 * 1_000_000, rows))
+    stamps = np.datetime_as_string((start_us + offsets_us).astype("datetime64[us]"), unit="us").tolist()
+    suffixes = ["+00:00", "+00:00", "Z", "+08:00"]
+    result = []
+    for i, stamp in enumerate(stamps):
+        if i % 7 == 0:
+            stamp = stamp[:19]
+        elif i % 5 == 0:
+            stamp = stamp[:23]
+        suffix = suffixes[i % len(suffixes)]
+        if suffix == "+08:00":
+            # Same instant expressed in local time
+            local = np.datetime64(stamp) + np.timedelta64(8, "h")
+            stamp = np.datetime_as_string(local, unit="us" if len(stamp) > 23 else "ms" if len(stamp) > 19 else "s")
+        result.append(stamp + suffix)
+    return result
+
+
+def _time(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows: int = 500_000) -> None:
+    """
+    Run the benchmark and print a results table.
+    
+    :param rows: Number of timestamp strings
+    """
+    values = make_timestamps(rows)
+    
+    expected = np.array([_parse_iso_timestamp(v) for v in values], dtype=np.int64)
+    parsed = parse_iso_timestamps(values)
+    if not np.array_equal(parsed, expected):
+        raise AssertionError("Vectorized parser disagrees with datetime.fromisoformat")
+    
+    results = {
+        "datetime.fromisoformat (per row)": _time(lambda: [_parse_iso_timestamp(v) for v in values], repeat=1),
+        "parse_iso_timestamps (vectorized)": _time(lambda: parse_iso_timestamps(values)),
+        "  + relative_seconds": _time(lambda: relative_seconds(parse_iso_timestamps(values))),
+    }
+    
+    print(f"Rows: {rows}")
+    print(f"{'parser':<36}{'time (s)':>10}{'rows/s':>14}")
+    for name, elapsed in results.items():
+        print(f"{name:<36}{elapsed:>10.3f}{rows / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
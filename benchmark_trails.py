@@ -0,0 +1,123 @@
+"""
+Benchmark for trail updates as a race goes on.
+
+Compares the previous approaches (slicing the whole path up to the
+current sample, and Python lists with pop(0)) against a TrailBuffer push
+and window read, timed at increasing points into a long race. Only the
+trail update and set_data are timed, without drawing, so the numbers show
+how the per-frame cost grows with race length.
+
+Usage:
+    python benchmark_trails.py [cars] [trail_length]
+"""
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from trails import TrailBuffer
+
+RACE_SAMPLES = 200000
+CHECKPOINTS = (1000, 10000, 100000, 199000)
+FRAMES = 200
+
+
+def _race(cars: int) -> np.ndarray:
+    angles = np.linspace(0, 400 * np.pi, RACE_SAMPLES)
+    offsets = np.arange(cars)[:, None] * 0.1
+    return np.stack((np.cos(angles + offsets), np.sin(angles + offsets), np.zeros((cars, RACE_SAMPLES))), axis=-1)
+
+
+def run_slice(race, lines, start: int, trail_length: int) -> float:
+    """
+    Slice each car's path from the start of the race, as plot_3d_track did.
+    
+    :returns: Mean seconds per frame
+    """
+    began = time.perf_counter()
+    for idx in range(start, start + FRAMES):
+        for car, line in enumerate(lines):
+            line.set_data(race[car, :idx + 1, 0], race[car, :idx + 1, 1])
+            line.set_3d_properties(race[car, :idx + 1, 2])
+    return (time.perf_counter() - began) / FRAMES
+
+
+def run_lists(race, lines, start: int, trail_length: int) -> float:
+    """
+    Per-car coordinate lists with append and pop(0), as animate_arrow_from_json did.
+    
+    :returns: Mean seconds per frame
+    """
+    trails = [([], [], []) for _ in lines]
+    for car, (xs, ys, zs) in enumerate(trails):
+        for x, y, z in race[car, start - trail_length:start]:
+            xs.append(x)
+            ys.append(y)
+            zs.append(z)
+    began = time.perf_counter()
+    for idx in range(start, start + FRAMES):
+        for car, line in enumerate(lines):
+            xs, ys, zs = trails[car]
+            x, y, z = race[car, idx]
+            xs.append(x)
+            ys.append(y)
+            zs.append(z)
+            if len(xs) > trail_length:
+                xs.pop(0)
+                ys.pop(0)
+                zs.pop(0)
+            line.set_data(xs, ys)
+            line.set_3d_properties(zs)
+    return (time.perf_counter() - began) / FRAMES
+
+
+def run_ring(race, lines, start: int, trail_length: int) -> float:
+    """
+    One TrailBuffer for every car, pushed once per frame.
+    
+    :returns: Mean seconds per frame
+    """
+    trail = TrailBuffer(len(lines), trail_length)
+    trail.extend(race[:, start - trail_length:start])
+    began = time.perf_counter()
+    for idx in range(start, start + FRAMES):
+        trail.push(race[:, idx])
+        window = trail.window()
+        for car, line in enumerate(lines):
+            line.set_data(window[car, :, 0], window[car, :, 1])
+            line.set_3d_properties(window[car, :, 2])
+    return (time.perf_counter() - began) / FRAMES
+
+
+def run(cars: int = 20, trail_length: int = 200) -> None:
+    """
+    Run the benchmark and print a results table.
+    
+    :param cars: Number of cars
+    :param trail_length: Trail length in samples for the bounded approaches
+    """
+    race = _race(cars)
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    lines = [ax.plot([], [], [])[0] for _ in range(cars)]
+    approaches = {
+        "slice [:idx+1]": run_slice,
+        "lists + pop(0)": run_lists,
+        "TrailBuffer": run_ring,
+    }
+    print(f"Cars: {cars}, trail: {trail_length} samples, frames per point: {FRAMES}")
+    print(f"{'sample':>8}" + "".join(f"{name:>18}" for name in approaches) + "   (ms per frame)")
+    for start in CHECKPOINTS:
+        row = [run_fn(race, lines, start, trail_length) * 1000 for run_fn in approaches.values()]
+        print(f"{start:>8}" + "".join(f"{ms:>18.3f}" for ms in row))
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    )
@@ -9,15 +9,29 @@ This script can be run in Blender:
 
 Or run from command line:
 blender --background --python blender_race_animation.py
+
+Keyframes are not inserted one by one: frame numbers, locations and
+Euler rotations are computed as NumPy arrays and written straight into
+the object's fcurves with keyframe_points.add + foreach_set, so a whole
+grid of cars over a full race keyframes in seconds.
 """
+import colorsys
 import json
+import sys
+import time
 import numpy as np
 from pathlib import Path
 
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from orientation import heading_quaternions, matrices_to_eulers, quaternions_to_matrices
+from mesh_lod import load_mesh_lods
+from replay import session_grid
+from telemetry_frame import TelemetryFrame, concat_frames
+
 try:
     import bpy
     import bmesh
-    from mathutils import Vector, Matrix
     BLENDER_AVAILABLE = True
 except ImportError:
     BLENDER_AVAILABLE = False
@@ -32,18 +46,49 @@ def clear_scene():
     bpy.ops.object.delete(use_global=False)
 
 
+def mesh_from_arrays(name, vertices, faces):
+    """
+    Build a Blender mesh from vertex and triangle arrays in bulk.
+    
+    :param name: Name for the mesh datablock
+    :param vertices: (V, 3) vertex positions
+    :param faces: (F, 3) triangle vertex indices
+    :returns: Blender mesh
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+    mesh.loops.add(len(faces) * 3)
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(faces, dtype=np.int32).ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(faces) * 3, 3, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(len(faces), 3, dtype=np.int32))
+    mesh.update()
+    mesh.validate()
+    return mesh
+
+
 def load_stl(filepath, name, location=(0, 0, 0), scale=(1, 1, 1)):
     """
-    Load an STL file into Blender.
+    Load an STL/OBJ file into Blender.
     
-    :param filepath: Path to STL file
+    Uses the full-detail level of the binary mesh cache (see mesh_lod.py),
+    falling back to Blender's STL importer when the model isn't cached yet
+    and trimesh isn't installed in Blender's Python.
+    
+    :param filepath: Path to STL/OBJ file
     :param name: Name for the object
     :param location: Location tuple (x, y, z)
     :param scale: Scale tuple (x, y, z)
     :returns: Blender object
     """
-    bpy.ops.import_mesh.stl(filepath=str(filepath))
-    obj = bpy.context.active_object
+    try:
+        lods = load_mesh_lods(Path(filepath))
+        obj = bpy.data.objects.new(name, mesh_from_arrays(name, *lods.level()))
+        bpy.context.collection.objects.link(obj)
+    except ImportError:
+        bpy.ops.import_mesh.stl(filepath=str(filepath))
+        obj = bpy.context.active_object
     obj.name = name
     obj.location = location
     obj.scale = scale
@@ -107,32 +152,209 @@ def setup_camera_and_lighting(car_obj):
     empty.location = (0, 0, 0)
 
 
-def calculate_rotation_matrix(direction, up_vector=(0, 0, 1)):
+def load_tel_json(json_path: Path):
     """
-    Calculate rotation matrix from direction vector.
+    Read the time and positions of one car from a telemetry JSON file.
     
-    :param direction: Direction vector (normalized)
-    :param up_vector: Up vector
-    :returns: 4x4 rotation matrix
+    :param json_path: Path to a JSON file with a 'tel' object (e.g. '10_tel.json')
+    :returns: Tuple of (N,) time in seconds and (N, 3) positions
     """
-    direction = Vector(direction).normalized()
-    up = Vector(up_vector)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
     
-    right = direction.cross(up).normalized()
-    if right.length < 0.01:
-        up = Vector((0, 1, 0))
-        right = direction.cross(up).normalized()
+    if 'tel' not in data:
+        raise ValueError("JSON file does not contain 'tel' key")
     
-    true_up = right.cross(direction).normalized()
+    tel = data['tel']
     
-    rot_matrix = Matrix([
-        [right.x, true_up.x, -direction.x, 0],
-        [right.y, true_up.y, -direction.y, 0],
-        [right.z, true_up.z, -direction.z, 0],
-        [0, 0, 0, 1]
-    ])
+    if 'x' not in tel or 'y' not in tel or 'z' not in tel:
+        raise ValueError("JSON file does not contain x, y, z coordinates in 'tel'")
     
-    return rot_matrix.to_3x3().to_4x4()
+    x_coords = np.array(tel['x'], dtype=np.float64)
+    y_coords = np.array(tel['y'], dtype=np.float64)
+    z_coords = np.array(tel['z'], dtype=np.float64)
+    time_data = np.array(tel.get('time', list(range(len(x_coords)))), dtype=np.float64)
+    
+    positions = np.column_stack((x_coords, y_coords, z_coords))
+    
+    if len(time_data) != len(positions):
+        time_data = np.linspace(0, len(positions) * 0.05, len(positions))
+    return time_data, positions
+
+
+def tel_json_frame(json_paths) -> TelemetryFrame:
+    """
+    Combine several telemetry JSON files into one multi-driver frame.
+    
+    The driver number is taken from the file name prefix ('10_tel.json' -> 10),
+    falling back to the file's position in the list.
+    
+    :param json_paths: Paths to telemetry JSON files
+    :returns: TelemetryFrame for session_grid, times counted from a zero epoch
+    """
+    frames = []
+    for index, json_path in enumerate(json_paths):
+        prefix = Path(json_path).stem.split('_')[0]
+        driver_number = int(prefix) if prefix.isdigit() else index + 1
+        time_data, positions = load_tel_json(Path(json_path))
+        frames.append(TelemetryFrame(
+            np.round(time_data * 1e9).astype(np.int64), *positions.T,
+            np.full(len(positions), driver_number)
+        ))
+    return concat_frames(frames)
+
+
+def car_keyframes(
+    times: np.ndarray,
+    positions: np.ndarray,
+    fps: float = 24.0,
+    speed_multiplier: float = 1.0,
+    forward_axis: str = 'y',
+    frame_step: int = 1
+):
+    """
+    Compute one car's keyframes as arrays.
+    
+    Orientations come from the full-rate path; then the first sample on every
+    frame_step-th frame is kept, so each frame has at most one key. Samples
+    with missing positions are dropped.
+    
+    :param times: (N,) time in seconds
+    :param positions: (N, 3) positions, NaN where missing
+    :param fps: Scene frame rate
+    :param speed_multiplier: Speed multiplier (1.0 = real-time)
+    :param forward_axis: Car model's forward direction axis
+    :param frame_step: Key every this many frames
+    :returns: Tuple of (K,) frame numbers, (K, 3) locations and (K, 3) XYZ Euler angles
+    """
+    valid = ~np.isnan(positions).any(axis=1)
+    times = np.asarray(times, dtype=np.float64)[valid]
+    positions = np.asarray(positions, dtype=np.float64)[valid]
+    if len(positions) == 0:
+        return np.empty(0), np.empty((0, 3)), np.empty((0, 3))
+    
+    orientations = heading_quaternions(positions, forward_axis=forward_axis)
+    step = max(1, int(frame_step))
+    frames = (times * fps / speed_multiplier).astype(np.int64) // step * step + 1
+    frames, first = np.unique(frames, return_index=True)
+    eulers = matrices_to_eulers(quaternions_to_matrices(orientations[first]))
+    return frames, positions[first], eulers
+
+
+def _transform_fcurve(action, obj, data_path: str, index: int):
+    """
+    Create an empty fcurve for one transform channel, replacing any existing one.
+    """
+    if hasattr(action, "fcurve_ensure_for_datablock"):
+        # Blender 4.4+ (slotted actions)
+        fcurve = action.fcurve_ensure_for_datablock(obj, data_path, index=index)
+        fcurve.keyframe_points.clear()
+        return fcurve
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is not None:
+        action.fcurves.remove(fcurve)
+    return action.fcurves.new(data_path, index=index, action_group="Object Transforms")
+
+
+def keyframe_arrays(obj, frames: np.ndarray, locations: np.ndarray, eulers: np.ndarray) -> int:
+    """
+    Write location and rotation keyframes for an object in bulk.
+    
+    Fills the six transform fcurves directly with keyframe_points.add and
+    foreach_set instead of calling keyframe_insert per sample.
+    
+    :param obj: Blender object
+    :param frames: (K,) frame numbers
+    :param locations: (K, 3) locations
+    :param eulers: (K, 3) XYZ Euler angles in radians
+    :returns: Number of keyframe points written
+    """
+    obj.rotation_mode = 'XYZ'
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    action = obj.animation_data.action
+    if action is None:
+        action = bpy.data.actions.new(f"{obj.name}Action")
+        obj.animation_data.action = action
+    
+    count = len(frames)
+    co = np.empty((count, 2), dtype=np.float32)
+    co[:, 0] = frames
+    written = 0
+    for data_path, values in (("location", locations), ("rotation_euler", eulers)):
+        for index in range(3):
+            fcurve = _transform_fcurve(action, obj, data_path, index)
+            co[:, 1] = values[:, index]
+            fcurve.keyframe_points.add(count)
+            fcurve.keyframe_points.foreach_set("co", co.ravel())
+            # Sorts the keys and recalculates the auto handles
+            fcurve.update()
+            written += count
+    return written
+
+
+def keyframe_cars(objects, keyframes) -> dict:
+    """
+    Keyframe several cars and report the throughput.
+    
+    :param objects: Blender objects, one per car
+    :param keyframes: (frames, locations, eulers) tuples from car_keyframes, one per car
+    :returns: Dictionary with 'cars', 'keys', 'seconds', 'keys_per_second' and 'last_frame'
+    """
+    began = time.perf_counter()
+    keys = 0
+    last_frame = 1
+    for obj, (frames, locations, eulers) in zip(objects, keyframes):
+        if len(frames) == 0:
+            continue
+        keys += keyframe_arrays(obj, frames, locations, eulers)
+        last_frame = max(last_frame, int(frames[-1]))
+    seconds = time.perf_counter() - began
+    stats = {
+        "cars": len(objects),
+        "keys": keys,
+        "seconds": seconds,
+        "keys_per_second": keys / seconds if seconds > 0 else 0.0,
+        "last_frame": last_frame,
+    }
+    print(f"  Wrote {keys} keyframes for {len(objects)} cars in {seconds:.3f} s "
+          f"({stats['keys_per_second']:.0f} keys/s)")
+    return stats
+
+
+def _check_models(car_path: Path, track_path: Path):
+    """
+    Fail early on missing model files.
+    """
+    if not car_path.exists():
+        raise FileNotFoundError(f"Car STL file not found: {car_path}")
+    if not track_path.exists():
+        raise FileNotFoundError(f"Track STL file not found: {track_path}")
+
+
+def _load_track(track_path: Path, track_scale: float):
+    """
+    Load the track model with its material.
+    """
+    print("Loading track model...")
+    track_obj = load_stl(track_path, "Track", scale=(track_scale, track_scale, track_scale))
+    track_mat = create_material("TrackMaterial", (0.3, 0.3, 0.3), metallic=0.1, roughness=0.8)
+    track_obj.data.materials.append(track_mat)
+    return track_obj
+
+
+def _set_frame_range(fps: float, last_frame: int):
+    """
+    Fit the scene's frame range to the keyframes.
+    """
+    scene = bpy.context.scene
+    scene.render.fps = int(round(fps))
+    scene.frame_start = 1
+    scene.frame_end = last_frame
+    scene.frame_set(1)
+    print(f"Animation created: {scene.frame_start} to {scene.frame_end} frames")
+    print("Press Space to play animation in Blender")
+    bpy.context.view_layer.update()
 
 
 def animate_car_on_track(
@@ -143,7 +365,9 @@ def animate_car_on_track(
     car_scale: float = 1.0,
     track_scale: float = 1.0,
     speed_multiplier: float = 1.0,
-    forward_axis: str = 'y'
+    forward_axis: str = 'y',
+    fps: float = 24.0,
+    frame_step: int = 1
 ):
     """
     Animate car on track in Blender from JSON telemetry data.
@@ -156,6 +380,9 @@ def animate_car_on_track(
     :param track_scale: Scale factor for track model
     :param speed_multiplier: Speed multiplier (1.0 = real-time)
     :param forward_axis: Car model's forward direction axis
+    :param fps: Scene frame rate
+    :param frame_step: Key every this many frames
+    :returns: Keyframing statistics (see keyframe_cars)
     """
     if not BLENDER_AVAILABLE:
         raise RuntimeError("This script must be run in Blender")
@@ -166,40 +393,15 @@ def animate_car_on_track(
     
     if not json_path.exists():
         raise FileNotFoundError(f"JSON file not found: {json_file_path}")
-    if not car_path.exists():
-        raise FileNotFoundError(f"Car STL file not found: {car_stl_path}")
-    if not track_path.exists():
-        raise FileNotFoundError(f"Track STL file not found: {track_stl_path}")
+    _check_models(car_path, track_path)
     
     print("Loading JSON telemetry data...")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    if 'tel' not in data:
-        raise ValueError("JSON file does not contain 'tel' key")
-    
-    tel = data['tel']
-    
-    if 'x' not in tel or 'y' not in tel or 'z' not in tel:
-        raise ValueError("JSON file does not contain x, y, z coordinates in 'tel'")
-    
-    x_coords = np.array(tel['x'])
-    y_coords = np.array(tel['y'])
-    z_coords = np.array(tel['z'])
-    time_data = np.array(tel.get('time', list(range(len(x_coords)))))
-    
-    positions = np.column_stack((x_coords, y_coords, z_coords))
-    
-    if len(time_data) != len(positions):
-        time_data = np.linspace(0, len(positions) * 0.05, len(positions))
+    time_data, positions = load_tel_json(json_path)
     
     print("Clearing scene...")
     clear_scene()
     
-    print("Loading track model...")
-    track_obj = load_stl(track_path, "Track", scale=(track_scale, track_scale, track_scale))
-    track_mat = create_material("TrackMaterial", (0.3, 0.3, 0.3), metallic=0.1, roughness=0.8)
-    track_obj.data.materials.append(track_mat)
+    _load_track(track_path, track_scale)
     
     print("Loading car model...")
     car_obj = load_stl(car_path, "Car", scale=(car_scale, car_scale, car_scale))
@@ -210,79 +412,127 @@ def animate_car_on_track(
     setup_camera_and_lighting(car_obj)
     
     print("Creating animation keyframes...")
-    scene = bpy.context.scene
-    scene.frame_start = 1
-    scene.frame_end = int(time_data[-1] * 24 / speed_multiplier)
-    scene.frame_set(1)
+    keyframes = car_keyframes(time_data, positions, fps=fps, speed_multiplier=speed_multiplier,
+                              forward_axis=forward_axis, frame_step=frame_step)
+    stats = keyframe_cars([car_obj], [keyframes])
+    _set_frame_range(fps, stats["last_frame"])
+    return stats
+
+
+def animate_grid_on_track(
+    telemetry,
+    car_stl_path: str,
+    track_stl_path: str,
+    car_scale: float = 1.0,
+    track_scale: float = 1.0,
+    speed_multiplier: float = 1.0,
+    forward_axis: str = 'y',
+    rate: float = 10.0,
+    fps: float = 24.0,
+    frame_step: int = 1
+):
+    """
+    Animate every car of a session on the track in one run.
     
-    axis_map = {
-        'x': Vector((1, 0, 0)),
-        'y': Vector((0, 1, 0)),
-        'z': Vector((0, 0, 1)),
-        '-x': Vector((-1, 0, 0)),
-        '-y': Vector((0, -1, 0)),
-        '-z': Vector((0, 0, -1))
-    }
-    model_forward = axis_map.get(forward_axis.lower(), Vector((0, 1, 0)))
-    
-    frame_step = max(1, int(24 / speed_multiplier / 10))
-    
-    for i in range(0, len(positions) - 1, frame_step):
-        current_pos = positions[i]
-        next_pos = positions[min(i + 1, len(positions) - 1)]
-        
-        direction = next_pos - current_pos
-        direction_norm = np.linalg.norm(direction)
-        
-        if direction_norm < 1e-6:
-            direction = np.array([0, 1, 0])
-        else:
-            direction = direction / direction_norm
-        
-        frame = int(time_data[i] * 24 / speed_multiplier) + 1
-        
-        car_obj.location = Vector(current_pos)
-        
-        rot_matrix = calculate_rotation_matrix(direction)
-        car_obj.rotation_euler = rot_matrix.to_euler('XYZ')
-        
-        car_obj.keyframe_insert(data_path="location", frame=frame)
-        car_obj.keyframe_insert(data_path="rotation_euler", frame=frame)
-        
-        if i % 100 == 0:
-            print(f"  Keyframe {i}/{len(positions)} (frame {frame})")
+    All cars share one mesh datablock and get their own material, keyed on
+    one shared time grid.
     
-    print(f"Animation created: {scene.frame_start} to {scene.frame_end} frames")
-    print("Press Space to play animation in Blender")
+    :param telemetry: Session telemetry (see replay.session_frame), e.g. from
+                      OpenF1Client.get_session_frame or tel_json_frame
+    :param car_stl_path: Path to car STL model file
+    :param track_stl_path: Path to track STL model file
+    :param car_scale: Scale factor for car models
+    :param track_scale: Scale factor for track model
+    :param speed_multiplier: Speed multiplier (1.0 = real-time)
+    :param forward_axis: Car model's forward direction axis
+    :param rate: Resampling rate in Hz for the shared time grid
+    :param fps: Scene frame rate
+    :param frame_step: Key every this many frames
+    :returns: Keyframing statistics (see keyframe_cars)
+    """
+    if not BLENDER_AVAILABLE:
+        raise RuntimeError("This script must be run in Blender")
     
-    bpy.context.view_layer.update()
+    car_path = Path(car_stl_path)
+    track_path = Path(track_stl_path)
+    _check_models(car_path, track_path)
+    
+    print("Resampling session telemetry...")
+    grid = session_grid(telemetry, rate=rate)
+    drivers = [int(driver) for driver in grid["drivers"]]
+    if not drivers:
+        raise ValueError("Session telemetry contains no cars")
+    
+    print("Clearing scene...")
+    clear_scene()
+    
+    _load_track(track_path, track_scale)
+    
+    print(f"Loading car model for {len(drivers)} cars...")
+    first = load_stl(car_path, f"Car_{drivers[0]}", scale=(car_scale, car_scale, car_scale))
+    first.data.materials.append(create_material("CarMaterial", (0.8, 0.1, 0.1), metallic=0.9, roughness=0.2))
+    objects = [first]
+    for driver in drivers[1:]:
+        obj = bpy.data.objects.new(f"Car_{driver}", first.data)
+        obj.scale = first.scale
+        bpy.context.collection.objects.link(obj)
+        objects.append(obj)
+    for index, (obj, driver) in enumerate(zip(objects, drivers)):
+        slot = obj.material_slots[0]
+        slot.link = 'OBJECT'
+        color = colorsys.hsv_to_rgb(index / len(drivers), 0.8, 0.9)
+        slot.material = create_material(f"CarMaterial_{driver}", color, metallic=0.9, roughness=0.2)
+    
+    print("Setting up camera and lighting...")
+    setup_camera_and_lighting(first)
+    
+    print("Creating animation keyframes...")
+    began = time.perf_counter()
+    keyframes = [
+        car_keyframes(grid["time"], grid["positions"][car], fps=fps, speed_multiplier=speed_multiplier,
+                      forward_axis=forward_axis, frame_step=frame_step)
+        for car in range(len(drivers))
+    ]
+    print(f"  Computed keyframe arrays for {len(drivers)} cars in {time.perf_counter() - began:.3f} s")
+    stats = keyframe_cars(objects, keyframes)
+    _set_frame_range(fps, stats["last_frame"])
+    return stats
 
 
 if __name__ == "__main__":
-    import sys
+    # Blender passes the script's own arguments after '--'
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
     
     json_file = "10_tel.json"
     car_stl = "minipekka.stl"
     track_stl = "track.stl"
     
-    if len(sys.argv) > 1:
-        json_file = sys.argv[1]
-    if len(sys.argv) > 2:
-        car_stl = sys.argv[2]
-    if len(sys.argv) > 3:
-        track_stl = sys.argv[3]
-    
     try:
-        animate_car_on_track(
-            json_file,
-            car_stl,
-            track_stl,
-            driver_number=10,
-            car_scale=1.0,
-            track_scale=1.0,
-            speed_multiplier=1.0,
-            forward_axis='y'
-        )
+        if args and args[0] == "--grid":
+            # --grid CAR.stl TRACK.stl 1_tel.json 16_tel.json ...
+            animate_grid_on_track(
+                tel_json_frame(args[3:] or [json_file]),
+                args[1] if len(args) > 1 else car_stl,
+                args[2] if len(args) > 2 else track_stl
+            )
+        else:
+            if len(args) > 0:
+                json_file = args[0]
+            if len(args) > 1:
+                car_stl = args[1]
+            if len(args) > 2:
+                track_stl = args[2]
+            
+            animate_car_on_track(
+                json_file,
+                car_stl,
+                track_stl,
+                driver_number=10,
+                car_scale=1.0,
+                track_scale=1.0,
+                speed_multiplier=1.0,
+                forward_axis='y'
+            )
     except Exception as e:
         print(f"Error: {e}")
         import traceback
@@ -0,0 +1,377 @@
+"""
+SQLite manifest indexing the OpenF1 on-disk cache.
+
+Records one row per cached request (endpoint plus normalized params) with
+its file, size, row count, fetch time and expiry, so lookups and per-session
+listings don't need to stat the cache directory. Empty results are stored
+as short-lived negative entries.
+"""
+from typing import Optional, Dict, List, Any, Set, Tuple
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+
+MANIFEST_FILENAME = "manifest.sqlite"
+
+# Endpoint name for cache files found on disk whose request is unknown
+UNINDEXED_ENDPOINT = "unindexed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    session_key INTEGER,
+    driver_number INTEGER,
+    path TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL,
+    columnar INTEGER,
+    last_access REAL NOT NULL DEFAULT 0,
+    access_count INTEGER NOT NULL DEFAULT 0,
+    pinned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_session ON entries (session_key);
+CREATE TABLE IF NOT EXISTS pinned_sessions (
+    session_key INTEGER PRIMARY KEY
+);
+"""
+
+# Columns added after the first manifest version, with their definitions
+_ADDED_COLUMNS = {
+    "last_access": "REAL NOT NULL DEFAULT 0",
+    "access_count": "INTEGER NOT NULL DEFAULT 0",
+    "pinned": "INTEGER NOT NULL DEFAULT 0",
+    "columnar": "INTEGER",
+}
+
+EVICTION_ORDER = {
+    "lru": "last_access ASC",
+    "lfu": "access_count ASC, last_access ASC",
+}
+
+_COLUMNS = (
+    "key", "endpoint", "params", "session_key", "driver_number",
+    "path", "size_bytes", "row_count", "fetched_at", "expires_at", "columnar",
+)
+
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """
+    Serialize query parameters into a canonical string.
+    
+    :param params: Query parameters dictionary
+    :returns: JSON string with sorted keys and values as strings
+    """
+    return json.dumps({k: str(v) for k, v in params.items() if v is not None}, sort_keys=True)
+
+
+def manifest_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Build the manifest key for a request.
+    
+    :param endpoint: API endpoint name (e.g., 'location', 'car_data')
+    :param params: Query parameters dictionary
+    :returns: Key string
+    """
+    return f"{endpoint}?{normalize_params(params)}"
+
+
+def path_size(path: Path) -> int:
+    """
+    Get the on-disk size of a cache file or columnar cache directory.
+    
+    :param path: File or directory
+    :returns: Size in bytes (0 if missing)
+    """
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.iterdir() if p.is_file())
+    if path.exists():
+        return path.stat().st_size
+    return 0
+
+
+class CacheManifest:
+    """
+    Index of cached API responses stored in an SQLite database.
+    
+    Accesses recorded by touch are buffered and written in one transaction
+    by flush, which runs when the buffer fills or ages, before anything that
+    reads the access order, and on close.
+    """
+    
+    def __init__(self, db_path: Path, touch_batch_size: int = 256, touch_flush_interval: float = 5.0):
+        """
+        Open (or create) a manifest database.
+        
+        :param db_path: Path to SQLite file
+        :param touch_batch_size: Buffered accesses that trigger a flush
+        :param touch_flush_interval: Seconds after which buffered accesses are flushed on the next touch
+        """
+        self.db_path = Path(db_path)
+        self.touch_batch_size = touch_batch_size
+        self.touch_flush_interval = touch_flush_interval
+        # Key -> (latest access time, number of accesses) not yet written
+        self._pending_touches: Dict[str, Tuple[float, int]] = {}
+        self._pending_since: Optional[float] = None
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        for name, definition in _ADDED_COLUMNS.items():
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE entries ADD COLUMN {name} {definition}")
+        self._conn.commit()
+    
+    def close(self) -> None:
+        """
+        Write buffered accesses and close the database connection.
+        """
+        self.flush()
+        self._conn.close()
+    
+    def flush(self) -> None:
+        """
+        Write buffered accesses to the database in one transaction.
+        """
+        if not self._pending_touches:
+            return
+        self._write_touches()
+        self._conn.commit()
+    
+    def _write_touches(self) -> None:
+        """
+        Apply buffered accesses without committing.
+        """
+        self._conn.executemany(
+            "UPDATE entries SET last_access = MAX(last_access, ?), access_count = access_count + ? "
+            "WHERE key = ?",
+            [(last_access, count, key) for key, (last_access, count) in self._pending_touches.items()]
+        )
+        self._pending_touches.clear()
+        self._pending_since = None
+    
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the entry for a request.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :returns: Entry dictionary (with an 'expired' flag) or None if not indexed
+        """
+        row = self._conn.execute(
+            "SELECT * FROM entries WHERE key = ?", (manifest_key(endpoint, params),)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        pending = self._pending_touches.get(entry["key"])
+        if pending is not None:
+            entry["last_access"] = max(entry["last_access"], pending[0])
+            entry["access_count"] += pending[1]
+        entry["expired"] = entry["expires_at"] is not None and entry["expires_at"] <= time.time()
+        return entry
+    
+    def record(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        path: Path,
+        size_bytes: int,
+        row_count: int,
+        ttl: Optional[float] = None,
+        fetched_at: Optional[float] = None,
+        columnar: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Insert or replace the entry for a request.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :param path: Cache file holding the data
+        :param size_bytes: On-disk size of the cached data
+        :param row_count: Number of records cached
+        :param ttl: Seconds until the entry expires (None = never)
+        :param fetched_at: Fetch time as a Unix timestamp (defaults to now)
+        :param columnar: Whether the data is stored as columns (False = JSON, None = unknown)
+        :returns: The stored entry
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        values = (
+            manifest_key(endpoint, params),
+            endpoint,
+            normalize_params(params),
+            params.get("session_key"),
+            params.get("driver_number"),
+            str(path),
+            size_bytes,
+            row_count,
+            fetched_at,
+            fetched_at + ttl if ttl is not None else None,
+            None if columnar is None else int(columnar),
+        )
+        updates = ", ".join(f"{name} = excluded.{name}" for name in _COLUMNS[1:])
+        self._conn.execute(
+            f"INSERT INTO entries ({', '.join(_COLUMNS)}, last_access) "
+            f"VALUES ({', '.join('?' * len(_COLUMNS))}, ?) "
+            f"ON CONFLICT(key) DO UPDATE SET {updates}, last_access = excluded.last_access",
+            values + (time.time(),)
+        )
+        self._write_touches()
+        self._conn.commit()
+        return self.get(endpoint, params)
+    
+    def record_unindexed(self, path: Path, size_bytes: int, modified: float) -> None:
+        """
+        Index a cache file whose request is unknown, so it counts toward the budget.
+        
+        The entry is keyed by the file under UNINDEXED_ENDPOINT, has an unknown
+        row count (-1) and uses the modification time as last access, so it is
+        among the first to be evicted.
+        
+        :param path: Cache file holding the data
+        :param size_bytes: On-disk size of the cached data
+        :param modified: Modification time as a Unix timestamp
+        """
+        params = {"path": str(path)}
+        self._conn.execute(
+            f"INSERT OR IGNORE INTO entries ({', '.join(_COLUMNS)}, last_access) "
+            f"VALUES ({', '.join('?' * len(_COLUMNS))}, ?)",
+            (manifest_key(UNINDEXED_ENDPOINT, params), UNINDEXED_ENDPOINT, normalize_params(params),
+             None, None, str(path), size_bytes, -1, modified, None, None, modified)
+        )
+        self._conn.commit()
+    
+    def paths(self) -> Set[str]:
+        """
+        Get the cache file of every indexed entry.
+        
+        :returns: Set of paths as stored
+        """
+        return {row["path"] for row in self._conn.execute("SELECT path FROM entries")}
+    
+    def touch(self, endpoint: str, params: Dict[str, Any]) -> None:
+        """
+        Record an access to an entry for eviction ordering.
+        
+        The access is buffered; see flush.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        """
+        now = time.time()
+        key = manifest_key(endpoint, params)
+        _, count = self._pending_touches.get(key, (now, 0))
+        self._pending_touches[key] = (now, count + 1)
+        if self._pending_since is None:
+            self._pending_since = now
+        if (len(self._pending_touches) >= self.touch_batch_size
+                or now - self._pending_since >= self.touch_flush_interval):
+            self.flush()
+    
+    def set_pinned(self, endpoint: str, params: Dict[str, Any], pinned: bool = True) -> None:
+        """
+        Pin or unpin a single entry; pinned entries are never evicted.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :param pinned: New pinned state
+        """
+        self._conn.execute(
+            "UPDATE entries SET pinned = ? WHERE key = ?",
+            (int(pinned), manifest_key(endpoint, params))
+        )
+        self._conn.commit()
+    
+    def set_session_pinned(self, session_key: int, pinned: bool = True) -> None:
+        """
+        Pin or unpin every entry of a session, including ones cached later.
+        
+        :param session_key: Session key
+        :param pinned: New pinned state
+        """
+        if pinned:
+            self._conn.execute("INSERT OR IGNORE INTO pinned_sessions (session_key) VALUES (?)", (session_key,))
+        else:
+            self._conn.execute("DELETE FROM pinned_sessions WHERE session_key = ?", (session_key,))
+        self._conn.commit()
+    
+    def totals(self) -> Dict[str, int]:
+        """
+        Get aggregate cache size.
+        
+        :returns: Dictionary with 'entries', 'size_bytes' and 'pinned_entries'
+        """
+        row = self._conn.execute(
+            "SELECT COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS size_bytes, "
+            "COALESCE(SUM(pinned OR session_key IN (SELECT session_key FROM pinned_sessions)), 0) "
+            "AS pinned_entries FROM entries"
+        ).fetchone()
+        return dict(row)
+    
+    def eviction_candidates(self, policy: str = "lru") -> List[Dict[str, Any]]:
+        """
+        List unpinned entries in the order they should be evicted.
+        
+        :param policy: 'lru' (least recently used first) or 'lfu' (least frequently used first)
+        :returns: List of entry dictionaries
+        """
+        if policy not in EVICTION_ORDER:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.flush()
+        query = (
+            "SELECT * FROM entries WHERE pinned = 0 AND (session_key IS NULL "
+            "OR session_key NOT IN (SELECT session_key FROM pinned_sessions)) "
+            f"ORDER BY {EVICTION_ORDER[policy]}"
+        )
+        return [dict(row) for row in self._conn.execute(query)]
+    
+    def remove(self, endpoint: str, params: Dict[str, Any]) -> None:
+        """
+        Delete the entry for a request.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        """
+        self.remove_key(manifest_key(endpoint, params))
+    
+    def remove_key(self, key: str) -> None:
+        """
+        Delete an entry by its manifest key.
+        
+        :param key: Manifest key as built by manifest_key
+        """
+        self._pending_touches.pop(key, None)
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._conn.commit()
+    
+    def list_entries(
+        self,
+        session_key: Optional[int] = None,
+        endpoint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List indexed entries, optionally filtered by session and endpoint.
+        
+        :param session_key: Only entries for this session
+        :param endpoint: Only entries for this endpoint
+        :returns: List of entry dictionaries ordered by endpoint and fetch time
+        """
+        self.flush()
+        query = "SELECT * FROM entries"
+        clauses = []
+        args = []
+        if session_key is not None:
+            clauses.append("session_key = ?")
+            args.append(session_key)
+        if endpoint is not None:
+            clauses.append("endpoint = ?")
+            args.append(endpoint)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY endpoint, fetched_at"
+        return [dict(row) for row in self._conn.execute(query, args)]
@@ -1,9 +1,122 @@
 """
 HTTP client implementation for OpenF1 client using httpx.
+
+Includes an async token-bucket rate limiter and retries with exponential
+backoff, jitter and Retry-After support, so many concurrent requests can
+be issued while staying under the API's rate limit.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Awaitable, Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import random
+import time
 import httpx
 
+from json_stream import iter_json_array_batches
+from telemetry_cache import ColumnAccumulator, NonColumnarResponse
+
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """
+    Check whether an exception is an HTTP 429 (Too Many Requests) error.
+    
+    :param exc: Exception raised by HttpxClient.get
+    :returns: True if the request was rejected by the rate limit
+    """
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+    
+    :param value: Header value, either delay seconds or an HTTP date
+    :returns: Delay in seconds, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each request consumes one. Waiters are served in arrival order.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+        
+        :param rate: Sustained requests per second
+        :param capacity: Maximum burst size (defaults to rate, minimum 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self, now: float) -> None:
+        """
+        Add tokens accrued since the last update.
+        
+        :param now: Current monotonic time
+        """
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def defer(self, seconds: float) -> None:
+        """
+        Block all acquisitions for a period, e.g. after a 429 with Retry-After.
+        
+        :param seconds: Time to wait before the next request may start
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + seconds)
+    
+    async def acquire(self) -> float:
+        """
+        Wait until a token is available and consume it.
+        
+        :returns: Time spent waiting in seconds
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return waited
+                    delay = (1.0 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
 
 class HttpxClient:
     """
@@ -12,18 +125,58 @@ class HttpxClient:
     Implements the HTTPClient protocol for use with OpenF1Client.
     """
     
-    def __init__(self, timeout: float = 30.0):
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        rate_limit: Optional[float] = 3.0,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
         """
         Initialize httpx client.
         
+        A single connection pool is shared by every request made through this
+        client, including concurrent ones.
+        
         :param timeout: Request timeout in seconds
+        :param max_connections: Maximum number of pooled connections
+        :param rate_limit: Maximum sustained requests per second (None = unlimited)
+        :param burst: Maximum burst of requests above the sustained rate (defaults to rate_limit)
+        :param max_retries: Retries for 429/5xx responses and transport errors
+        :param backoff_base: Initial backoff delay in seconds, doubled per attempt
+        :param backoff_max: Upper bound for a single backoff delay in seconds
         """
         self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate_limit, burst) if rate_limit else None
         self._client: Optional[httpx.AsyncClient] = None
+        
+        self.request_count = 0
+        self.retry_count = 0
+        self.throttle_wait_seconds = 0.0
+        self.backoff_wait_seconds = 0.0
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Create the underlying pooled httpx client.
+        
+        :returns: httpx.AsyncClient instance
+        """
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections
+        )
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits)
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._client = self._create_client()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -32,6 +185,73 @@ class HttpxClient:
             await self._client.aclose()
             self._client = None
     
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Compute exponential backoff delay with full jitter.
+        
+        :param attempt: Zero-based retry attempt
+        :returns: Delay in seconds
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get request, retry and throttling counters.
+        
+        :returns: Dictionary of counters
+        """
+        return {
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "throttle_wait_seconds": self.throttle_wait_seconds,
+            "backoff_wait_seconds": self.backoff_wait_seconds,
+        }
+    
+    async def _request(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        consume: Callable[[httpx.Response], Awaitable[Any]]
+    ) -> Any:
+        """
+        Perform a streamed GET request with rate limiting and retries.
+        
+        Waits for the rate limiter before each attempt and retries 429/5xx
+        responses and transport errors, honouring Retry-After when present.
+        
+        :param url: URL to request
+        :param params: Query parameters
+        :param consume: Coroutine function reading the successful response body
+        :returns: Result of ``consume``
+        """
+        if self._client is None:
+            self._client = self._create_client()
+        
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.throttle_wait_seconds += await self.limiter.acquire()
+            self.request_count += 1
+            
+            try:
+                async with self._client.stream("GET", url, params=params) as response:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                        response.raise_for_status()
+                        return await consume(response)
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    delay = retry_after if retry_after is not None else self._backoff_delay(attempt)
+                    if response.status_code == 429 and self.limiter is not None:
+                        self.limiter.defer(delay)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+            
+            self.retry_count += 1
+            self.backoff_wait_seconds += delay
+            await asyncio.sleep(delay)
+            attempt += 1
+    
     async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Perform async GET request.
@@ -40,9 +260,44 @@ class HttpxClient:
         :param params: Query parameters
         :returns: JSON response as dictionary or list
         """
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
+        async def read_json(response):
+            await response.aread()
+            return response.json()
+        
+        return await self._request(url, params, read_json)
+    
+    async def get_columns(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 5000
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Perform async GET request, decoding a JSON array response straight into typed columns.
+        
+        The body is parsed incrementally from the byte stream and appended to
+        growing NumPy arrays, so neither the raw body nor a full list of dicts
+        is ever held in memory.
+        
+        :param url: URL to request
+        :param params: Query parameters
+        :param batch_size: Number of records parsed before being appended to the arrays
+        :returns: Mapping of field name to {'kind', 'array'} (empty for an empty or non-array response)
+        :raises NonColumnarResponse: If the records are not numeric telemetry; the rest of the
+                                     body is still read, and the exception carries every record
+        :raises ValueError: If the body is not a well-formed JSON array
+        """
+        async def read_columns(response):
+            accumulator = ColumnAccumulator()
+            batches = iter_json_array_batches(response.aiter_bytes(), batch_size=batch_size)
+            async for batch in batches:
+                try:
+                    accumulator.extend(batch)
+                except ValueError:
+                    records = accumulator.records() + batch
+                    async for rest in batches:
+                        records.extend(rest)
+                    raise NonColumnarResponse(records)
+            return accumulator.finish()
         
-        response = await self._client.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await self._request(url, params, read_columns)
@@ -0,0 +1,74 @@
+"""
+Incremental parsing of JSON array responses.
+
+Decodes a top-level JSON array of objects from a byte stream one element
+at a time, so a large response never has to be held as a single body or
+a single list of dicts.
+"""
+from typing import AsyncIterator, Dict, List, Any
+import codecs
+import json
+
+
+_WHITESPACE = " \t\n\r"
+
+
+async def iter_json_array_batches(
+    chunks: AsyncIterator[bytes],
+    batch_size: int = 5000
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Parse a JSON array from a byte stream, yielding its elements in batches.
+    
+    A response whose top-level value is not an array yields nothing.
+    
+    :param chunks: Async iterator of raw response bytes
+    :param batch_size: Maximum number of elements per yielded batch
+    :returns: Async iterator of element lists
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+    batch = []
+    
+    async for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        
+        if not started:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                continue
+            if buffer[pos] != "[":
+                return
+            started = True
+            pos += 1
+        
+        while True:
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or buffer[pos] == ","):
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                if batch:
+                    yield batch
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element continues in the next chunk
+                break
+            if end == len(buffer):
+                # A scalar cut at the chunk boundary would still decode; wait for the delimiter
+                break
+            batch.append(element)
+            pos = end
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    
+    if started:
+        raise ValueError("Truncated JSON array in response stream")
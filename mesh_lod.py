@@ -0,0 +1,310 @@
+"""
+Level-of-detail meshes and reusable transform buffers for the renderers.
+
+Car and track models are parsed and decimated once into a few face
+budgets, and the resulting LOD pyramid is stored on disk as plain .npy
+arrays keyed by a hash of the source file. Later runs memory-map those
+arrays instead of re-parsing the STL/OBJ, so loading a model takes
+milliseconds. A TransformBuffer writes the posed triangles for each
+frame into preallocated arrays, so the render loop never copies or
+simplifies a mesh.
+"""
+from typing import Optional, Dict, List, Tuple, Sequence
+from pathlib import Path
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+
+import numpy as np
+
+
+DEFAULT_LOD_BUDGETS = (5000, 2000, 500)
+TRACK_LOD_BUDGETS = (50000, 10000, 2000)
+
+# Resolved against this module, not the working directory; OpenF1Client uses its own cache_dir
+MESH_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "meshes"
+MESH_CACHE_VERSION = 1
+META_FILENAME = "meta.json"
+
+_LOD_CACHE: Dict[Tuple[str, int, float, Tuple[int, ...]], "MeshLOD"] = {}
+_decimation_warned = [False]
+
+
+def decimation_available() -> bool:
+    """
+    Check whether quadric decimation can run (it needs fast_simplification).
+    
+    :returns: True if the package is importable
+    """
+    return importlib.util.find_spec("fast_simplification") is not None
+
+
+def decimate(mesh, max_faces: int):
+    """
+    Reduce a trimesh mesh to at most ``max_faces`` faces.
+    
+    Falls back to the original mesh if quadric decimation is unavailable
+    (it needs the optional fast_simplification package).
+    
+    :param mesh: trimesh.Trimesh
+    :param max_faces: Face budget
+    :returns: Decimated (or original) mesh
+    """
+    if len(mesh.faces) <= max_faces:
+        return mesh
+    try:
+        return mesh.simplify_quadric_decimation(face_count=max_faces)
+    except ImportError:
+        if not _decimation_warned[0]:
+            print("Mesh decimation unavailable (pip install fast_simplification); using full-detail meshes")
+            _decimation_warned[0] = True
+        return mesh
+
+
+class MeshLOD:
+    """
+    A mesh decimated to several face budgets, stored as plain arrays.
+    """
+    
+    def __init__(self, levels: List[Tuple[np.ndarray, np.ndarray]], budgets: Sequence[int], decimated: bool = True):
+        """
+        Initialize from precomputed levels.
+        
+        :param levels: (vertices, faces) per level, finest (full detail) first
+        :param budgets: Face budgets the levels were built for
+        :param decimated: False if decimation was unavailable, so levels are missing
+        """
+        self.levels = levels
+        self.budgets = tuple(budgets)
+        self.decimated = decimated
+    
+    def scaled(self, scale: float) -> "MeshLOD":
+        """
+        Get a copy with every level's vertices scaled uniformly.
+        
+        :param scale: Scale factor
+        :returns: MeshLOD (self when scale is 1)
+        """
+        if scale == 1.0:
+            return self
+        return MeshLOD([(vertices * scale, faces) for vertices, faces in self.levels], self.budgets, self.decimated)
+    
+    def level(self, max_faces: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the finest level within a face budget.
+        
+        :param max_faces: Face budget (None = finest level)
+        :returns: (vertices, faces) arrays
+        """
+        if max_faces is not None:
+            for vertices, faces in self.levels:
+                if len(faces) <= max_faces:
+                    return vertices, faces
+            return self.levels[-1]
+        return self.levels[0]
+
+
+def build_lods(mesh, budgets: Sequence[int] = DEFAULT_LOD_BUDGETS) -> MeshLOD:
+    """
+    Decimate a mesh into an LOD pyramid.
+    
+    The full-detail mesh is always the first level, followed by one level
+    per face budget it exceeds. Each level is decimated from the previous
+    one, so coarse levels are cheap. Vertices are stored as float32 and
+    faces as int32. Without fast_simplification only the full-detail level
+    is built and the result is marked as not decimated.
+    
+    :param mesh: trimesh.Trimesh
+    :param budgets: Face budgets
+    :returns: MeshLOD
+    """
+    budgets = sorted(budgets, reverse=True)
+    levels = [(np.asarray(mesh.vertices, dtype=np.float32), np.asarray(mesh.faces, dtype=np.int32))]
+    current = mesh
+    for budget in budgets:
+        if len(current.faces) <= budget:
+            continue
+        decimated = decimate(current, budget)
+        if decimated is current:
+            return MeshLOD(levels, budgets, decimated=False)
+        current = decimated
+        levels.append((np.asarray(current.vertices, dtype=np.float32), np.asarray(current.faces, dtype=np.int32)))
+    return MeshLOD(levels, budgets)
+
+
+def file_digest(path: Path) -> str:
+    """
+    Hash a model file's contents.
+    
+    :param path: File to hash
+    :returns: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_entry(cache_dir: Path, digest: str, budgets: Sequence[int]) -> Path:
+    """
+    Get the cache directory for a source file and set of budgets.
+    
+    :param cache_dir: Root mesh cache directory
+    :param digest: Source file SHA-256
+    :param budgets: Face budgets, finest first
+    :returns: Entry directory (may not exist)
+    """
+    suffix = "-".join(str(budget) for budget in budgets) or "full"
+    return Path(cache_dir) / f"{digest[:24]}_{suffix}"
+
+
+def save_mesh_lods(entry: Path, lods: MeshLOD, source: Path, digest: str) -> None:
+    """
+    Write an LOD pyramid to a cache entry, replacing it atomically.
+    
+    :param entry: Target entry directory
+    :param lods: Levels to store
+    :param source: Source model file (recorded in the metadata)
+    :param digest: Source file SHA-256
+    """
+    tmp_dir = entry.with_name(f"{entry.name}.tmp{os.getpid()}")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    
+    levels = []
+    for i, (vertices, faces) in enumerate(lods.levels):
+        np.save(tmp_dir / f"lod{i}_vertices.npy", np.ascontiguousarray(vertices, dtype=np.float32))
+        np.save(tmp_dir / f"lod{i}_faces.npy", np.ascontiguousarray(faces, dtype=np.int32))
+        levels.append({"vertices": len(vertices), "faces": len(faces)})
+    with open(tmp_dir / META_FILENAME, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": MESH_CACHE_VERSION,
+            "source": str(source),
+            "sha256": digest,
+            "budgets": list(lods.budgets),
+            "decimated": lods.decimated,
+            "levels": levels,
+        }, f)
+    
+    if entry.exists():
+        shutil.rmtree(entry)
+    os.replace(tmp_dir, entry)
+
+
+def open_mesh_lods(entry: Path, digest: Optional[str] = None) -> Optional[MeshLOD]:
+    """
+    Memory-map a cached LOD pyramid.
+    
+    :param entry: Cache entry directory
+    :param digest: Expected source SHA-256 (None = don't check)
+    :returns: MeshLOD with read-only memory-mapped arrays, or None if missing or stale
+    """
+    try:
+        with open(entry / META_FILENAME, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != MESH_CACHE_VERSION or (digest is not None and meta.get("sha256") != digest):
+            return None
+        levels = [
+            (np.load(entry / f"lod{i}_vertices.npy", mmap_mode="r", allow_pickle=False),
+             np.load(entry / f"lod{i}_faces.npy", mmap_mode="r", allow_pickle=False))
+            for i in range(len(meta["levels"]))
+        ]
+    except (OSError, ValueError, KeyError):
+        return None
+    return MeshLOD(levels, meta["budgets"], meta.get("decimated", False))
+
+
+def load_mesh_lods(
+    path: Path,
+    scale: float = 1.0,
+    budgets: Sequence[int] = DEFAULT_LOD_BUDGETS,
+    cache_dir: Optional[Path] = MESH_CACHE_DIR
+) -> MeshLOD:
+    """
+    Load a model's LOD pyramid, from the disk cache when the file hasn't changed.
+    
+    On a cache miss the STL/OBJ is parsed with trimesh, decimated and written
+    to ``cache_dir``; entries are keyed by the file's SHA-256, so edited
+    models are rebuilt and renamed copies are shared. An entry built while
+    fast_simplification was missing is rebuilt once it can be imported.
+    Results are also kept in memory for the rest of the process.
+    
+    :param path: STL/OBJ file
+    :param scale: Uniform scale applied to every level
+    :param budgets: Face budgets below the full-detail level
+    :param cache_dir: Root of the persistent mesh cache (None = memory only)
+    :returns: MeshLOD
+    """
+    path = Path(path)
+    budgets = tuple(sorted(budgets, reverse=True))
+    key = (str(path.resolve()), path.stat().st_mtime_ns, float(scale), budgets)
+    if key in _LOD_CACHE:
+        return _LOD_CACHE[key]
+    
+    digest = file_digest(path)
+    entry = None if cache_dir is None else _cache_entry(cache_dir, digest, budgets)
+    lods = None if entry is None else open_mesh_lods(entry, digest)
+    if lods is not None and not lods.decimated and decimation_available():
+        lods = None
+    if lods is None:
+        try:
+            import trimesh
+        except ImportError:
+            raise ImportError("trimesh is required for loading meshes. Install with: pip install trimesh")
+        lods = build_lods(trimesh.load(str(path), force="mesh"), budgets)
+        if entry is not None:
+            try:
+                save_mesh_lods(entry, lods, path, digest)
+                lods = open_mesh_lods(entry, digest) or lods
+            except OSError as e:
+                print(f"Could not write mesh cache {entry}: {e}")
+    
+    _LOD_CACHE[key] = lods.scaled(scale)
+    return _LOD_CACHE[key]
+
+
+class TransformBuffer:
+    """
+    Preallocated buffers for posing a mesh every frame without allocation.
+    """
+    
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray):
+        """
+        Initialize buffers for a mesh.
+        
+        :param vertices: (V, 3) model-space vertices
+        :param faces: (F, 3) vertex indices
+        """
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int64)
+        self.world = np.empty_like(self.vertices)
+        self.triangles = np.empty((len(self.faces), 3, 3), dtype=np.float64)
+    
+    def transform(self, rotation: np.ndarray, translation: np.ndarray) -> np.ndarray:
+        """
+        Pose the mesh, writing into the preallocated buffers.
+        
+        :param rotation: (3, 3) rotation matrix (model -> world)
+        :param translation: World position
+        :returns: (F, 3, 3) triangle vertices (the internal buffer, overwritten next call)
+        """
+        np.matmul(self.vertices, rotation.T, out=self.world)
+        self.world += translation
+        np.take(self.world, self.faces, axis=0, out=self.triangles)
+        return self.triangles
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    
+    # Pre-build cache entries: python mesh_lod.py model.stl [model.obj ...]
+    for model in sys.argv[1:]:
+        start = time.perf_counter()
+        lods = load_mesh_lods(Path(model), budgets=TRACK_LOD_BUDGETS)
+        faces = ", ".join(str(len(level_faces)) for _, level_faces in lods.levels)
+        print(f"{model}: {len(lods.levels)} levels ({faces} faces) in {time.perf_counter() - start:.3f}s")
@@ -5,13 +5,54 @@ Provides async methods to query OpenF1 REST API endpoints and retrieve
 car position data over time, with optional visualization capabilities.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, List, Any, Protocol
-from datetime import datetime
+from typing import Optional, Dict, List, Any, Protocol, AsyncIterator, Awaitable, Callable, Iterator, Tuple, Union, Set
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from contextlib import contextmanager
+import asyncio
 import json
 import os
 import hashlib
+import shutil
+import sys
+import time
 from pathlib import Path
 
+from cache_manifest import (
+    EVICTION_ORDER,
+    MANIFEST_FILENAME,
+    UNINDEXED_ENDPOINT,
+    CacheManifest,
+    manifest_key,
+    path_size,
+)
+from telemetry_cache import (
+    COLUMNAR_SUFFIX,
+    NonColumnarResponse,
+    append_columns,
+    columnar_path,
+    columns_to_records,
+    format_iso_timestamps,
+    load_columns,
+    load_schema,
+    parse_iso_timestamps,
+    records_to_columns,
+    relative_seconds,
+    save_columns,
+)
+from telemetry_frame import TelemetryFrame, as_frame, concat_frames
+from telemetry_join import join_car_data, write_tel_json
+from telemetry_resample import resample_series
+from playback import PlaybackTimeline
+from orientation import heading_quaternions, quaternions_to_matrices, slerp
+from mesh_lod import DEFAULT_LOD_BUDGETS, META_FILENAME, TRACK_LOD_BUDGETS, TransformBuffer, load_mesh_lods
+from track_centerline import Centerline, load_centerline
+from track_projection import CenterlineIndex
+from telemetry_distance import DistanceIndex
+from replay import CarArtists, session_grid
+from trails import TrailArtist, TrailBuffer, trail_capacity
+from render import AnimationScene, render_frames
+
 
 class HTTPClient(Protocol):
     """
@@ -42,16 +83,70 @@ class OpenF1Client:
     
     BASE_URL = "https://api.openf1.org/v1"
     
-    def __init__(self, http_client: HTTPClient, cache_dir: str = ".cache"):
+    TELEMETRY_ENDPOINTS = ("location", "car_data")
+    
+    # Subdirectory of cache_dir holding LOD pyramids built from STL/OBJ models
+    MESH_CACHE_SUBDIR = "meshes"
+    # Subdirectory of cache_dir holding fitted track centerlines
+    CENTERLINE_CACHE_SUBDIR = "centerlines"
+    
+    def __init__(
+        self,
+        http_client: HTTPClient,
+        cache_dir: str = ".cache",
+        cache_ttl: Optional[float] = None,
+        negative_ttl: float = 600.0,
+        cache_max_bytes: Optional[int] = None,
+        cache_max_entries: Optional[int] = None,
+        eviction_policy: str = "lru",
+        memory_cache_size: int = 64,
+        memory_cache_max_bytes: Optional[int] = 256 * 1024 * 1024
+    ):
         """
         Initialize OpenF1 client with HTTP client dependency.
         
         :param http_client: HTTP client implementation (httpx.AsyncClient, etc.)
         :param cache_dir: Directory to store cached JSON files
+        :param cache_ttl: Seconds before a cached non-empty response expires (None = never)
+        :param negative_ttl: Seconds before a cached empty response expires
+        :param cache_max_bytes: Cache size budget in bytes (None = unbounded); cache files
+                                not yet in the manifest, including cached meshes and
+                                centerlines, are indexed so they count toward it
+        :param cache_max_entries: Maximum number of cached responses (None = unbounded)
+        :param eviction_policy: 'lru' or 'lfu', used when the budget is exceeded
+        :param memory_cache_size: Number of responses kept in memory above the disk cache (0 = disabled)
+        :param memory_cache_max_bytes: Approximate memory budget for those responses (None = unbounded)
         """
+        if eviction_policy not in EVICTION_ORDER:
+            raise ValueError(f"eviction_policy must be one of {sorted(EVICTION_ORDER)}")
         self.http_client = http_client
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_entries = cache_max_entries
+        self.eviction_policy = eviction_policy
+        self.manifest = CacheManifest(self.cache_dir / MANIFEST_FILENAME)
+        self.eviction_count = 0
+        self.evicted_bytes = 0
+        # Keys written or read by multi-entry requests in progress, protected from eviction
+        self._cache_batches: List[Set[str]] = []
+        self.memory_cache_size = memory_cache_size
+        self.memory_cache_max_bytes = memory_cache_max_bytes
+        # Memo key -> (result, expires_at as a Unix timestamp or None, approximate size in bytes)
+        self._memory_cache: "OrderedDict[Tuple[str, str], Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight: Dict[Tuple[str, str, bool], "asyncio.Future"] = {}
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.memory_coalesced = 0
+        self._centerline_index: Optional[CenterlineIndex] = None
+        # Set by render_animation workers: animation methods keep their scene instead of showing it
+        self._capture_scene = False
+        self._scene: Optional[AnimationScene] = None
+        if cache_max_bytes is not None or cache_max_entries is not None:
+            self._index_unindexed_files()
     
     def _generate_cache_filename(self, endpoint: str, params: Dict[str, Any]) -> Path:
         """
@@ -64,9 +159,9 @@ class OpenF1Client:
         param_str = json.dumps(params, sort_keys=True)
         param_hash = hashlib.md5(param_str.encode()).hexdigest()[:12]
         
-        date_str = params.get("date", params.get("date_start", ""))
+        date_str = params.get("date", params.get("date_start", params.get("date>", params.get("date>=", ""))))
         if date_str:
-            date_str = date_str.replace("-", "")
+            date_str = date_str[:10].replace("-", "")
         else:
             date_str = datetime.now().strftime("%Y%m%d")
         
@@ -77,33 +172,912 @@ class OpenF1Client:
         filename = f"{endpoint}_{date_str}{driver_str}{session_str}{meeting_str}_{param_hash}.json"
         return self.cache_dir / filename
     
-    def _load_from_cache(self, cache_file: Path) -> Optional[List[Dict[str, Any]]]:
+    def _load_from_cache(self, cache_file: Path, migrate: bool = True) -> Optional[List[Dict[str, Any]]]:
         """
         Load data from cache file if it exists.
         
+        Prefers the columnar '.cols' entry; a legacy '.json' entry is read
+        once and migrated to the columnar format when possible.
+        
         :param cache_file: Path to cache file
+        :param migrate: If False, don't try to migrate a '.json' entry (e.g. one known not to be columnar)
         :returns: Cached data or None if file doesn't exist
         """
+        cols_dir = columnar_path(cache_file)
+        if cols_dir.exists():
+            schema = load_schema(cols_dir)
+            columns = load_columns(cols_dir, schema=schema)
+            if columns is not None:
+                return columns_to_records(columns, schema["kinds"])
+        
         if cache_file.exists():
             try:
                 with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
             except (json.JSONDecodeError, IOError):
                 return None
+            if migrate and isinstance(data, list) and data:
+                columns = records_to_columns(data)
+                self._save_to_cache(cache_file, data, columns=columns)
+                if columns is not None:
+                    return self._columns_to_records(columns)
+            return data
         return None
     
-    def _save_to_cache(self, cache_file: Path, data: List[Dict[str, Any]]) -> None:
+    def _load_columns_from_cache(self, cache_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        Load cached data as memory-mapped typed columns without building dicts.
+        
+        :param cache_file: Path to cache file
+        :returns: Mapping of field name to NumPy array, or None if no columnar entry exists
+        """
+        cols_dir = columnar_path(cache_file)
+        if not cols_dir.exists() and cache_file.exists():
+            self._load_from_cache(cache_file)
+        if not cols_dir.exists():
+            return None
+        return load_columns(cols_dir)
+    
+    def _save_to_cache(
+        self,
+        cache_file: Path,
+        data: List[Dict[str, Any]],
+        columnar: bool = True,
+        columns: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> None:
         """
         Save data to cache file.
         
+        Numeric telemetry is written as a columnar '.cols' entry (replacing any
+        legacy '.json' file); other responses are written as compact JSON.
+        
         :param cache_file: Path to cache file
         :param data: Data to cache
+        :param columnar: If False, write JSON without trying the columnar format
+        :param columns: records_to_columns(data), if the caller already built it
         """
         try:
+            if columns is None and columnar:
+                columns = records_to_columns(data)
+            if columns is not None:
+                save_columns(columnar_path(cache_file), columns)
+                if cache_file.exists():
+                    cache_file.unlink()
+                return
             with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-        except IOError:
+                json.dump(data, f, separators=(',', ':'))
+        except (IOError, OSError):
+            pass
+    
+    def _append_to_cache(self, cache_file: Path, data: List[Dict[str, Any]]) -> None:
+        """
+        Append new records to an existing cache entry.
+        
+        Appends in place to the columnar entry when the new rows are
+        compatible with it; otherwise rewrites the entry with old and new rows.
+        
+        :param cache_file: Path to cache file
+        :param data: New records to append
+        """
+        if not data:
+            return
+        columns = records_to_columns(data)
+        try:
+            if columns is not None and append_columns(columnar_path(cache_file), columns):
+                return
+        except (IOError, OSError):
             pass
+        existing = self._load_from_cache(cache_file) or []
+        self._save_to_cache(cache_file, existing + data)
+    
+    def _cache_file_for(self, endpoint: str, params: Dict[str, Any]) -> Path:
+        """
+        Get the cache file for a request, preferring the path stored in the manifest.
+        
+        Generated filenames embed today's date when no date filter is given,
+        so the manifest keeps a request pointing at the file it was cached in.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :returns: Path to cache file
+        """
+        entry = self.manifest.get(endpoint, params)
+        if entry is not None:
+            return Path(entry["path"])
+        return self._generate_cache_filename(endpoint, params)
+    
+    def _cache_size(self, cache_file: Path) -> int:
+        """
+        Get the on-disk size of a cache entry in either format.
+        
+        :param cache_file: Path to cache file
+        :returns: Size in bytes
+        """
+        cols_dir = columnar_path(cache_file)
+        return path_size(cols_dir) if cols_dir.exists() else path_size(cache_file)
+    
+    def _record_in_manifest(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_file: Path,
+        row_count: int,
+        fetched_at: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Index a cache entry in the manifest, with the negative TTL for empty results.
+        
+        Non-empty entries also record whether they were stored as columns or
+        as JSON, so entries that can't be columnar are never converted again.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :param cache_file: Path to cache file
+        :param row_count: Number of cached records
+        :param fetched_at: Fetch time as a Unix timestamp (defaults to now)
+        :returns: Manifest entry
+        """
+        entry = self.manifest.record(
+            endpoint,
+            params,
+            cache_file,
+            self._cache_size(cache_file),
+            row_count,
+            ttl=self.negative_ttl if row_count == 0 else self.cache_ttl,
+            fetched_at=fetched_at,
+            columnar=columnar_path(cache_file).exists() if row_count else None
+        )
+        self.manifest.remove(UNINDEXED_ENDPOINT, {"path": str(cache_file)})
+        self._protect_in_batches(entry["key"])
+        self.enforce_cache_budget(keep_keys={entry["key"]})
+        return entry
+    
+    def _index_unindexed_files(self) -> int:
+        """
+        Index cache files that are missing from the manifest, so they count toward the budget.
+        
+        Files written before the manifest existed are otherwise invisible to
+        eviction. Their request is unknown, so they are stored as unindexed
+        entries (see CacheManifest.record_unindexed) until a request for the
+        same file indexes them properly.
+        
+        :returns: Number of files indexed
+        """
+        indexed = self.manifest.paths()
+        added = 0
+        for cache_file, path in self._cache_files_on_disk():
+            if str(cache_file) in indexed:
+                continue
+            indexed.add(str(cache_file))
+            self.manifest.record_unindexed(cache_file, self._cache_size(cache_file), path.stat().st_mtime)
+            added += 1
+        if added:
+            self.enforce_cache_budget()
+        return added
+    
+    def _cache_files_on_disk(self) -> Iterator[Tuple[Path, Path]]:
+        """
+        List the cache entries on disk, including mesh LOD entries and centerlines.
+        
+        :returns: Iterator of (path as stored in the manifest, file or directory on disk)
+        """
+        for path in sorted(self.cache_dir.iterdir()):
+            if path.suffix == COLUMNAR_SUFFIX and path.is_dir():
+                yield path.with_suffix(".json"), path
+            elif path.suffix == ".json" and path.is_file():
+                yield path, path
+        
+        mesh_dir = self.cache_dir / self.MESH_CACHE_SUBDIR
+        if mesh_dir.is_dir():
+            for path in sorted(mesh_dir.iterdir()):
+                # Skip entries still being written (see mesh_lod.save_mesh_lods)
+                if ".tmp" not in path.name and (path / META_FILENAME).exists():
+                    yield path, path
+        
+        centerline_dir = self.cache_dir / self.CENTERLINE_CACHE_SUBDIR
+        if centerline_dir.is_dir():
+            for path in sorted(centerline_dir.glob("*.npz")):
+                yield path, path
+    
+    def _protect_in_batches(self, key: str) -> None:
+        """
+        Add a manifest key to every multi-entry request in progress.
+        
+        :param key: Manifest key as built by manifest_key
+        """
+        for batch in self._cache_batches:
+            batch.add(key)
+    
+    @contextmanager
+    def _cache_batch(self):
+        """
+        Protect every cache entry written or read inside the block from eviction.
+        
+        Wraps requests made of several cache entries (time windows, drivers,
+        endpoints), so storing one part cannot evict another part of the same
+        request. The budget is enforced again when the block ends, and the
+        accesses recorded inside it are written to the manifest.
+        
+        :returns: Context manager yielding the set of protected keys
+        """
+        keys: Set[str] = set()
+        self._cache_batches.append(keys)
+        try:
+            yield keys
+        finally:
+            self._cache_batches = [batch for batch in self._cache_batches if batch is not keys]
+            self.enforce_cache_budget()
+            self.manifest.flush()
+    
+    def _delete_cache_files(self, cache_file: Path) -> None:
+        """
+        Remove a cache entry's files in either format, or a mesh LOD entry directory.
+        
+        :param cache_file: Path to cache file
+        """
+        cols_dir = columnar_path(cache_file)
+        if cols_dir.exists():
+            shutil.rmtree(cols_dir, ignore_errors=True)
+        if cache_file.is_dir():
+            shutil.rmtree(cache_file, ignore_errors=True)
+        elif cache_file.exists():
+            cache_file.unlink()
+    
+    def enforce_cache_budget(self, keep_keys: Optional[Set[str]] = None) -> int:
+        """
+        Evict cached responses until the cache fits cache_max_bytes and cache_max_entries.
+        
+        Entries are evicted in eviction_policy order; pinned entries, entries
+        of pinned sessions and entries used by a multi-entry request in
+        progress are never evicted.
+        
+        :param keep_keys: Further manifest keys that must not be evicted (e.g. the entry just written)
+        :returns: Number of entries evicted
+        """
+        if self.cache_max_bytes is None and self.cache_max_entries is None:
+            return 0
+        
+        totals = self.manifest.totals()
+        entries, size_bytes = totals["entries"], totals["size_bytes"]
+        
+        def over_budget():
+            return (
+                (self.cache_max_bytes is not None and size_bytes > self.cache_max_bytes)
+                or (self.cache_max_entries is not None and entries > self.cache_max_entries)
+            )
+        
+        if not over_budget():
+            return 0
+        
+        protected = set(keep_keys or ())
+        for batch in self._cache_batches:
+            protected |= batch
+        evicted = 0
+        for candidate in self.manifest.eviction_candidates(self.eviction_policy):
+            if not over_budget():
+                break
+            if candidate["key"] in protected:
+                continue
+            self._delete_cache_files(Path(candidate["path"]))
+            self.manifest.remove_key(candidate["key"])
+            self._forget_in_memory(candidate["key"])
+            entries -= 1
+            size_bytes -= candidate["size_bytes"]
+            evicted += 1
+            self.evicted_bytes += candidate["size_bytes"]
+        self.eviction_count += evicted
+        return evicted
+    
+    def pin_session(self, session_key: int, pinned: bool = True) -> None:
+        """
+        Protect every cached response of a session (e.g. the one being replayed) from eviction.
+        
+        :param session_key: Session key
+        :param pinned: True to pin, False to unpin
+        """
+        self.manifest.set_session_pinned(session_key, pinned)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get cache size, budget and eviction counters.
+        
+        :returns: Dictionary of cache statistics
+        """
+        stats = self.manifest.totals()
+        stats.update({
+            "max_bytes": self.cache_max_bytes,
+            "max_entries": self.cache_max_entries,
+            "eviction_policy": self.eviction_policy,
+            "evictions": self.eviction_count,
+            "evicted_bytes": self.evicted_bytes,
+            "memory_entries": len(self._memory_cache),
+            "memory_bytes": self._memory_bytes,
+            "memory_hits": self.memory_hits,
+            "memory_misses": self.memory_misses,
+            "memory_coalesced": self.memory_coalesced,
+        })
+        return stats
+    
+    def _index_existing_cache(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        cache_file: Path
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add a cache file written before the manifest existed to the manifest.
+        
+        Uses the file's modification time as fetch time, so old empty results
+        are already expired.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :param cache_file: Path to cache file
+        :returns: Manifest entry, or None if nothing is cached
+        """
+        cols_dir = columnar_path(cache_file)
+        data_path = cols_dir if cols_dir.exists() else cache_file
+        if not data_path.exists():
+            return None
+        
+        schema = load_schema(cols_dir) if cols_dir.exists() else None
+        if schema is not None:
+            row_count = schema["rows"]
+        else:
+            data = self._load_from_cache(cache_file)
+            if data is None:
+                return None
+            row_count = len(data)
+        return self._record_in_manifest(
+            endpoint, params, cache_file, row_count, fetched_at=data_path.stat().st_mtime
+        )
+    
+    async def _fetch_delta(self, endpoint: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Fetch only records newer than the latest one already cached and append them.
+        
+        Falls back to a full fetch if nothing with timestamps is cached yet.
+        
+        :param endpoint: API endpoint name (e.g., 'location', 'car_data')
+        :param params: Query parameters dictionary
+        :returns: Full cached dataset including the new records
+        """
+        cache_file = self._cache_file_for(endpoint, params)
+        columns = self._load_columns_from_cache(cache_file)
+        if columns is None or "date" not in columns or len(columns["date"]) == 0:
+            return await self._fetch(endpoint, params, use_cache=False, save=True)
+        
+        latest = columns["date"].max()
+        delta_params = dict(params)
+        # The API only has inclusive comparisons once the query is encoded, so
+        # ask for one microsecond past the latest row to get strictly newer ones
+        delta_params["date>"] = format_iso_timestamps([latest + 1000])[0]
+        del columns
+        
+        response = await self.http_client.get(f"{self.BASE_URL}/{endpoint}", delta_params)
+        new_rows = self._records_after(response if isinstance(response, list) else [], latest)
+        self._append_to_cache(cache_file, new_rows)
+        
+        result = self._load_from_cache(cache_file) or []
+        self._record_in_manifest(endpoint, params, cache_file, len(result))
+        return result
+    
+    def _forget_in_memory(self, key: str) -> None:
+        """
+        Drop every in-memory result for a manifest key.
+        
+        :param key: Manifest key as built by manifest_key
+        """
+        for kind in ("records", "columns"):
+            self._drop_memoized((kind, key))
+    
+    def _drop_memoized(self, key: Tuple[str, str]) -> None:
+        """
+        Remove one in-memory result, if present.
+        
+        :param key: Memo key (kind, manifest key)
+        """
+        memo = self._memory_cache.pop(key, None)
+        if memo is not None:
+            self._memory_bytes -= memo[2]
+    
+    @staticmethod
+    def _approx_nbytes(result: Any) -> int:
+        """
+        Estimate the memory held by a fetched result.
+        
+        Columns are measured from their arrays; records are estimated from the first one.
+        
+        :param result: Columns mapping or list of records
+        :returns: Approximate size in bytes
+        """
+        if isinstance(result, dict):
+            return sum(column["array"].nbytes for column in result.values())
+        if not result:
+            return 0
+        first = result[0]
+        per_record = sys.getsizeof(first) + sum(sys.getsizeof(value) for value in first.values())
+        return per_record * len(result)
+    
+    @staticmethod
+    def _private_copy(result: Any) -> Any:
+        """
+        Give one caller a result it can't use to alter the memoized one.
+        
+        Columns come back as a new mapping of read-only array views; records are copied.
+        
+        :param result: Columns mapping or list of records
+        :returns: Copy safe to hand out
+        """
+        if isinstance(result, dict):
+            columns = {}
+            for name, column in result.items():
+                array = column["array"].view()
+                array.flags.writeable = False
+                columns[name] = dict(column, array=array)
+            return columns
+        return [
+            {field: list(value) if isinstance(value, list) else value for field, value in record.items()}
+            for record in result
+        ]
+    
+    async def _memoized(
+        self,
+        kind: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve a request from the in-memory LRU, coalescing concurrent identical requests.
+        
+        Concurrent callers with the same endpoint, params and use_cache share a
+        single in-flight fetch; if that fetch is cancelled, a waiter takes it
+        over. Memoized results expire with their manifest entry (cache_ttl, or
+        negative_ttl for empty results) and are bounded by memory_cache_size and
+        memory_cache_max_bytes. Every caller gets its own copy: records are
+        copied and columns are read-only views.
+        
+        :param kind: Result shape ('records' or 'columns'), part of the memo key
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :param use_cache: If False, skip the in-memory lookup (the result is still stored)
+        :param fetch: Coroutine function performing the actual fetch
+        :returns: Fetched or memoized result
+        """
+        key = (kind, manifest_key(endpoint, params))
+        flight_key = key + (use_cache,)
+        coalesced = False
+        while True:
+            if use_cache and key in self._memory_cache:
+                result, expires_at, _ = self._memory_cache[key]
+                if expires_at is None or expires_at > time.time():
+                    self._memory_cache.move_to_end(key)
+                    self.memory_hits += 1
+                    return self._private_copy(result)
+                self._drop_memoized(key)
+            
+            inflight = self._inflight.get(flight_key)
+            if inflight is None:
+                break
+            if not coalesced:
+                self.memory_coalesced += 1
+                coalesced = True
+            try:
+                return self._private_copy(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # Only the leader was cancelled: retry, leading the fetch if no other waiter has yet
+        
+        self.memory_misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark as retrieved so an unawaited future doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            del self._inflight[flight_key]
+        
+        future.set_result(result)
+        nbytes = self._approx_nbytes(result)
+        self._drop_memoized(key)
+        if self.memory_cache_size > 0 and (
+            self.memory_cache_max_bytes is None or nbytes <= self.memory_cache_max_bytes
+        ):
+            entry = self.manifest.get(endpoint, params)
+            self._memory_cache[key] = (result, entry["expires_at"] if entry is not None else None, nbytes)
+            self._memory_bytes += nbytes
+            while len(self._memory_cache) > self.memory_cache_size or (
+                self.memory_cache_max_bytes is not None and self._memory_bytes > self.memory_cache_max_bytes
+            ):
+                _, (_, _, evicted) = self._memory_cache.popitem(last=False)
+                self._memory_bytes -= evicted
+        return self._private_copy(result)
+    
+    def _lookup_cache(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Tuple[Path, Optional[Dict[str, Any]]]:
+        """
+        Find the cache file for a request and whether it can be served from cache.
+        
+        :param endpoint: API endpoint name
+        :param params: Query parameters dictionary
+        :param use_cache: If False, never report a usable entry
+        :returns: Tuple of (cache file path, manifest entry if a valid cached copy exists else None)
+        """
+        entry = self.manifest.get(endpoint, params)
+        if entry is not None:
+            cache_file = Path(entry["path"])
+        else:
+            cache_file = self._generate_cache_filename(endpoint, params)
+        
+        if not use_cache:
+            return cache_file, None
+        if entry is None:
+            entry = self._index_existing_cache(endpoint, params, cache_file)
+        if entry is None or entry["expired"]:
+            return cache_file, None
+        self.manifest.touch(endpoint, params)
+        self._protect_in_batches(entry["key"])
+        return cache_file, entry
+    
+    async def _fetch_columns(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool = True,
+        save: Optional[bool] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch a telemetry endpoint as typed columns, going through the memory and disk caches.
+        
+        :param endpoint: API endpoint name (e.g., 'location', 'car_data')
+        :param params: Query parameters dictionary
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :param save: Whether to write the response to cache (defaults to use_cache)
+        :returns: Mapping of field name to {'kind', 'array'} (empty if there is no data)
+        """
+        return await self._memoized(
+            "columns", endpoint, params, use_cache,
+            lambda: self._fetch_columns_uncached(endpoint, params, use_cache=use_cache, save=save)
+        )
+    
+    async def _fetch_columns_uncached(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool = True,
+        save: Optional[bool] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch a telemetry endpoint as typed columns, going through the on-disk cache.
+        
+        Cache hits are memory-mapped. Misses are streamed and decoded straight
+        into arrays when the HTTP client provides ``get_columns``. A response
+        that is not numeric telemetry is cached as JSON and marked as such in
+        the manifest, and its records are handed back in the exception.
+        
+        :param endpoint: API endpoint name (e.g., 'location', 'car_data')
+        :param params: Query parameters dictionary
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :param save: Whether to write the response to cache (defaults to use_cache)
+        :returns: Mapping of field name to {'kind', 'array'} (empty if there is no data)
+        :raises NonColumnarResponse: If the data is not numeric telemetry
+        """
+        save = use_cache if save is None else save
+        cache_file, entry = self._lookup_cache(endpoint, params, use_cache)
+        if entry is not None:
+            if entry["row_count"] == 0:
+                return {}
+            cols_dir = columnar_path(cache_file)
+            if entry["columnar"] is None and not cols_dir.exists() and cache_file.exists():
+                # Indexed before formats were recorded: migrate it once, or remember that it stays JSON
+                self._load_from_cache(cache_file)
+                entry = self._record_in_manifest(
+                    endpoint, params, cache_file, entry["row_count"], fetched_at=entry["fetched_at"]
+                )
+            if entry["columnar"] == 0:
+                records = self._load_from_cache(cache_file, migrate=False)
+                if records is not None:
+                    raise NonColumnarResponse(records, f"Response from '{endpoint}' is not numeric telemetry")
+            else:
+                schema = load_schema(cols_dir)
+                arrays = load_columns(cols_dir, schema=schema) if schema is not None else None
+                if arrays is not None:
+                    return {name: {"kind": schema["kinds"][name], "array": array} for name, array in arrays.items()}
+        
+        url = f"{self.BASE_URL}/{endpoint}"
+        get_columns = getattr(self.http_client, "get_columns", None)
+        try:
+            if get_columns is not None:
+                columns = await get_columns(url, params)
+            else:
+                response = await self.http_client.get(url, params)
+                records = response if isinstance(response, list) else []
+                columns = records_to_columns(records) if records else {}
+                if columns is None:
+                    raise NonColumnarResponse(records, f"Response from '{endpoint}' is not numeric telemetry")
+        except NonColumnarResponse as exc:
+            if save:
+                self._save_to_cache(cache_file, exc.records, columnar=False)
+                self._record_in_manifest(endpoint, params, cache_file, len(exc.records))
+            raise
+        
+        if save:
+            if columns:
+                try:
+                    save_columns(columnar_path(cache_file), columns)
+                    if cache_file.exists():
+                        cache_file.unlink()
+                except (IOError, OSError):
+                    pass
+            else:
+                self._save_to_cache(cache_file, [])
+            row_count = len(next(iter(columns.values()))["array"]) if columns else 0
+            self._record_in_manifest(endpoint, params, cache_file, row_count)
+        
+        return columns
+    
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool = True,
+        refresh: bool = False,
+        save: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch an endpoint, going through the memory and disk caches.
+        
+        :param endpoint: API endpoint name (e.g., 'location', 'car_data')
+        :param params: Query parameters dictionary
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :param refresh: If True, only fetch records newer than the cached ones and append them
+        :param save: Whether to write the response to cache (defaults to use_cache)
+        :returns: List of records returned by the API
+        """
+        if refresh:
+            self._forget_in_memory(manifest_key(endpoint, params))
+            result = await self._fetch_delta(endpoint, params)
+            self._forget_in_memory(manifest_key(endpoint, params))
+            return result
+        
+        return await self._memoized(
+            "records", endpoint, params, use_cache,
+            lambda: self._fetch_uncached(endpoint, params, use_cache=use_cache, save=save)
+        )
+    
+    async def _fetch_uncached(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool = True,
+        save: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch an endpoint, going through the on-disk cache only.
+        
+        :param endpoint: API endpoint name (e.g., 'location', 'car_data')
+        :param params: Query parameters dictionary
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :param save: Whether to write the response to cache (defaults to use_cache)
+        :returns: List of records returned by the API
+        """
+        if endpoint in self.TELEMETRY_ENDPOINTS and hasattr(self.http_client, "get_columns"):
+            try:
+                columns = await self._fetch_columns(endpoint, params, use_cache=use_cache, save=save)
+            except NonColumnarResponse as exc:
+                return exc.records
+            return self._columns_to_records(columns)
+        
+        cache_file, entry = self._lookup_cache(endpoint, params, use_cache)
+        if entry is not None:
+            if entry["row_count"] == 0:
+                return []
+            cached_data = self._load_from_cache(cache_file, migrate=entry["columnar"] is None)
+            if cached_data is not None:
+                return cached_data
+        
+        response = await self.http_client.get(f"{self.BASE_URL}/{endpoint}", params)
+        result = response if isinstance(response, list) else []
+        columns = records_to_columns(result)
+        if columns is not None:
+            # Return the records a later cache hit would, with timestamps reformatted the same way
+            result = self._columns_to_records(columns)
+        
+        if use_cache if save is None else save:
+            self._save_to_cache(cache_file, result, columns=columns)
+            self._record_in_manifest(endpoint, params, cache_file, len(result))
+        
+        return result
+    
+    @staticmethod
+    def _records_before(records: List[Dict[str, Any]], end: datetime) -> List[Dict[str, Any]]:
+        """
+        Drop records dated at or after a time.
+        
+        :param records: Records with a 'date' field (records without one are kept)
+        :param end: Exclusive upper bound
+        :returns: Records before ``end``, in their original order
+        """
+        if not records:
+            return records
+        end_ns = parse_iso_timestamps([end.isoformat()])[0]
+        keep = parse_iso_timestamps([record.get("date") for record in records]) < end_ns
+        if keep.all():
+            return records
+        return [record for record, kept in zip(records, keep.tolist()) if kept]
+    
+    @staticmethod
+    def _records_after(records: List[Dict[str, Any]], start_ns: int) -> List[Dict[str, Any]]:
+        """
+        Drop records dated at or before a time.
+        
+        :param records: Records with a 'date' field (records without one are dropped)
+        :param start_ns: Exclusive lower bound in nanoseconds since the epoch
+        :returns: Records after ``start_ns``, in their original order
+        """
+        if not records:
+            return records
+        keep = parse_iso_timestamps([record.get("date") for record in records]) > start_ns
+        if keep.all():
+            return records
+        return [record for record, kept in zip(records, keep.tolist()) if kept]
+    
+    @staticmethod
+    def _columns_to_records(
+        columns: Dict[str, Dict[str, Any]],
+        rename: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert typed columns to a list of dicts, optionally selecting and renaming fields.
+        
+        :param columns: Mapping of field name to {'kind', 'array'}
+        :param rename: Mapping of output key to source field; missing fields become None
+        :returns: List of records
+        """
+        if not columns:
+            return []
+        if rename is None:
+            rename = {name: name for name in columns}
+        present = {out: src for out, src in rename.items() if src in columns}
+        records = columns_to_records(
+            {out: columns[src]["array"] for out, src in present.items()},
+            {out: columns[src]["kind"] for out, src in present.items()}
+        )
+        missing = [out for out in rename if out not in present]
+        if missing:
+            for record in records:
+                for out in missing:
+                    record[out] = None
+            records = [{out: record[out] for out in rename} for record in records]
+        return records
+    
+    def list_cached(
+        self,
+        session_key: Optional[int] = None,
+        endpoint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List cached responses from the cache manifest.
+        
+        :param session_key: Only list entries for this session
+        :param endpoint: Only list entries for this endpoint (e.g., 'location')
+        :returns: List of manifest entries (endpoint, params, path, size_bytes, row_count, ...)
+        """
+        return self.manifest.list_entries(session_key=session_key, endpoint=endpoint)
+    
+    async def _resolve_time_range(
+        self,
+        session_key: Optional[int] = None,
+        date: Optional[str] = None,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Tuple[datetime, datetime]:
+        """
+        Determine the time range to split into download windows.
+        
+        Uses explicit date_start/date_end if given, otherwise the session's
+        start and end from session metadata, otherwise the whole day of ``date``.
+        
+        :param session_key: Session key
+        :param date: Specific date (YYYY-MM-DD)
+        :param date_start: Start of range (ISO date or datetime)
+        :param date_end: End of range (ISO date or datetime)
+        :param use_cache: If True, load session metadata from cache if available
+        :returns: Tuple of (start, end) timezone-aware datetimes
+        """
+        if date_start is not None and date_end is not None:
+            start, end = date_start, date_end
+        elif session_key is not None:
+            sessions = await self.get_sessions(session_key=session_key, use_cache=use_cache)
+            if not sessions:
+                raise ValueError(f"No session metadata found for session_key {session_key}")
+            start, end = sessions[0]["date_start"], sessions[0]["date_end"]
+        elif date is not None:
+            start = date
+            end = (datetime.fromisoformat(date) + timedelta(days=1)).strftime("%Y-%m-%d")
+        else:
+            raise ValueError("Windowed download requires session_key, date, or date_start and date_end")
+        
+        start_dt = datetime.fromisoformat(start)
+        end_dt = datetime.fromisoformat(end)
+        if start_dt.tzinfo is None:
+            start_dt = start_dt.replace(tzinfo=timezone.utc)
+        if end_dt.tzinfo is None:
+            end_dt = end_dt.replace(tzinfo=timezone.utc)
+        if end_dt <= start_dt:
+            raise ValueError(f"Empty time range: {start} to {end}")
+        return start_dt, end_dt
+    
+    async def _fetch_windowed(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        start: datetime,
+        end: datetime,
+        windows: int,
+        max_concurrency: int = 4,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch an endpoint as N consecutive time windows downloaded concurrently.
+        
+        Each window is a separate date range query with its own cache entry,
+        so an interrupted download only re-fetches the missing windows.
+        
+        HTTP clients append '=' to every parameter name, so the 'date>' and
+        'date<' keys reach the API as 'date>=' and 'date<='. The API has no
+        exclusive upper bound that survives this encoding, so each window
+        asks for its end inclusively and drops samples at or after it before
+        stitching; a sample on a window boundary is kept only by the later window.
+        
+        :param endpoint: API endpoint name (e.g., 'location', 'car_data')
+        :param params: Query parameters shared by every window
+        :param start: Start of the time range (inclusive)
+        :param end: End of the time range (exclusive)
+        :param windows: Number of windows to split the range into
+        :param max_concurrency: Maximum number of windows downloading at once
+        :param use_cache: If True, load windows from cache if available; if False, force API calls
+        :returns: Records from all windows, in time order
+        """
+        if windows < 1:
+            raise ValueError("windows must be at least 1")
+        
+        step = (end - start) / windows
+        bounds = [start + step * i for i in range(windows)] + [end]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def fetch_window(window_start, window_end):
+            window_params = dict(params)
+            window_params["date>"] = window_start.isoformat()
+            window_params["date<"] = window_end.isoformat()
+            async with semaphore:
+                records = await self._fetch(endpoint, window_params, use_cache=use_cache)
+            return self._records_before(records, window_end)
+        
+        with self._cache_batch():
+            chunks = await asyncio.gather(*[
+                fetch_window(bounds[i], bounds[i + 1]) for i in range(windows)
+            ])
+        
+        result = []
+        for chunk in chunks:
+            result.extend(chunk)
+        return result
     
     async def get_location_data(
         self,
@@ -113,7 +1087,10 @@ class OpenF1Client:
         date: Optional[str] = None,
         date_start: Optional[str] = None,
         date_end: Optional[str] = None,
-        use_cache: bool = True
+        use_cache: bool = True,
+        windows: Optional[int] = None,
+        max_concurrency: int = 4,
+        refresh: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Fetch car location data from OpenF1 API.
@@ -125,9 +1102,11 @@ class OpenF1Client:
         :param date_start: Start of date range (YYYY-MM-DD)
         :param date_end: End of date range (YYYY-MM-DD)
         :param use_cache: If True, load from cache if available; if False, force API call
+        :param windows: If set, split the time range into this many windows fetched concurrently
+        :param max_concurrency: Maximum number of windows downloading at once
+        :param refresh: If True, only fetch samples newer than the cached ones and append them
         :returns: List of location data points with time and coordinates
         """
-        url = f"{self.BASE_URL}/location"
         params = {}
         
         if driver_number is not None:
@@ -136,6 +1115,22 @@ class OpenF1Client:
             params["session_key"] = session_key
         if meeting_key is not None:
             params["meeting_key"] = meeting_key
+        
+        if windows is not None:
+            if refresh:
+                raise ValueError("refresh is not supported together with windows")
+            start, end = await self._resolve_time_range(
+                session_key=session_key,
+                date=date,
+                date_start=date_start,
+                date_end=date_end,
+                use_cache=use_cache
+            )
+            return await self._fetch_windowed(
+                "location", params, start, end, windows,
+                max_concurrency=max_concurrency, use_cache=use_cache
+            )
+        
         if date is not None:
             params["date"] = date
         if date_start is not None:
@@ -143,20 +1138,7 @@ class OpenF1Client:
         if date_end is not None:
             params["date_end"] = date_end
         
-        cache_file = self._generate_cache_filename("location", params)
-        
-        if use_cache:
-            cached_data = self._load_from_cache(cache_file)
-            if cached_data is not None:
-                return cached_data
-        
-        response = await self.http_client.get(url, params)
-        result = response if isinstance(response, list) else []
-        
-        if use_cache:
-            self._save_to_cache(cache_file, result)
-        
-        return result
+        return await self._fetch("location", params, use_cache=use_cache, refresh=refresh)
     
     async def get_car_data(
         self,
@@ -164,7 +1146,12 @@ class OpenF1Client:
         session_key: Optional[int] = None,
         meeting_key: Optional[int] = None,
         date: Optional[str] = None,
-        use_cache: bool = True
+        use_cache: bool = True,
+        date_start: Optional[str] = None,
+        date_end: Optional[str] = None,
+        windows: Optional[int] = None,
+        max_concurrency: int = 4,
+        refresh: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Fetch car telemetry data from OpenF1 API.
@@ -174,9 +1161,13 @@ class OpenF1Client:
         :param meeting_key: Filter by meeting key
         :param date: Filter by specific date (YYYY-MM-DD)
         :param use_cache: If True, load from cache if available; if False, force API call
+        :param date_start: Start of time range for windowed download (ISO date or datetime)
+        :param date_end: End of time range for windowed download (ISO date or datetime)
+        :param windows: If set, split the time range into this many windows fetched concurrently
+        :param max_concurrency: Maximum number of windows downloading at once
+        :param refresh: If True, only fetch samples newer than the cached ones and append them
         :returns: List of car telemetry data points
         """
-        url = f"{self.BASE_URL}/car_data"
         params = {}
         
         if driver_number is not None:
@@ -185,142 +1176,448 @@ class OpenF1Client:
             params["session_key"] = session_key
         if meeting_key is not None:
             params["meeting_key"] = meeting_key
+        
+        if windows is not None:
+            if refresh:
+                raise ValueError("refresh is not supported together with windows")
+            start, end = await self._resolve_time_range(
+                session_key=session_key,
+                date=date,
+                date_start=date_start,
+                date_end=date_end,
+                use_cache=use_cache
+            )
+            return await self._fetch_windowed(
+                "car_data", params, start, end, windows,
+                max_concurrency=max_concurrency, use_cache=use_cache
+            )
+        
+        if date is not None:
+            params["date"] = date
+        
+        return await self._fetch("car_data", params, use_cache=use_cache, refresh=refresh)
+    
+    async def get_sessions(
+        self,
+        meeting_key: Optional[int] = None,
+        date: Optional[str] = None,
+        use_cache: bool = True,
+        session_key: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch session metadata to help identify session keys.
+        
+        :param meeting_key: Filter by meeting key
+        :param date: Filter by specific date (YYYY-MM-DD)
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :param session_key: Filter by session key
+        :returns: List of session metadata
+        """
+        params = {}
+        
+        if meeting_key is not None:
+            params["meeting_key"] = meeting_key
+        if date is not None:
+            params["date"] = date
+        if session_key is not None:
+            params["session_key"] = session_key
+        
+        return await self._fetch("sessions", params, use_cache=use_cache)
+    
+    async def get_drivers(
+        self,
+        session_key: Optional[int] = None,
+        meeting_key: Optional[int] = None,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch driver metadata to help identify driver numbers.
+        
+        :param session_key: Filter by session key
+        :param meeting_key: Filter by meeting key
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :returns: List of driver metadata
+        """
+        params = {}
+        
+        if session_key is not None:
+            params["session_key"] = session_key
+        if meeting_key is not None:
+            params["meeting_key"] = meeting_key
+        
+        return await self._fetch("drivers", params, use_cache=use_cache)
+    
+    async def get_time_and_location(
+        self,
+        driver_number: int,
+        session_key: Optional[int] = None,
+        meeting_key: Optional[int] = None,
+        date: Optional[str] = None,
+        use_cache: bool = True,
+        refresh: bool = False,
+        as_records: bool = False
+    ) -> Union[TelemetryFrame, List[Dict[str, Any]]]:
+        """
+        Get time and location data for a specific driver.
+        
+        Returns a TelemetryFrame holding int64 nanosecond timestamps and x, y, z
+        coordinate arrays. When served from the columnar cache the arrays are
+        memory-mapped views, not copies.
+        
+        :param driver_number: Driver number to query
+        :param session_key: Optional session key filter
+        :param meeting_key: Optional meeting key filter
+        :param date: Optional date filter (YYYY-MM-DD)
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :param refresh: If True, only fetch samples newer than the cached ones and append them
+        :param as_records: If True, return a list of dicts with time, x, y, z, driver_number, session_key instead
+        :returns: TelemetryFrame, or list of dictionaries if as_records is True
+        """
+        if refresh:
+            location_data = await self.get_location_data(
+                driver_number=driver_number,
+                session_key=session_key,
+                meeting_key=meeting_key,
+                date=date,
+                use_cache=use_cache,
+                refresh=refresh
+            )
+            frame = TelemetryFrame.from_records(location_data, time_field="date")
+        else:
+            params = {"driver_number": driver_number}
+            if session_key is not None:
+                params["session_key"] = session_key
+            if meeting_key is not None:
+                params["meeting_key"] = meeting_key
+            if date is not None:
+                params["date"] = date
+            columns = await self._fetch_columns("location", params, use_cache=use_cache)
+            frame = TelemetryFrame.from_columns(columns)
+        
+        return frame.to_records() if as_records else frame
+    
+    async def get_merged_telemetry(
+        self,
+        driver_number: int,
+        session_key: Optional[int] = None,
+        meeting_key: Optional[int] = None,
+        date: Optional[str] = None,
+        tolerance: Optional[float] = 0.3,
+        direction: str = "nearest",
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get location and car_data for a driver joined on time.
+        
+        Both endpoints are fetched concurrently and every location sample is
+        matched to the car_data sample chosen by ``direction`` within
+        ``tolerance`` seconds.
+        
+        :param driver_number: Driver number to query
+        :param session_key: Optional session key filter
+        :param meeting_key: Optional meeting key filter
+        :param date: Optional date filter (YYYY-MM-DD)
+        :param tolerance: Maximum time difference in seconds between matched samples (None = unlimited)
+        :param direction: 'nearest', 'backward' (previous car_data sample) or 'forward' (next sample)
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :returns: Merged columns (see telemetry_join.join_car_data); unmatched channels are NaN
+        """
+        params = {"driver_number": driver_number}
+        if session_key is not None:
+            params["session_key"] = session_key
+        if meeting_key is not None:
+            params["meeting_key"] = meeting_key
         if date is not None:
             params["date"] = date
         
-        cache_file = self._generate_cache_filename("car_data", params)
-        
-        if use_cache:
-            cached_data = self._load_from_cache(cache_file)
-            if cached_data is not None:
-                return cached_data
-        
-        response = await self.http_client.get(url, params)
-        result = response if isinstance(response, list) else []
-        
-        if use_cache:
-            self._save_to_cache(cache_file, result)
-        
-        return result
+        with self._cache_batch():
+            location, car_data = await asyncio.gather(
+                self._fetch_columns("location", params, use_cache=use_cache),
+                self._fetch_columns("car_data", params, use_cache=use_cache)
+            )
+        return join_car_data(
+            TelemetryFrame.from_columns(location),
+            car_data,
+            tolerance=tolerance,
+            direction=direction
+        )
     
-    async def get_sessions(
+    async def export_tel_json(
         self,
+        output_path: str,
+        driver_number: int,
+        session_key: Optional[int] = None,
         meeting_key: Optional[int] = None,
         date: Optional[str] = None,
+        tolerance: Optional[float] = 0.3,
+        data_key: Optional[str] = None,
         use_cache: bool = True
-    ) -> List[Dict[str, Any]]:
+    ) -> Path:
         """
-        Fetch session metadata to help identify session keys.
+        Write a driver's merged telemetry in the {"tel": {...}} format read by the animation scripts.
         
-        :param meeting_key: Filter by meeting key
-        :param date: Filter by specific date (YYYY-MM-DD)
+        :param output_path: Output JSON file (e.g., '10_tel.json')
+        :param driver_number: Driver number to query
+        :param session_key: Optional session key filter
+        :param meeting_key: Optional meeting key filter
+        :param date: Optional date filter (YYYY-MM-DD)
+        :param tolerance: Maximum time difference in seconds between matched samples
+        :param data_key: Optional 'dataKey' label stored in the file
         :param use_cache: If True, load from cache if available; if False, force API call
-        :returns: List of session metadata
+        :returns: Path of the written file
         """
-        url = f"{self.BASE_URL}/sessions"
-        params = {}
-        
-        if meeting_key is not None:
-            params["meeting_key"] = meeting_key
-        if date is not None:
-            params["date"] = date
-        
-        cache_file = self._generate_cache_filename("sessions", params)
+        merged = await self.get_merged_telemetry(
+            driver_number,
+            session_key=session_key,
+            meeting_key=meeting_key,
+            date=date,
+            tolerance=tolerance,
+            use_cache=use_cache
+        )
+        return write_tel_json(Path(output_path), merged, data_key=data_key)
+    
+    async def iter_session_telemetry(
+        self,
+        session_key: int,
+        driver_numbers: Optional[List[int]] = None,
+        include_car_data: bool = True,
+        max_concurrency: int = 6,
+        use_cache: bool = True
+    ) -> AsyncIterator[Tuple[int, Dict[str, List[Dict[str, Any]]]]]:
+        """
+        Fetch location (and car_data) for every driver in a session concurrently.
         
-        if use_cache:
-            cached_data = self._load_from_cache(cache_file)
-            if cached_data is not None:
-                return cached_data
+        All requests go through the shared HTTP client, with at most
+        ``max_concurrency`` in flight at once. Results are yielded per driver
+        as soon as that driver's requests complete, not in grid order.
         
-        response = await self.http_client.get(url, params)
-        result = response if isinstance(response, list) else []
+        :param session_key: Session key to fetch
+        :param driver_numbers: Drivers to fetch (None = every driver in the session)
+        :param include_car_data: If True, also fetch car_data for each driver
+        :param max_concurrency: Maximum number of concurrent HTTP requests
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :returns: Async iterator of (driver_number, {'location': [...], 'car_data': [...]})
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        if driver_numbers is None:
+            drivers = await self.get_drivers(session_key=session_key, use_cache=use_cache)
+            driver_numbers = sorted({d["driver_number"] for d in drivers if d.get("driver_number") is not None})
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded(fetch, driver_number):
+            async with semaphore:
+                return await fetch(driver_number=driver_number, session_key=session_key, use_cache=use_cache)
+        
+        async def fetch_driver(driver_number):
+            fetches = [bounded(self.get_location_data, driver_number)]
+            if include_car_data:
+                fetches.append(bounded(self.get_car_data, driver_number))
+            results = await asyncio.gather(*fetches)
+            data = {"location": results[0]}
+            if include_car_data:
+                data["car_data"] = results[1]
+            return driver_number, data
+        
+        with self._cache_batch():
+            tasks = [asyncio.ensure_future(fetch_driver(n)) for n in driver_numbers]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+    
+    async def get_session_telemetry(
+        self,
+        session_key: int,
+        driver_numbers: Optional[List[int]] = None,
+        include_car_data: bool = True,
+        max_concurrency: int = 6,
+        use_cache: bool = True
+    ) -> Dict[int, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetch location (and car_data) for every driver in a session and collect the results.
         
-        if use_cache:
-            self._save_to_cache(cache_file, result)
+        Convenience wrapper around iter_session_telemetry, e.g. for warming the cache.
         
-        return result
+        :param session_key: Session key to fetch
+        :param driver_numbers: Drivers to fetch (None = every driver in the session)
+        :param include_car_data: If True, also fetch car_data for each driver
+        :param max_concurrency: Maximum number of concurrent HTTP requests
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :returns: Dictionary mapping driver number to its fetched data
+        """
+        results = {}
+        async for driver_number, data in self.iter_session_telemetry(
+            session_key,
+            driver_numbers=driver_numbers,
+            include_car_data=include_car_data,
+            max_concurrency=max_concurrency,
+            use_cache=use_cache
+        ):
+            results[driver_number] = data
+        return results
     
-    async def get_drivers(
+    async def get_laps(
         self,
-        session_key: Optional[int] = None,
-        meeting_key: Optional[int] = None,
+        session_key: int,
+        driver_number: Optional[int] = None,
         use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
-        Fetch driver metadata to help identify driver numbers.
+        Fetch lap timing (lap_number, date_start, lap_duration, ...) for a session.
         
-        :param session_key: Filter by session key
-        :param meeting_key: Filter by meeting key
+        :param session_key: Session key to query
+        :param driver_number: Optional driver number filter
         :param use_cache: If True, load from cache if available; if False, force API call
-        :returns: List of driver metadata
+        :returns: List of lap records
         """
-        url = f"{self.BASE_URL}/drivers"
-        params = {}
-        
-        if session_key is not None:
-            params["session_key"] = session_key
-        if meeting_key is not None:
-            params["meeting_key"] = meeting_key
-        
-        cache_file = self._generate_cache_filename("drivers", params)
-        
-        if use_cache:
-            cached_data = self._load_from_cache(cache_file)
-            if cached_data is not None:
-                return cached_data
-        
-        response = await self.http_client.get(url, params)
-        result = response if isinstance(response, list) else []
+        params = {"session_key": session_key}
+        if driver_number is not None:
+            params["driver_number"] = driver_number
         
-        if use_cache:
-            self._save_to_cache(cache_file, result)
+        return await self._fetch("laps", params, use_cache=use_cache)
+    
+    async def get_track_centerline(
+        self,
+        session_key: int,
+        driver_number: int,
+        lap_number: Optional[int] = None,
+        circuit: Optional[str] = None,
+        spacing: float = 50.0,
+        use_cache: bool = True,
+        rebuild: bool = False
+    ) -> Centerline:
+        """
+        Get the circuit's centerline, fitting it to one of a driver's laps if it isn't cached yet.
+        
+        Centerlines are cached per circuit under the cache directory, so every
+        later session at the same circuit reuses the first one built.
+        
+        :param session_key: Session to take the reference lap from
+        :param driver_number: Driver whose lap is used
+        :param lap_number: Lap to use (None = the driver's fastest lap that isn't a pit out-lap)
+        :param circuit: Circuit name used as the cache key (None = the session's circuit_short_name)
+        :param spacing: Control point spacing in OpenF1 position units
+        :param use_cache: If True, load API data from cache if available; if False, force API call
+        :param rebuild: If True, refit even if a centerline is cached for the circuit
+        :returns: Centerline in OpenF1 x, y, z coordinates
+        """
+        cache_dir = self.cache_dir / self.CENTERLINE_CACHE_SUBDIR
+        if circuit is None:
+            sessions = await self.get_sessions(session_key=session_key, use_cache=use_cache)
+            if not sessions or not sessions[0].get("circuit_short_name"):
+                raise ValueError(f"No circuit name for session {session_key}; pass circuit")
+            circuit = sessions[0]["circuit_short_name"]
+        if not rebuild:
+            try:
+                return load_centerline(circuit, cache_dir=cache_dir)
+            except FileNotFoundError:
+                pass
+        
+        laps = await self.get_laps(session_key, driver_number=driver_number, use_cache=use_cache)
+        laps = [lap for lap in laps if lap.get("date_start") and lap.get("lap_duration")]
+        if lap_number is not None:
+            laps = [lap for lap in laps if lap.get("lap_number") == lap_number]
+        else:
+            laps = sorted((lap for lap in laps if not lap.get("is_pit_out_lap")), key=lambda lap: lap["lap_duration"])
+        if not laps:
+            raise ValueError(f"No timed lap found for driver {driver_number} in session {session_key}")
+        
+        start = int(parse_iso_timestamps([laps[0]["date_start"]])[0])
+        end = start + int(laps[0]["lap_duration"] * 1e9)
+        frame = await self.get_time_and_location(driver_number, session_key=session_key, use_cache=use_cache)
+        lap_frame = frame.between(start, end).dropna()
+        centerline = load_centerline(
+            circuit, positions=lap_frame.positions, spacing=spacing, cache_dir=cache_dir, rebuild=True
+        )
+        if self.cache_max_bytes is not None or self.cache_max_entries is not None:
+            self._index_unindexed_files()
+        return centerline
+    
+    async def get_track_position(
+        self,
+        driver_number: int,
+        session_key: int,
+        centerline: Optional[Centerline] = None,
+        continuous: bool = True,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get a driver's track distance and lateral offset for every location sample.
         
-        return result
+        :param driver_number: Driver number to query
+        :param session_key: Session key to query
+        :param centerline: Track centerline (None = get_track_centerline for this session and driver)
+        :param continuous: Use the continuity-aware projection for time-ordered samples
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :returns: Dictionary with 'time' (int64 ns), 'driver_number', 'distance', 'offset' and 'segment'
+                  (see track_projection.CenterlineIndex.project_frame)
+        """
+        frame, centerline = await asyncio.gather(
+            self.get_time_and_location(driver_number, session_key=session_key, use_cache=use_cache),
+            self._resolve_centerline(centerline, session_key, driver_number, use_cache)
+        )
+        return self.centerline_index(centerline).project_frame(frame, continuous=continuous)
     
-    async def get_time_and_location(
+    async def get_distance_index(
         self,
         driver_number: int,
-        session_key: Optional[int] = None,
-        meeting_key: Optional[int] = None,
-        date: Optional[str] = None,
+        session_key: int,
+        centerline: Optional[Centerline] = None,
         use_cache: bool = True
-    ) -> List[Dict[str, Any]]:
+    ) -> DistanceIndex:
         """
-        Get time and location data for a specific driver.
+        Get a driver's distance <-> time index for a session.
         
-        Returns JSON array with time and location (x, y, z) coordinates.
+        Distances are measured along the centerline, so indexes for different
+        drivers built from the same centerline can be compared directly.
         
         :param driver_number: Driver number to query
-        :param session_key: Optional session key filter
-        :param meeting_key: Optional meeting key filter
-        :param date: Optional date filter (YYYY-MM-DD)
+        :param session_key: Session key to query
+        :param centerline: Track centerline (None = get_track_centerline for this session and driver)
         :param use_cache: If True, load from cache if available; if False, force API call
-        :returns: List of dictionaries with date, x, y, z coordinates
+        :returns: DistanceIndex with times in seconds from the driver's first sample
         """
-        location_data = await self.get_location_data(
-            driver_number=driver_number,
-            session_key=session_key,
-            meeting_key=meeting_key,
-            date=date,
-            use_cache=use_cache
+        centerline = await self._resolve_centerline(centerline, session_key, driver_number, use_cache)
+        projected = await self.get_track_position(
+            driver_number, session_key, centerline=centerline, use_cache=use_cache
         )
+        return DistanceIndex.from_projection(projected, centerline.length)
+    
+    async def _resolve_centerline(
+        self,
+        centerline: Optional[Centerline],
+        session_key: int,
+        driver_number: int,
+        use_cache: bool
+    ) -> Centerline:
+        """
+        Use the given centerline or fetch the session's.
         
-        result = []
-        for point in location_data:
-            result.append({
-                "time": point.get("date"),
-                "x": point.get("x"),
-                "y": point.get("y"),
-                "z": point.get("z"),
-                "driver_number": point.get("driver_number"),
-                "session_key": point.get("session_key")
-            })
+        :returns: Centerline
+        """
+        if centerline is not None:
+            return centerline
+        return await self.get_track_centerline(session_key, driver_number, use_cache=use_cache)
+    
+    def centerline_index(self, centerline: Centerline) -> CenterlineIndex:
+        """
+        Get the spatial index for a centerline, building it on first use.
         
-        return result
+        :param centerline: Track centerline
+        :returns: CenterlineIndex reused while the same centerline is passed
+        """
+        if self._centerline_index is None or self._centerline_index.centerline is not centerline:
+            self._centerline_index = CenterlineIndex(centerline)
+        return self._centerline_index
     
     def debug_plot_path(
         self,
-        location_data: List[Dict[str, Any]],
+        location_data: Union[TelemetryFrame, List[Dict[str, Any]]],
         driver_number: Optional[int] = None,
         show_plot: bool = True
     ) -> None:
@@ -329,23 +1626,26 @@ class OpenF1Client:
         
         Creates a 2D plot showing the car's path on track (x, y coordinates).
         
-        :param location_data: List of location data points from get_time_and_location
+        :param location_data: TelemetryFrame or list of location data points from get_time_and_location
         :param driver_number: Optional driver number for title
         :param show_plot: Whether to display the plot immediately
         """
         try:
             import matplotlib.pyplot as plt
+            import numpy as np
         except ImportError:
-            raise ImportError("matplotlib is required for debug_plot_path. Install with: pip install matplotlib")
+            raise ImportError("matplotlib and numpy are required. Install with: pip install matplotlib numpy")
         
         if not location_data:
             print("No location data to plot")
             return
         
-        x_coords = [point.get("x") for point in location_data if point.get("x") is not None]
-        y_coords = [point.get("y") for point in location_data if point.get("y") is not None]
+        frame = as_frame(location_data)
+        valid = ~(np.isnan(frame.x) | np.isnan(frame.y))
+        x_coords = frame.x[valid]
+        y_coords = frame.y[valid]
         
-        if not x_coords or not y_coords:
+        if not len(x_coords):
             print("No valid coordinates found in location data")
             return
         
@@ -371,11 +1671,14 @@ class OpenF1Client:
     
     def plot_3d_track(
         self,
-        location_data: List[Dict[str, Any]],
+        location_data: Union[TelemetryFrame, List[Dict[str, Any]]],
         driver_number: Optional[int] = None,
         animate: bool = False,
         show_plot: bool = True,
-        frame_skip: int = 1
+        frame_skip: int = 1,
+        trail_length: int = 200,
+        trail_seconds: Optional[float] = None,
+        fade_trail: bool = False
     ) -> None:
         """
         Plot 3D track visualization showing car path with optional animation.
@@ -383,35 +1686,36 @@ class OpenF1Client:
         Creates a 3D plot showing the car's path on track (x, y, z coordinates).
         Optionally animates the car moving along the track.
         
-        :param location_data: List of location data points from get_time_and_location
+        :param location_data: TelemetryFrame or list of location data points from get_time_and_location
         :param driver_number: Optional driver number for title
         :param animate: If True, animate car moving along track; if False, show static path
         :param show_plot: Whether to display the plot immediately
         :param frame_skip: Number of frames to skip in animation (1 = show all, 10 = show every 10th)
+        :param trail_length: Trail length in samples when animating
+        :param trail_seconds: Trail length in seconds when animating (overrides trail_length)
+        :param fade_trail: If True, the trail fades out towards its oldest sample
         """
         try:
             import matplotlib.pyplot as plt
             from mpl_toolkits.mplot3d import Axes3D
             from matplotlib.animation import FuncAnimation
+            import numpy as np
         except ImportError:
-            raise ImportError("matplotlib is required for plot_3d_track. Install with: pip install matplotlib")
+            raise ImportError("matplotlib and numpy are required. Install with: pip install matplotlib numpy")
         
         if not location_data:
             print("No location data to plot")
             return
         
-        valid_points = [
-            point for point in location_data
-            if point.get("x") is not None and point.get("y") is not None and point.get("z") is not None
-        ]
+        frame = as_frame(location_data).dropna()
         
-        if not valid_points:
+        if not len(frame):
             print("No valid 3D coordinates found in location data")
             return
         
-        x_coords = [point.get("x") for point in valid_points]
-        y_coords = [point.get("y") for point in valid_points]
-        z_coords = [point.get("z") for point in valid_points]
+        x_coords = frame.x
+        y_coords = frame.y
+        z_coords = frame.z
         
         fig = plt.figure(figsize=(12, 10))
         ax = fig.add_subplot(111, projection='3d')
@@ -420,29 +1724,52 @@ class OpenF1Client:
             ax.plot(x_coords, y_coords, z_coords, 'b-', linewidth=1, alpha=0.3, label='Track Path')
             
             car_point, = ax.plot([], [], [], 'ro', markersize=10, label='Car Position')
-            trail_line, = ax.plot([], [], [], 'r-', linewidth=2, alpha=0.6, label='Car Trail')
+            trail_artist = TrailArtist(ax, ['red'], linewidth=2, fade=fade_trail, label='Car Trail')
+            positions = frame.positions
+            sample_times = relative_seconds(frame.time)
+            if trail_seconds is not None:
+                # Samples are pushed as they are passed, so the capacity follows the sample rate
+                sample_rate = (len(sample_times) - 1) / max(sample_times[-1] - sample_times[0], 1e-9)
+                trail = TrailBuffer.for_duration(1, trail_seconds, rate=sample_rate)
+            else:
+                trail = TrailBuffer(1, trail_capacity(samples=trail_length))
             
             ax.scatter(x_coords[0], y_coords[0], z_coords[0], 
                       color='green', s=100, marker='o', label='Start', zorder=5)
             ax.scatter(x_coords[-1], y_coords[-1], z_coords[-1], 
                       color='red', s=100, marker='s', label='End', zorder=5)
             
+            timeline = PlaybackTimeline(np.arange(len(x_coords)))
+            timeline.connect_keys(fig, seek_step=max(frame_skip, len(x_coords) // 20))
+            last = {"index": -1, "jumps": timeline.jumps}
+            
             def update_frame(frame_idx):
-                idx = min(frame_idx * frame_skip, len(x_coords) - 1)
+                idx = timeline.index()
+                if timeline.jumps != last["jumps"]:
+                    trail.clear()
+                    last["index"] = idx - timeline.direction
+                last["jumps"] = timeline.jumps
+                timeline.advance(frame_skip)
                 car_point.set_data([x_coords[idx]], [y_coords[idx]])
                 car_point.set_3d_properties([z_coords[idx]])
                 
-                trail_x = x_coords[:idx+1]
-                trail_y = y_coords[:idx+1]
-                trail_z = z_coords[:idx+1]
-                trail_line.set_data(trail_x, trail_y)
-                trail_line.set_3d_properties(trail_z)
+                # Push every sample passed since the last frame, at most one trail's worth
+                previous = last["index"]
+                if idx > previous:
+                    rows = np.arange(max(previous + 1, idx - trail.capacity + 1), idx + 1)
+                else:
+                    rows = np.arange(min(previous - 1, idx + trail.capacity - 1), idx - 1, -1)
+                trail.extend(positions[rows], sample_times[rows])
+                last["index"] = idx
                 
-                return car_point, trail_line
+                return car_point, trail_artist.update(trail.window())
             
             num_frames = (len(x_coords) + frame_skip - 1) // frame_skip
-            anim = FuncAnimation(fig, update_frame, frames=num_frames, 
-                                interval=50, blit=True, repeat=True)
+            self._scene = AnimationScene(fig, update_frame, timeline, step=frame_skip,
+                                         warmup=-(-trail.capacity // frame_skip))
+            if not self._capture_scene:
+                anim = FuncAnimation(fig, update_frame, frames=num_frames, 
+                                    interval=50, blit=True, repeat=True)
         else:
             ax.plot(x_coords, y_coords, z_coords, 'b-', linewidth=2, alpha=0.8, label='Car Path')
             ax.scatter(x_coords[0], y_coords[0], z_coords[0], 
@@ -464,7 +1791,7 @@ class OpenF1Client:
         ax.legend()
         ax.grid(True, alpha=0.3)
         
-        if show_plot:
+        if show_plot and not self._capture_scene:
             plt.show()
     
     def debug_plot_telemetry_json(self, json_file_path: str) -> None:
@@ -556,7 +1883,7 @@ class OpenF1Client:
     
     def animate_arrow_along_track(
         self,
-        location_data: List[Dict[str, Any]],
+        location_data: Union[TelemetryFrame, List[Dict[str, Any]]],
         driver_number: Optional[int] = None,
         frame_skip: int = 1,
         show_track: bool = True,
@@ -568,7 +1895,7 @@ class OpenF1Client:
         Shows a simple arrow that moves along the track, rotating to face
         the direction of travel based on the vector between consecutive points.
         
-        :param location_data: List of location data points from get_time_and_location
+        :param location_data: TelemetryFrame or list of location data points from get_time_and_location
         :param driver_number: Optional driver number for title
         :param frame_skip: Number of frames to skip in animation (1 = show all, 10 = show every 10th)
         :param show_track: If True, display the track path as a line
@@ -577,6 +1904,7 @@ class OpenF1Client:
         try:
             import matplotlib.pyplot as plt
             from mpl_toolkits.mplot3d import Axes3D
+            from mpl_toolkits.mplot3d.art3d import Line3DCollection
             from matplotlib.animation import FuncAnimation
             import numpy as np
         except ImportError:
@@ -586,20 +1914,17 @@ class OpenF1Client:
             print("No location data to animate")
             return
         
-        valid_points = [
-            point for point in location_data
-            if point.get("x") is not None and point.get("y") is not None and point.get("z") is not None
-        ]
+        frame = as_frame(location_data).dropna()
         
-        if not valid_points:
+        if not len(frame):
             print("No valid 3D coordinates found in location data")
             return
         
-        x_coords = np.array([point.get("x") for point in valid_points])
-        y_coords = np.array([point.get("y") for point in valid_points])
-        z_coords = np.array([point.get("z") for point in valid_points])
+        x_coords = frame.x
+        y_coords = frame.y
+        z_coords = frame.z
         
-        positions = np.column_stack((x_coords, y_coords, z_coords))
+        positions = frame.positions
         
         fig = plt.figure(figsize=(12, 10))
         ax = fig.add_subplot(111, projection='3d')
@@ -608,29 +1933,40 @@ class OpenF1Client:
             ax.plot(x_coords, y_coords, z_coords, 'b-', linewidth=2, alpha=0.5, label='Track Path')
         
         num_points = len(positions)
-        current_idx = [0]
-        arrow_quiver = [None]
+        timeline = PlaybackTimeline(np.arange(num_points))
+        timeline.connect_keys(fig, seek_step=max(frame_skip, num_points // 20))
+        # Shaft and two head lines, drawn like ax.quiver(..., arrow_length_ratio=0.3) but created once
+        arrow = Line3DCollection(np.zeros((3, 2, 3)), colors='red', linewidths=3)
+        ax.add_collection(arrow)
+        head_angle = np.radians(15)
         
         def create_arrow(pos, direction, length):
             """
-            Create arrow points for 3D quiver.
+            Create the line segments of a 3D arrow.
             
             :param pos: Position (x, y, z)
             :param direction: Direction vector (normalized)
             :param length: Arrow length
-            :returns: Arrow components for quiver
+            :returns: (3, 2, 3) array of shaft and head segments
             """
-            return pos[0], pos[1], pos[2], direction[0] * length, direction[1] * length, direction[2] * length
+            tip = pos + direction * length
+            side = np.array([direction[1], -direction[0], 0.0])
+            side_norm = np.linalg.norm(side)
+            side = side / side_norm if side_norm > 1e-6 else np.array([1.0, 0.0, 0.0])
+            back = -direction * np.cos(head_angle)
+            across = side * np.sin(head_angle)
+            head = 0.3 * length
+            return np.array([
+                [pos, tip],
+                [tip, tip + (back + across) * head],
+                [tip, tip + (back - across) * head],
+            ])
         
         def update_arrow(frame):
             """
             Update arrow position and rotation for animation.
             """
-            idx = current_idx[0]
-            
-            if idx >= num_points - 1:
-                current_idx[0] = 0
-                idx = 0
+            idx = timeline.index()
             
             current_pos = positions[idx]
             next_idx = min(idx + frame_skip, num_points - 1)
@@ -644,14 +1980,10 @@ class OpenF1Client:
             else:
                 direction = direction / direction_norm
             
-            if arrow_quiver[0] is not None:
-                arrow_quiver[0].remove()
+            arrow.set_segments(create_arrow(current_pos, direction, arrow_length))
             
-            x, y, z, u, v, w = create_arrow(current_pos, direction, arrow_length)
-            arrow_quiver[0] = ax.quiver(x, y, z, u, v, w, color='red', arrow_length_ratio=0.3, linewidth=3)
-            
-            current_idx[0] = next_idx
-            return arrow_quiver[0]
+            timeline.advance(frame_skip)
+            return arrow
         
         ax.set_xlabel('X Position (m)', fontsize=11)
         ax.set_ylabel('Y Position (m)', fontsize=11)
@@ -666,6 +1998,9 @@ class OpenF1Client:
         ax.grid(True, alpha=0.3)
         
         num_frames = (num_points + frame_skip - 1) // frame_skip
+        self._scene = AnimationScene(fig, update_arrow, timeline, step=frame_skip)
+        if self._capture_scene:
+            return
         anim = FuncAnimation(fig, update_arrow, frames=num_frames, interval=50, blit=False, repeat=True)
         
         plt.show()
@@ -676,7 +2011,11 @@ class OpenF1Client:
         driver_number: Optional[int] = None,
         frame_skip: int = 1,
         show_track: bool = True,
-        speed_multiplier: float = 1.0
+        speed_multiplier: float = 1.0,
+        resample_rate: Optional[float] = 60.0,
+        trail_length: int = 200,
+        trail_seconds: Optional[float] = None,
+        fade_trail: bool = False
     ) -> None:
         """
         Animate a dot moving along the track path from JSON telemetry file at real-time speed.
@@ -689,6 +2028,10 @@ class OpenF1Client:
         :param frame_skip: Number of frames to skip in animation (1 = show all, 10 = show every 10th)
         :param show_track: If True, display the track path as a line
         :param speed_multiplier: Speed multiplier (1.0 = real-time, 2.0 = 2x speed, 0.5 = half speed)
+        :param resample_rate: Resample the path to this fixed rate in Hz before animating (None = raw samples)
+        :param trail_length: Trail length in animation frames
+        :param trail_seconds: Trail length in seconds of playback (overrides trail_length)
+        :param fade_trail: If True, the trail fades out towards its oldest sample
         """
         try:
             import matplotlib.pyplot as plt
@@ -723,6 +2066,13 @@ class OpenF1Client:
         if len(time_data) != len(positions):
             time_data = np.linspace(0, len(positions) * 0.05, len(positions))
         
+        if resample_rate:
+            resampled = resample_series(
+                time_data, {"x": x_coords, "y": y_coords, "z": z_coords}, rate=resample_rate
+            )
+            time_data = resampled["time"]
+            positions = np.column_stack((resampled["x"], resampled["y"], resampled["z"]))
+        
         fig = plt.figure(figsize=(12, 10))
         ax = fig.add_subplot(111, projection='3d')
         
@@ -732,13 +2082,16 @@ class OpenF1Client:
         num_points = len(positions)
         dot_scatter = ax.scatter([], [], [], color='red', s=200, marker='o', label='Car Position', zorder=5)
         
-        trail_x = []
-        trail_y = []
-        trail_z = []
-        trail_line, = ax.plot([], [], [], 'r-', linewidth=2, alpha=0.6, label='Trail')
+        if trail_seconds is not None:
+            # One sample is pushed per frame, about every 16 ms of wall-clock time
+            trail = TrailBuffer.for_duration(1, trail_seconds, rate=60.0 / speed_multiplier)
+        else:
+            trail = TrailBuffer(1, trail_capacity(samples=trail_length))
+        trail_artist = TrailArtist(ax, ['red'], linewidth=2, fade=fade_trail, label='Trail')
         
-        current_idx = [0]
-        start_time = [None]
+        timeline = PlaybackTimeline(time_data, speed_multiplier=speed_multiplier)
+        timeline.connect_keys(fig)
+        last_jumps = [timeline.jumps]
         
         time_diffs = np.diff(time_data)
         if len(time_diffs) == 0:
@@ -750,45 +2103,17 @@ class OpenF1Client:
             """
             Update dot position for animation at real-time speed.
             """
-            if start_time[0] is None:
-                import time
-                start_time[0] = time.time()
-            
-            import time
-            elapsed = (time.time() - start_time[0]) * speed_multiplier
+            timeline.update()
+            if timeline.jumps != last_jumps[0]:
+                trail.clear()
+                last_jumps[0] = timeline.jumps
             
-            idx = current_idx[0]
-            
-            while idx < num_points - 1 and time_data[idx] <= elapsed:
-                idx += 1
-            
-            if idx >= num_points - 1:
-                idx = num_points - 1
-                current_idx[0] = 0
-                start_time[0] = time.time()
-                trail_x.clear()
-                trail_y.clear()
-                trail_z.clear()
-            else:
-                current_idx[0] = idx
-            
-            current_pos = positions[idx]
-            
-            trail_x.append(current_pos[0])
-            trail_y.append(current_pos[1])
-            trail_z.append(current_pos[2])
-            
-            if len(trail_x) > 200:
-                trail_x.pop(0)
-                trail_y.pop(0)
-                trail_z.pop(0)
+            current_pos = timeline.interpolate(positions)
+            trail.push(current_pos, time=timeline.position)
             
             dot_scatter._offsets3d = ([current_pos[0]], [current_pos[1]], [current_pos[2]])
-            if len(trail_x) > 1:
-                trail_line.set_data(trail_x, trail_y)
-                trail_line.set_3d_properties(trail_z)
             
-            return dot_scatter, trail_line
+            return dot_scatter, trail_artist.update(trail.window())
         
         ax.set_xlabel('X Position (m)', fontsize=11)
         ax.set_ylabel('Y Position (m)', fontsize=11)
@@ -804,6 +2129,9 @@ class OpenF1Client:
         ax.legend()
         ax.grid(True, alpha=0.3)
         
+        self._scene = AnimationScene(fig, update_dot, timeline, warmup=trail.capacity)
+        if self._capture_scene:
+            return
         anim = FuncAnimation(fig, update_dot, interval=16, blit=False, repeat=True, cache_frame_data=False)
         
         plt.show()
@@ -817,7 +2145,9 @@ class OpenF1Client:
         car_scale: float = 1.0,
         track_scale: float = 1.0,
         speed_multiplier: float = 1.0,
-        forward_axis: str = 'y'
+        forward_axis: str = 'y',
+        resample_rate: Optional[float] = 60.0,
+        car_max_faces: int = 5000
     ) -> None:
         """
         Animate a 3D car model moving along a 3D track from JSON telemetry file.
@@ -833,15 +2163,17 @@ class OpenF1Client:
         :param track_scale: Scale factor for track model
         :param speed_multiplier: Speed multiplier (1.0 = real-time, 2.0 = 2x speed)
         :param forward_axis: Car model's forward direction axis ('x', 'y', 'z', '-x', '-y', '-z')
+        :param resample_rate: Resample the path to this fixed rate in Hz before animating (None = raw samples)
+        :param car_max_faces: Face budget for the car model (picks a cached LOD level)
         """
         try:
             import matplotlib.pyplot as plt
             from mpl_toolkits.mplot3d import Axes3D
             from matplotlib.animation import FuncAnimation
             import numpy as np
-            import trimesh
+            import time
         except ImportError:
-            raise ImportError("matplotlib, numpy, and trimesh are required. Install with: pip install matplotlib numpy trimesh")
+            raise ImportError("matplotlib and numpy are required. Install with: pip install matplotlib numpy")
         
         json_path = Path(json_file_path)
         car_path = Path(car_stl_path)
@@ -876,139 +2208,65 @@ class OpenF1Client:
         if len(time_data) != len(positions):
             time_data = np.linspace(0, len(positions) * 0.05, len(positions))
         
+        if resample_rate:
+            resampled = resample_series(
+                time_data, {"x": x_coords, "y": y_coords, "z": z_coords}, rate=resample_rate
+            )
+            time_data = resampled["time"]
+            positions = np.column_stack((resampled["x"], resampled["y"], resampled["z"]))
+        
         print("Loading 3D models...")
-        car_mesh = trimesh.load(str(car_path))
-        car_mesh.apply_scale(car_scale)
-        
-        track_mesh = trimesh.load(str(track_path))
-        track_mesh.apply_scale(track_scale)
-        
-        axis_map = {
-            'x': np.array([1, 0, 0]),
-            'y': np.array([0, 1, 0]),
-            'z': np.array([0, 0, 1]),
-            '-x': np.array([-1, 0, 0]),
-            '-y': np.array([0, -1, 0]),
-            '-z': np.array([0, 0, -1])
-        }
-        model_forward = axis_map.get(forward_axis.lower(), np.array([0, 1, 0]))
-        
-        def calculate_rotation(current_pos, next_pos):
-            """
-            Calculate rotation matrix to align car with direction vector.
-            
-            :param current_pos: Current position (x, y, z)
-            :param next_pos: Next position (x, y, z)
-            :returns: Rotation matrix (4x4)
-            """
-            direction = next_pos - current_pos
-            direction_norm = np.linalg.norm(direction)
-            
-            if direction_norm < 1e-6:
-                return np.eye(4)
-            
-            direction = direction / direction_norm
-            
-            up = np.array([0, 0, 1])
-            right = np.cross(direction, up)
-            right_norm = np.linalg.norm(right)
-            
-            if right_norm < 1e-6:
-                up = np.array([0, 1, 0])
-                right = np.cross(direction, up)
-                right_norm = np.linalg.norm(right)
-            
-            if right_norm > 1e-6:
-                right = right / right_norm
-                up = np.cross(right, direction)
-            else:
-                up = np.array([0, 0, 1])
-            
-            rotation_matrix = np.eye(4)
-            rotation_matrix[:3, 0] = right
-            rotation_matrix[:3, 1] = -direction
-            rotation_matrix[:3, 2] = up
-            
-            model_forward_world = rotation_matrix[:3, :3] @ model_forward
-            if np.dot(model_forward_world, direction) < 0:
-                rotation_matrix[:3, 1] = direction
-                rotation_matrix[:3, 0] = -right
-            
-            return rotation_matrix
+        mesh_cache_dir = self.cache_dir / self.MESH_CACHE_SUBDIR
+        car_lods = load_mesh_lods(car_path, scale=car_scale, budgets=(car_max_faces,) + tuple(
+            budget for budget in DEFAULT_LOD_BUDGETS if budget < car_max_faces
+        ), cache_dir=mesh_cache_dir)
+        car_buffer = TransformBuffer(*car_lods.level(car_max_faces))
+        
+        track_lods = load_mesh_lods(track_path, scale=track_scale, budgets=TRACK_LOD_BUDGETS,
+                                    cache_dir=mesh_cache_dir)
+        if self.cache_max_bytes is not None or self.cache_max_entries is not None:
+            self._index_unindexed_files()
+        
+        # One vectorized pass; frames only slerp between neighbouring samples
+        orientations = heading_quaternions(positions, forward_axis=forward_axis)
         
         print("Setting up visualization...")
         fig = plt.figure(figsize=(14, 10))
         ax = fig.add_subplot(111, projection='3d')
         
-        track_vertices = track_mesh.vertices
-        track_faces = track_mesh.faces
-        
-        if len(track_faces) > 10000:
-            print("Simplifying track model for better performance...")
-            track_simplified = track_mesh.simplify_quadric_decimation(10000)
-            track_vertices = track_simplified.vertices
-            track_faces = track_simplified.faces
+        track_vertices, track_faces = track_lods.level(10000)
         
         ax.plot_trisurf(
             track_vertices[:, 0], track_vertices[:, 1], track_vertices[:, 2],
             triangles=track_faces, color='gray', alpha=0.5, shade=True, label='Track'
         )
         
-        num_points = len(positions)
-        car_poly = [None]
-        current_idx = [0]
-        start_time = [None]
+        timeline = PlaybackTimeline(time_data, speed_multiplier=speed_multiplier)
+        timeline.connect_keys(fig)
+        
+        # The car artist is created once; frames only rewrite its vertices
+        car_buffer.transform(quaternions_to_matrices(orientations[0]), positions[0])
+        car_world = car_buffer.world
+        car_poly = ax.plot_trisurf(
+            car_world[:, 0], car_world[:, 1], car_world[:, 2],
+            triangles=car_buffer.faces, color='red', alpha=0.9, shade=True
+        )
+        frame_times = []
         
         def update_car(frame):
             """
             Update car position and rotation for animation at real-time speed.
             """
-            if start_time[0] is None:
-                import time
-                start_time[0] = time.time()
-            
-            import time
-            elapsed = (time.time() - start_time[0]) * speed_multiplier
-            
-            idx = current_idx[0]
-            
-            while idx < num_points - 1 and time_data[idx] <= elapsed:
-                idx += 1
-            
-            if idx >= num_points - 1:
-                idx = num_points - 1
-                current_idx[0] = 0
-                start_time[0] = time.time()
-            else:
-                current_idx[0] = idx
-            
-            current_pos = positions[idx]
-            next_idx = min(idx + 1, num_points - 1)
-            next_pos = positions[next_idx]
-            
-            rotation = calculate_rotation(current_pos, next_pos)
-            
-            transformed_car = car_mesh.copy()
-            transformed_car.apply_transform(rotation)
-            transformed_car.apply_translation(current_pos)
+            frame_start = time.perf_counter()
+            timeline.update()
+            idx, next_idx, weight = timeline.bracket()
+            current_pos = timeline.interpolate(positions)
             
-            if car_poly[0] is not None:
-                car_poly[0].remove()
-            
-            car_vertices = transformed_car.vertices
-            car_faces = transformed_car.faces
-            
-            if len(car_faces) > 5000:
-                car_simplified = transformed_car.simplify_quadric_decimation(5000)
-                car_vertices = car_simplified.vertices
-                car_faces = car_simplified.faces
-            
-            car_poly[0] = ax.plot_trisurf(
-                car_vertices[:, 0], car_vertices[:, 1], car_vertices[:, 2],
-                triangles=car_faces, color='red', alpha=0.9, shade=True
-            )
+            rotation = quaternions_to_matrices(slerp(orientations[idx], orientations[next_idx], weight))
+            car_poly.set_verts(car_buffer.transform(rotation, current_pos))
             
-            return car_poly[0]
+            frame_times.append(time.perf_counter() - frame_start)
+            return car_poly
         
         ax.set_xlabel('X Position (m)', fontsize=11)
         ax.set_ylabel('Y Position (m)', fontsize=11)
@@ -1032,10 +2290,216 @@ class OpenF1Client:
         ax.set_ylim(y_range)
         ax.set_zlim(z_range)
         
+        self._scene = AnimationScene(fig, update_car, timeline)
+        if self._capture_scene:
+            return
+        
         print("Starting animation...")
         anim = FuncAnimation(fig, update_car, interval=33, blit=False, repeat=True, cache_frame_data=False)
         
         plt.show()
+        
+        if frame_times:
+            frame_ms = np.array(frame_times) * 1000
+            print(f"Car update time: mean {frame_ms.mean():.2f} ms, p95 {np.percentile(frame_ms, 95):.2f} ms "
+                  f"over {len(frame_ms)} frames ({len(car_buffer.faces)} faces)")
+    
+    async def get_session_frame(
+        self,
+        session_key: int,
+        driver_numbers: Optional[List[int]] = None,
+        max_concurrency: int = 6,
+        use_cache: bool = True
+    ) -> TelemetryFrame:
+        """
+        Fetch time and location for every driver in a session as one frame.
+        
+        :param session_key: Session key to fetch
+        :param driver_numbers: Drivers to fetch (None = every driver in the session)
+        :param max_concurrency: Maximum number of concurrent HTTP requests
+        :param use_cache: If True, load from cache if available; if False, force API call
+        :returns: TelemetryFrame with every driver's samples
+        """
+        if driver_numbers is None:
+            drivers = await self.get_drivers(session_key=session_key, use_cache=use_cache)
+            driver_numbers = sorted({d["driver_number"] for d in drivers if d.get("driver_number") is not None})
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_driver(driver_number):
+            async with semaphore:
+                return await self.get_time_and_location(driver_number, session_key=session_key, use_cache=use_cache)
+        
+        with self._cache_batch():
+            frames = await asyncio.gather(*(fetch_driver(n) for n in driver_numbers))
+        return concat_frames(list(frames))
+    
+    def animate_session_replay(
+        self,
+        telemetry: Union[TelemetryFrame, Dict[int, Any]],
+        rate: float = 10.0,
+        speed_multiplier: float = 1.0,
+        trail_seconds: float = 10.0,
+        projection: str = "3d",
+        arrow_length: float = 150.0,
+        show_track: bool = True,
+        show_plot: bool = True,
+        fade_trails: bool = False
+    ) -> None:
+        """
+        Replay every car in a session at once.
+        
+        All drivers are resampled onto one time grid and drawn with a single
+        scatter, heading-line and trail collection that are updated in place,
+        so a frame costs about the same whether it shows 1 car or 20.
+        
+        :param telemetry: Multi-driver TelemetryFrame (e.g. from get_session_frame), or a mapping of
+                          driver number to a TelemetryFrame, location records or a get_session_telemetry entry
+        :param rate: Resampling rate in Hz (frames between grid points are interpolated)
+        :param speed_multiplier: Playback speed (1.0 = real-time, 2.0 = 2x speed)
+        :param trail_seconds: Trail length in seconds (0 = no trails)
+        :param projection: '3d' or '2d' (top-down, faster to draw)
+        :param arrow_length: Length of the heading line drawn from each car
+        :param show_track: If True, draw the path of the driver with the most samples as the track
+        :param show_plot: Whether to display the plot immediately
+        :param fade_trails: If True, trails fade out towards their oldest sample
+        """
+        try:
+            import matplotlib.pyplot as plt
+            from mpl_toolkits.mplot3d import Axes3D
+            from matplotlib.animation import FuncAnimation
+            from matplotlib.lines import Line2D
+            import numpy as np
+            import time
+        except ImportError:
+            raise ImportError("matplotlib and numpy are required. Install with: pip install matplotlib numpy")
+        
+        grid = session_grid(telemetry, rate=rate)
+        drivers = grid["drivers"]
+        if not len(drivers) or not len(grid["time"]):
+            print("No location data to replay")
+            return
+        
+        positions = grid["positions"]
+        headings = grid["headings"]
+        is_3d = projection == "3d"
+        
+        fig = plt.figure(figsize=(12, 10))
+        ax = fig.add_subplot(111, projection='3d') if is_3d else fig.add_subplot(111)
+        
+        axes = 3 if is_3d else 2
+        if show_track:
+            samples = np.sum(~np.isnan(positions[:, :, 0]), axis=1)
+            reference = positions[np.argmax(samples)]
+            ax.plot(*reference[:, :axes].T, '-', color='gray', linewidth=1, alpha=0.4)
+        low = np.nanmin(positions, axis=(0, 1))
+        high = np.nanmax(positions, axis=(0, 1))
+        margin = (high - low) * 0.05 + 1.0
+        ax.set_xlim(low[0] - margin[0], high[0] + margin[0])
+        ax.set_ylim(low[1] - margin[1], high[1] + margin[1])
+        if is_3d:
+            ax.set_zlim(low[2] - margin[2], high[2] + margin[2])
+        else:
+            ax.set_aspect('equal')
+        
+        cars = CarArtists(ax, len(drivers), arrow_length=arrow_length, trails=trail_seconds > 0,
+                           fade=fade_trails)
+        # The grid already holds every car's history, so a trail is a fixed-size view into it
+        trail_frames = max(2, int(round(trail_seconds * rate)))
+        
+        timeline = PlaybackTimeline(grid["time"], speed_multiplier=speed_multiplier)
+        timeline.connect_keys(fig, seek_step=30.0)
+        frame_times = []
+        
+        def update_cars(frame):
+            """
+            Move all cars to the current playback time.
+            """
+            start = time.perf_counter()
+            timeline.update()
+            index = timeline.index()
+            artists = cars.update(
+                timeline.interpolate(positions, axis=1),
+                timeline.interpolate(headings, axis=1),
+                positions[:, max(0, index - trail_frames + 1):index + 1]
+            )
+            frame_times.append(time.perf_counter() - start)
+            return artists
+        
+        handles = [
+            Line2D([], [], marker='o', linestyle='', color=color, label=f"#{driver}")
+            for driver, color in zip(drivers.tolist(), cars.colors)
+        ]
+        ax.legend(handles=handles, loc='upper right', fontsize=8, ncol=2)
+        ax.set_xlabel('X Position (m)', fontsize=11)
+        ax.set_ylabel('Y Position (m)', fontsize=11)
+        if is_3d:
+            ax.set_zlabel('Z Position (m)', fontsize=11)
+        
+        title = f"Session Replay - {len(drivers)} cars"
+        if speed_multiplier != 1.0:
+            title += f" ({speed_multiplier}x speed)"
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        
+        self._scene = AnimationScene(fig, update_cars, timeline)
+        if self._capture_scene:
+            return
+        anim = FuncAnimation(fig, update_cars, interval=33, blit=False, repeat=True, cache_frame_data=False)
+        
+        if show_plot:
+            plt.show()
+            if frame_times:
+                frame_ms = np.array(frame_times) * 1000
+                print(f"Replay update time: mean {frame_ms.mean():.2f} ms, p95 {np.percentile(frame_ms, 95):.2f} ms "
+                      f"over {len(frame_ms)} frames ({len(drivers)} cars)")
+    
+    def render_animation(
+        self,
+        method: str,
+        output: str,
+        fps: float = 30.0,
+        workers: Optional[int] = None,
+        dpi: Optional[float] = None,
+        frame_range: Optional[Tuple[int, int]] = None,
+        **kwargs
+    ) -> Dict[str, float]:
+        """
+        Render one of the animation methods offline to a video or PNG frames.
+        
+        The timeline is split into frame ranges rendered in parallel worker
+        processes with the Agg backend, so no window is opened and the clip
+        does not have to be recorded in real time. Call from under an
+        ``if __name__ == "__main__":`` guard, as workers are spawned.
+        
+        Example:
+            client.render_animation("animate_session_replay", "replay.mp4", telemetry=frame, speed_multiplier=4.0)
+        
+        :param method: Name of an animation method (see RENDERABLE_ANIMATIONS)
+        :param output: Video file (.mp4, .mkv, .mov, .webm; needs ffmpeg) or a directory for PNG frames
+        :param fps: Output frame rate; frames are spaced by speed_multiplier / fps seconds of playback
+        :param workers: Number of worker processes (None = one per CPU)
+        :param dpi: Figure resolution (None = the figure's own)
+        :param frame_range: Render only frames [start, stop)
+        :param kwargs: Keyword arguments for the animation method (must be picklable)
+        :returns: Dictionary with 'frames', 'seconds', 'fps', 'workers' and 'fps_per_worker'
+        """
+        if method not in RENDERABLE_ANIMATIONS:
+            raise ValueError(f"method must be one of {RENDERABLE_ANIMATIONS}")
+        if method == "plot_3d_track":
+            kwargs["animate"] = True
+        stats = render_frames(
+            build_animation_scene,
+            {"method": method, "kwargs": kwargs, "cache_dir": str(self.cache_dir)},
+            output,
+            fps=fps,
+            workers=workers,
+            dpi=dpi,
+            frame_range=frame_range
+        )
+        print(f"Rendered {stats['frames']} frames to {output} in {stats['seconds']:.1f} s "
+              f"({stats['fps']:.1f} fps, {stats['fps_per_worker']:.1f} fps per worker x {stats['workers']})")
+        return stats
     
     async def get_time_and_location_json(
         self,
@@ -1060,6 +2524,35 @@ class OpenF1Client:
             session_key=session_key,
             meeting_key=meeting_key,
             date=date,
-            use_cache=use_cache
+            use_cache=use_cache,
+            as_records=True
         )
         return json.dumps(data, indent=2)
+
+
+RENDERABLE_ANIMATIONS = (
+    "plot_3d_track",
+    "animate_arrow_along_track",
+    "animate_arrow_from_json",
+    "animate_car_on_track_from_json",
+    "animate_session_replay",
+)
+
+
+def build_animation_scene(method: str, kwargs: Dict[str, Any], cache_dir: str = ".cache") -> AnimationScene:
+    """
+    Build an animation method's figure and frame update without showing it.
+    
+    Module-level so render workers can rebuild the scene in their own process.
+    
+    :param method: Name of an animation method (see RENDERABLE_ANIMATIONS)
+    :param kwargs: Keyword arguments for the method
+    :param cache_dir: Client cache directory
+    :returns: AnimationScene
+    """
+    client = OpenF1Client(None, cache_dir=cache_dir)
+    client._capture_scene = True
+    getattr(client, method)(**kwargs)
+    if client._scene is None:
+        raise ValueError(f"{method} did not build an animation with these arguments")
+    return client._scene
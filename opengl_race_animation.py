@@ -1,36 +1,569 @@
 """
-OpenGL-based 3D race animation using PyOpenGL.
+OpenGL-based 3D race animation using ModernGL.
 
 Alternative to Blender - runs as a standalone Python application.
-Requires: pip install PyOpenGL PyOpenGL_accelerate moderngl glfw
+The track mesh is uploaded once as a static vertex buffer, and every car
+is an instance of one car mesh: each frame only writes a small buffer of
+per-car model matrices (computed from telemetry with vectorized slerp),
+so a full grid costs one draw call. Rendering works in a glfw window or
+in a standalone offscreen context, which runs headless on a software
+(llvmpipe) GL stack through EGL.
+
+Requires: pip install moderngl glfw pillow
 """
 import json
+import time
 import numpy as np
 from pathlib import Path
 
+from mesh_lod import load_mesh_lods
+from orientation import heading_quaternions, quaternions_to_matrices, slerp
+from playback import PlaybackTimeline
+from replay import session_grid
+from telemetry_resample import resample_series
+
 try:
     import moderngl
-    import glfw
-    from PIL import Image
     MODERNGL_AVAILABLE = True
 except ImportError:
     MODERNGL_AVAILABLE = False
     print("ModernGL not available. Install with: pip install moderngl glfw pillow")
 
+try:
+    import glfw
+    GLFW_AVAILABLE = True
+except ImportError:
+    GLFW_AVAILABLE = False
+
+VERTEX_SHADER = """
+#version 330
+uniform mat4 view_projection;
+in vec3 in_position;
+in vec3 in_normal;
+in mat4 in_model;
+in vec3 in_color;
+out vec3 v_normal;
+out vec3 v_color;
+void main() {
+    v_normal = mat3(in_model) * in_normal;
+    v_color = in_color;
+    gl_Position = view_projection * in_model * vec4(in_position, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+uniform vec3 light_direction;
+in vec3 v_normal;
+in vec3 v_color;
+out vec4 f_color;
+void main() {
+    float diffuse = abs(dot(normalize(v_normal), light_direction));
+    f_color = vec4(v_color * (0.35 + 0.65 * diffuse), 1.0);
+}
+"""
+
+# Per-instance layout: column-major model matrix, then RGB colour
+INSTANCE_FORMAT = "16f 3f/i"
+INSTANCE_FLOATS = 19
+
+TRACK_COLOR = (0.45, 0.45, 0.48)
+BACKGROUND_COLOR = (0.08, 0.09, 0.12)
+
+
+def load_stl_simple(filepath, max_faces=None):
+    """
+    Load an STL/OBJ file as vertex and face arrays via the binary mesh cache.
+    
+    :param filepath: Path to STL/OBJ file
+    :param max_faces: Face budget (None = full detail)
+    :returns: Tuple of (float32 vertices, int32 faces), memory-mapped when cached
+    """
+    return load_mesh_lods(Path(filepath)).level(max_faces)
+
+
+def vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Area-weighted vertex normals.
+    
+    :param vertices: (V, 3) vertices
+    :param faces: (F, 3) vertex indices
+    :returns: (V, 3) float32 unit normals (zero for unused vertices)
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = vertices[faces]
+    face_normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    normals = np.zeros_like(vertices)
+    for corner in range(3):
+        np.add.at(normals, faces[:, corner], face_normals)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0).astype(np.float32)
+
+
+def perspective(fov_y: float, aspect: float, near: float, far: float) -> np.ndarray:
+    """
+    OpenGL perspective projection matrix.
+    
+    :param fov_y: Vertical field of view in degrees
+    :param aspect: Width / height
+    :param near: Near clip distance
+    :param far: Far clip distance
+    :returns: (4, 4) matrix
+    """
+    f = 1.0 / np.tan(np.radians(fov_y) / 2)
+    return np.array([
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+        [0, 0, -1, 0],
+    ])
+
+
+def look_at(eye: np.ndarray, target: np.ndarray, up=(0.0, 0.0, 1.0)) -> np.ndarray:
+    """
+    View matrix for a camera at ``eye`` looking at ``target``.
+    
+    :param eye: Camera position
+    :param target: Point the camera looks at
+    :param up: World up vector
+    :returns: (4, 4) matrix
+    """
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(target, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward)
+    right = np.cross(forward, up)
+    right /= np.linalg.norm(right)
+    true_up = np.cross(right, forward)
+    view = np.eye(4)
+    view[0, :3], view[1, :3], view[2, :3] = right, true_up, -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+    return view
+
+
+def instance_matrices(positions: np.ndarray, rotations: np.ndarray, scale: float = 1.0, out=None) -> np.ndarray:
+    """
+    Model matrices for a set of car instances.
+    
+    Rows with a missing (NaN) position get an all-zero matrix, which
+    collapses the instance so it is not drawn.
+    
+    :param positions: (N, 3) world positions
+    :param rotations: (N, 3, 3) rotation matrices (model -> world)
+    :param scale: Uniform model scale
+    :param out: Optional (N, 4, 4) array to write into
+    :returns: (N, 4, 4) float32 matrices
+    """
+    positions = np.asarray(positions)
+    matrices = np.zeros((len(positions), 4, 4), dtype=np.float32) if out is None else out
+    matrices[:, :3, :3] = rotations * scale
+    matrices[:, :3, 3] = positions
+    matrices[:, 3] = (0, 0, 0, 1)
+    matrices[np.isnan(positions).any(axis=1)] = 0
+    return matrices
+
+
+def create_offscreen_context(backend=None):
+    """
+    Create a standalone OpenGL 3.3 context without a window.
+    
+    Tries EGL first, which needs no display server and works on Mesa's
+    llvmpipe software renderer, then the platform default.
+    
+    :param backend: Force a glcontext backend (e.g. 'egl')
+    :returns: moderngl.Context
+    """
+    if not MODERNGL_AVAILABLE:
+        raise RuntimeError("ModernGL not available. Install with: pip install moderngl glfw pillow")
+    if backend is not None:
+        return moderngl.create_standalone_context(require=330, backend=backend)
+    try:
+        return moderngl.create_standalone_context(require=330, backend="egl")
+    except Exception:
+        return moderngl.create_standalone_context(require=330)
+
+
+class CarPaths:
+    """
+    Car positions and precomputed orientations on a shared time grid.
+    """
+    
+    def __init__(self, times: np.ndarray, positions: np.ndarray, forward_axis: str = 'y', window: int = 5):
+        """
+        Precompute one heading quaternion per car and sample.
+        
+        :param times: (T,) sample times in seconds, ascending
+        :param positions: (cars, T, 3) positions, NaN where a car has no data
+        :param forward_axis: Car model's forward axis ('x', 'y', 'z', '-x', '-y', '-z')
+        :param window: Heading smoothing window in samples
+        """
+        self.times = np.asarray(times, dtype=np.float64)
+        self.positions = np.asarray(positions, dtype=np.float64)
+        self.orientations = np.zeros(self.positions.shape[:2] + (4,))
+        self.orientations[..., 0] = 1.0
+        for car, path in enumerate(self.positions):
+            valid = ~np.isnan(path).any(axis=1)
+            if valid.sum() > 1:
+                self.orientations[car, valid] = heading_quaternions(path[valid], window=window,
+                                                                    forward_axis=forward_axis)
+    
+    @property
+    def cars(self) -> int:
+        return len(self.positions)
+    
+    def pose(self, timeline: PlaybackTimeline):
+        """
+        Interpolated positions and rotations of every car at the timeline's position.
+        
+        :param timeline: Playback timeline over ``times``
+        :returns: Tuple of (cars, 3) positions and (cars, 3, 3) rotation matrices
+        """
+        lower, upper, weight = timeline.bracket()
+        positions = timeline.interpolate(self.positions, axis=1)
+        rotations = quaternions_to_matrices(slerp(self.orientations[:, lower], self.orientations[:, upper], weight))
+        return positions, rotations
+
+
+class RaceRenderer:
+    """
+    Instanced ModernGL renderer for a track and a grid of cars.
+    """
+    
+    def __init__(
+        self,
+        ctx,
+        track_mesh,
+        car_mesh,
+        max_cars: int = 20,
+        size=(1280, 720),
+        offscreen: bool = True,
+        car_colors=None
+    ):
+        """
+        Upload both meshes once and allocate the per-frame instance buffer.
+        
+        :param ctx: moderngl.Context (from create_offscreen_context, or a window's context)
+        :param track_mesh: Tuple of (vertices, faces) for the track, in world coordinates
+        :param car_mesh: Tuple of (vertices, faces) for the car, in model coordinates
+        :param max_cars: Largest number of car instances drawn
+        :param size: Framebuffer size (width, height) in pixels
+        :param offscreen: If True, render into an offscreen framebuffer; otherwise to ctx.screen
+        :param car_colors: (max_cars, 3) RGB colours in [0, 1] (defaults to the tab20 palette)
+        """
+        self.ctx = ctx
+        self.size = tuple(size)
+        self.max_cars = max_cars
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        light = np.array([0.3, -0.4, 1.0])
+        self.program['light_direction'].value = tuple(light / np.linalg.norm(light))
+        
+        self.track_bounds = np.array([np.min(track_mesh[0], axis=0), np.max(track_mesh[0], axis=0)])
+        self.track_vao, self._track_buffers = self._mesh_array(*track_mesh, self._static_instance(TRACK_COLOR))
+        
+        # Staging array reused every frame: model matrices (column-major) and colours
+        self.instance_data = np.zeros((max_cars, INSTANCE_FLOATS), dtype=np.float32)
+        self.instance_data[:, 16:] = self._default_colors(max_cars) if car_colors is None else car_colors
+        self._matrices = np.zeros((max_cars, 4, 4), dtype=np.float32)
+        self.instances = ctx.buffer(self.instance_data.tobytes(), dynamic=True)
+        self.car_vao, self._car_buffers = self._mesh_array(*car_mesh, self.instances)
+        self.car_count = 0
+        
+        if offscreen:
+            self.framebuffer = ctx.framebuffer(
+                color_attachments=[ctx.renderbuffer(self.size)],
+                depth_attachment=ctx.depth_renderbuffer(self.size)
+            )
+        else:
+            self.framebuffer = ctx.screen
+        self.fit_camera()
+    
+    @staticmethod
+    def _default_colors(count: int) -> np.ndarray:
+        """
+        One RGB colour per car from the tab20 palette (red without matplotlib).
+        """
+        try:
+            import matplotlib.pyplot as plt
+            return plt.get_cmap("tab20")(np.arange(count) % 20)[:, :3]
+        except ImportError:
+            return np.tile((0.9, 0.1, 0.1), (count, 1))
+    
+    def _static_instance(self, color):
+        """
+        Instance buffer holding one identity matrix, for the track.
+        """
+        data = np.zeros(INSTANCE_FLOATS, dtype=np.float32)
+        data[:16] = np.eye(4, dtype=np.float32).ravel()
+        data[16:] = color
+        return self.ctx.buffer(data.tobytes())
+    
+    def _mesh_array(self, vertices, faces, instances):
+        """
+        Upload a mesh as interleaved position/normal and index buffers.
+        
+        :returns: Tuple of (vertex array, list of owned buffers)
+        """
+        vertices = np.asarray(vertices, dtype=np.float32)
+        faces = np.ascontiguousarray(faces, dtype=np.int32)
+        interleaved = np.hstack((vertices, vertex_normals(vertices, faces)))
+        vbo = self.ctx.buffer(interleaved.tobytes())
+        ibo = self.ctx.buffer(faces.tobytes())
+        vao = self.ctx.vertex_array(
+            self.program,
+            [(vbo, "3f 3f", "in_position", "in_normal"),
+             (instances, INSTANCE_FORMAT, "in_model", "in_color")],
+            index_buffer=ibo,
+            index_element_size=4
+        )
+        return vao, [vbo, ibo, instances]
+    
+    def fit_camera(self, points=None, elevation: float = 55.0, azimuth: float = -60.0, fov_y: float = 40.0) -> None:
+        """
+        Aim the camera so that a set of points (default: the track) fills the view.
+        
+        :param points: (N, 3) points to frame (NaN rows ignored)
+        :param elevation: Camera elevation above the ground plane in degrees
+        :param azimuth: Camera direction around the vertical axis in degrees
+        :param fov_y: Vertical field of view in degrees
+        """
+        if points is None:
+            low, high = self.track_bounds
+        else:
+            points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+            low, high = np.nanmin(points, axis=0), np.nanmax(points, axis=0)
+        center = (low + high) / 2
+        radius = max(np.linalg.norm(high - low) / 2, 1e-6)
+        distance = radius / np.sin(np.radians(fov_y) / 2) * 1.05
+        el, az = np.radians(elevation), np.radians(azimuth)
+        eye = center + distance * np.array([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)])
+        projection = perspective(fov_y, self.size[0] / self.size[1], distance / 100, distance + 2 * radius)
+        self.view_projection = projection @ look_at(eye, center)
+        self.program['view_projection'].write(self.view_projection.T.astype(np.float32).tobytes())
+    
+    def update_cars(self, positions: np.ndarray, rotations: np.ndarray, scale: float = 1.0) -> None:
+        """
+        Write this frame's instance matrices.
+        
+        :param positions: (cars, 3) world positions (NaN = hidden)
+        :param rotations: (cars, 3, 3) rotation matrices (model -> world)
+        :param scale: Car model scale
+        """
+        count = min(len(positions), self.max_cars)
+        matrices = instance_matrices(positions[:count], rotations[:count], scale, out=self._matrices[:count])
+        # GL reads a mat4 attribute as four columns
+        self.instance_data[:count, :16] = matrices.transpose(0, 2, 1).reshape(count, 16)
+        self.instances.write(self.instance_data[:count].tobytes())
+        self.car_count = count
+    
+    def render(self) -> None:
+        """
+        Draw the track and all car instances into the framebuffer.
+        """
+        self.framebuffer.use()
+        self.ctx.enable(moderngl.DEPTH_TEST)
+        self.ctx.clear(*BACKGROUND_COLOR, depth=1.0)
+        self.track_vao.render(instances=1)
+        if self.car_count:
+            self.car_vao.render(instances=self.car_count)
+    
+    def read_pixels(self) -> np.ndarray:
+        """
+        Read the rendered frame back.
+        
+        :returns: (height, width, 3) uint8 RGB image, top row first
+        """
+        data = self.framebuffer.read(components=3)
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.size[1], self.size[0], 3)[::-1]
+    
+    def release(self) -> None:
+        """Free GPU resources."""
+        for vao in (self.track_vao, self.car_vao):
+            vao.release()
+        for buffer in self._track_buffers + self._car_buffers[:2] + [self.instances]:
+            buffer.release()
+        self.program.release()
+        if self.framebuffer is not self.ctx.screen:
+            self.framebuffer.release()
+
+
+def render_offscreen(
+    renderer: RaceRenderer,
+    paths: CarPaths,
+    fps: float = 60.0,
+    speed_multiplier: float = 1.0,
+    car_scale: float = 1.0,
+    max_frames=None,
+    output_dir=None,
+    read_back: bool = True
+):
+    """
+    Render the race frame by frame without a window.
+    
+    Frames are spaced by speed_multiplier / fps seconds of playback.
+    
+    :param renderer: RaceRenderer with an offscreen framebuffer
+    :param paths: Car paths to play back
+    :param fps: Output frame rate
+    :param speed_multiplier: Playback speed
+    :param car_scale: Car model scale
+    :param max_frames: Stop after this many frames (None = whole timeline)
+    :param output_dir: If set, save each frame as a PNG here (needs pillow)
+    :param read_back: Read each frame back to CPU memory (always on when saving)
+    :returns: (frames,) array of frame times in seconds
+    """
+    timeline = PlaybackTimeline(paths.times, speed_multiplier=speed_multiplier, loop=False)
+    step = speed_multiplier / fps
+    count = int(np.floor(timeline.duration / step)) + 1
+    if max_frames is not None:
+        count = min(count, max_frames)
+    if output_dir is not None:
+        from PIL import Image
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+    frame_times = np.empty(count)
+    for frame in range(count):
+        start = time.perf_counter()
+        timeline.seek(timeline.start + frame * step)
+        renderer.update_cars(*paths.pose(timeline), scale=car_scale)
+        renderer.render()
+        if read_back or output_dir is not None:
+            pixels = renderer.read_pixels()
+        else:
+            renderer.ctx.finish()
+        frame_times[frame] = time.perf_counter() - start
+        if output_dir is not None:
+            Image.fromarray(pixels).save(output_dir / f"frame_{frame:06d}.png")
+    return frame_times
+
 
-def load_stl_simple(filepath):
+def run_window(renderer_factory, paths: CarPaths, size=(1280, 720), speed_multiplier: float = 1.0,
+               car_scale: float = 1.0, title: str = "Race Animation"):
     """
-    Simple STL loader that returns vertices and faces.
+    Show the race in a glfw window until it is closed (Esc closes it).
     
-    :param filepath: Path to STL file
-    :returns: Tuple of (vertices, faces)
+    :param renderer_factory: Called with the window's moderngl.Context, returns a RaceRenderer drawing to ctx.screen
+    :param paths: Car paths to play back
+    :param size: Window size in pixels
+    :param speed_multiplier: Playback speed
+    :param car_scale: Car model scale
+    :param title: Window title
+    :returns: Array of frame times in seconds
     """
+    if not GLFW_AVAILABLE:
+        raise RuntimeError("glfw not available. Install with: pip install glfw (or use offscreen=True)")
+    if not glfw.init():
+        raise RuntimeError("Could not initialise glfw")
     try:
-        import trimesh
-        mesh = trimesh.load(str(filepath))
-        return mesh.vertices, mesh.faces
-    except ImportError:
-        raise ImportError("trimesh required. Install with: pip install trimesh")
+        glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
+        glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
+        glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, True)
+        window = glfw.create_window(size[0], size[1], title, None, None)
+        if not window:
+            raise RuntimeError("Could not create a glfw window")
+        glfw.make_context_current(window)
+        glfw.swap_interval(1)
+        renderer = renderer_factory(moderngl.create_context())
+        timeline = PlaybackTimeline(paths.times, speed_multiplier=speed_multiplier)
+        frame_times = []
+        
+        while not glfw.window_should_close(window):
+            start = time.perf_counter()
+            timeline.update()
+            renderer.update_cars(*paths.pose(timeline), scale=car_scale)
+            renderer.render()
+            glfw.swap_buffers(window)
+            glfw.poll_events()
+            if glfw.get_key(window, glfw.KEY_ESCAPE) == glfw.PRESS:
+                glfw.set_window_should_close(window, True)
+            frame_times.append(time.perf_counter() - start)
+        renderer.release()
+        return np.array(frame_times)
+    finally:
+        glfw.terminate()
+
+
+def animate_grid_with_opengl(
+    telemetry,
+    car_stl_path: str,
+    track_stl_path: str,
+    car_scale: float = 1.0,
+    track_scale: float = 1.0,
+    speed_multiplier: float = 1.0,
+    forward_axis: str = 'y',
+    rate: float = 10.0,
+    size=(1280, 720),
+    offscreen: bool = False,
+    output_dir=None,
+    max_frames=None,
+    fps: float = 60.0
+):
+    """
+    Animate every car of a session on the track, one instanced draw call per frame.
+    
+    :param telemetry: Session telemetry (see replay.session_frame), e.g. from OpenF1Client.get_session_frame
+    :param car_stl_path: Path to car STL file
+    :param track_stl_path: Path to track STL file
+    :param car_scale: Car scale factor
+    :param track_scale: Track scale factor
+    :param speed_multiplier: Speed multiplier
+    :param forward_axis: Car model's forward direction axis ('x', 'y', 'z', '-x', '-y', '-z')
+    :param rate: Resampling rate in Hz for the shared time grid
+    :param size: Frame size in pixels
+    :param offscreen: Render headless instead of opening a window
+    :param output_dir: With offscreen, save frames as PNGs here
+    :param max_frames: With offscreen, stop after this many frames
+    :param fps: With offscreen, output frame rate
+    :returns: Array of frame times in seconds
+    """
+    grid = session_grid(telemetry, rate=rate)
+    paths = CarPaths(grid["time"], grid["positions"], forward_axis=forward_axis)
+    return _animate(paths, car_stl_path, track_stl_path, car_scale, track_scale, speed_multiplier,
+                    size, offscreen, output_dir, max_frames, fps, f"Race Animation - {paths.cars} cars")
+
+
+def _animate(paths, car_stl_path, track_stl_path, car_scale, track_scale, speed_multiplier,
+             size, offscreen, output_dir, max_frames, fps, title):
+    """
+    Load the meshes and run either the window loop or the offscreen renderer.
+    """
+    if not MODERNGL_AVAILABLE:
+        raise RuntimeError("ModernGL not available. Install with: pip install moderngl glfw pillow")
+    
+    car_path = Path(car_stl_path)
+    track_path = Path(track_stl_path)
+    if not car_path.exists():
+        raise FileNotFoundError(f"Car STL file not found: {car_stl_path}")
+    if not track_path.exists():
+        raise FileNotFoundError(f"Track STL file not found: {track_stl_path}")
+    
+    print("Loading 3D models...")
+    car_mesh = load_stl_simple(car_path)
+    track_vertices, track_faces = load_stl_simple(track_path)
+    track_mesh = (np.asarray(track_vertices) * track_scale, track_faces)
+    
+    def make_renderer(ctx, offscreen_buffer):
+        renderer = RaceRenderer(ctx, track_mesh, car_mesh, max_cars=paths.cars, size=size, offscreen=offscreen_buffer)
+        renderer.fit_camera(np.concatenate((paths.positions.reshape(-1, 3), renderer.track_bounds)))
+        return renderer
+    
+    if not offscreen:
+        frame_times = run_window(lambda ctx: make_renderer(ctx, False), paths, size=size,
+                                 speed_multiplier=speed_multiplier, car_scale=car_scale, title=title)
+    else:
+        ctx = create_offscreen_context()
+        print(f"Rendering offscreen on {ctx.info['GL_RENDERER']}...")
+        renderer = make_renderer(ctx, True)
+        frame_times = render_offscreen(renderer, paths, fps=fps, speed_multiplier=speed_multiplier,
+                                       car_scale=car_scale, max_frames=max_frames, output_dir=output_dir)
+        renderer.release()
+        ctx.release()
+    
+    if len(frame_times):
+        frame_ms = frame_times * 1000
+        print(f"Frame time: mean {frame_ms.mean():.2f} ms, p95 {np.percentile(frame_ms, 95):.2f} ms "
+              f"({1000 / frame_ms.mean():.1f} fps) over {len(frame_ms)} frames, {paths.cars} cars")
+    return frame_times
 
 
 def animate_with_opengl(
@@ -40,7 +573,13 @@ def animate_with_opengl(
     driver_number: int = 10,
     car_scale: float = 1.0,
     track_scale: float = 1.0,
-    speed_multiplier: float = 1.0
+    speed_multiplier: float = 1.0,
+    forward_axis: str = 'y',
+    resample_rate=60.0,
+    size=(1280, 720),
+    offscreen: bool = False,
+    output_dir=None,
+    max_frames=None
 ):
     """
     Animate car on track using OpenGL/ModernGL.
@@ -52,43 +591,40 @@ def animate_with_opengl(
     :param car_scale: Car scale factor
     :param track_scale: Track scale factor
     :param speed_multiplier: Speed multiplier
+    :param forward_axis: Car model's forward direction axis ('x', 'y', 'z', '-x', '-y', '-z')
+    :param resample_rate: Resample the path to this fixed rate in Hz (None = raw samples)
+    :param size: Frame size in pixels
+    :param offscreen: Render headless instead of opening a window
+    :param output_dir: With offscreen, save frames as PNGs here
+    :param max_frames: With offscreen, stop after this many frames
+    :returns: Array of frame times in seconds
     """
     if not MODERNGL_AVAILABLE:
         raise RuntimeError("ModernGL not available. Install with: pip install moderngl glfw pillow")
     
     json_path = Path(json_file_path)
-    car_path = Path(car_stl_path)
-    track_path = Path(track_stl_path)
-    
     if not json_path.exists():
         raise FileNotFoundError(f"JSON file not found: {json_file_path}")
-    if not car_path.exists():
-        raise FileNotFoundError(f"Car STL file not found: {car_stl_path}")
-    if not track_path.exists():
-        raise FileNotFoundError(f"Track STL file not found: {track_stl_path}")
     
     print("Loading data...")
     with open(json_path, 'r') as f:
         data = json.load(f)
     
     tel = data['tel']
-    x_coords = np.array(tel['x'])
-    y_coords = np.array(tel['y'])
-    z_coords = np.array(tel['z'])
-    time_data = np.array(tel.get('time', list(range(len(x_coords)))))
+    x_coords = np.array(tel['x'], dtype=np.float64)
+    y_coords = np.array(tel['y'], dtype=np.float64)
+    z_coords = np.array(tel['z'], dtype=np.float64)
+    time_data = np.array(tel.get('time', list(range(len(x_coords)))), dtype=np.float64)
     
     positions = np.column_stack((x_coords, y_coords, z_coords))
+    if resample_rate:
+        resampled = resample_series(time_data, {"x": x_coords, "y": y_coords, "z": z_coords}, rate=resample_rate)
+        time_data = resampled["time"]
+        positions = np.column_stack((resampled["x"], resampled["y"], resampled["z"]))
     
-    print("Loading 3D models...")
-    car_vertices, car_faces = load_stl_simple(car_path)
-    track_vertices, track_faces = load_stl_simple(track_path)
-    
-    car_vertices = car_vertices * car_scale
-    track_vertices = track_vertices * track_scale
-    
-    print("Note: OpenGL implementation requires additional setup.")
-    print("For now, use Blender script (blender_race_animation.py) for best results.")
-    print("Or use the matplotlib version (animate_car_on_track.py)")
+    paths = CarPaths(time_data, positions[None], forward_axis=forward_axis)
+    return _animate(paths, car_stl_path, track_stl_path, car_scale, track_scale, speed_multiplier,
+                    size, offscreen, output_dir, max_frames, 60.0, f"Race Animation - Driver #{driver_number}")
 
 
 if __name__ == "__main__":
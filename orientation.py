@@ -0,0 +1,240 @@
+"""
+Vectorized car orientation along a trajectory.
+
+Computes one heading quaternion per sample in a single NumPy pass, from
+a smoothed tangent of the path, so renderers only have to slerp between
+precomputed quaternions instead of building rotation matrices from
+cross products every frame. Shared by the matplotlib, Blender and OpenGL
+renderers.
+
+Quaternions are stored as (w, x, y, z).
+"""
+from typing import Sequence, Union
+
+import numpy as np
+
+
+AXIS_VECTORS = {
+    'x': np.array([1.0, 0.0, 0.0]),
+    'y': np.array([0.0, 1.0, 0.0]),
+    'z': np.array([0.0, 0.0, 1.0]),
+    '-x': np.array([-1.0, 0.0, 0.0]),
+    '-y': np.array([0.0, -1.0, 0.0]),
+    '-z': np.array([0.0, 0.0, -1.0]),
+}
+
+
+def axis_vector(axis: Union[str, Sequence[float]]) -> np.ndarray:
+    """
+    Resolve an axis name or vector to a unit vector.
+    
+    :param axis: 'x', 'y', 'z', '-x', '-y', '-z' or a 3-vector
+    :returns: Unit vector (unknown names fall back to +y)
+    """
+    if isinstance(axis, str):
+        return AXIS_VECTORS.get(axis.lower(), AXIS_VECTORS['y'])
+    vector = np.asarray(axis, dtype=np.float64)
+    return vector / np.linalg.norm(vector)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Normalize rows, leaving zero-length rows as zeros.
+    
+    :param vectors: (N, 3) array
+    :returns: (N, 3) array of unit (or zero) vectors
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 1e-9)
+
+
+def heading_vectors(positions: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    Compute a smoothed unit direction of travel for every sample.
+    
+    The tangent is a central difference of the positions averaged over
+    ``window`` samples, so one noisy point cannot flip the heading.
+    Stationary stretches keep the last known heading.
+    
+    :param positions: (N, 3) positions
+    :param window: Smoothing window in samples (1 = no smoothing)
+    :returns: (N, 3) unit vectors
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    count = len(positions)
+    if count < 2:
+        return np.tile(AXIS_VECTORS['y'], (count, 1))
+    
+    tangents = np.gradient(positions, axis=0)
+    if window > 1:
+        half = window // 2
+        padded = np.concatenate([np.repeat(tangents[:1], half, axis=0), tangents,
+                                 np.repeat(tangents[-1:], half, axis=0)])
+        summed = np.cumsum(np.concatenate([np.zeros((1, 3)), padded]), axis=0)
+        tangents = summed[2 * half + 1:] - summed[:count]
+    
+    headings = _normalize(tangents)
+    valid = np.linalg.norm(headings, axis=1) > 0
+    if not valid.any():
+        return np.tile(AXIS_VECTORS['y'], (count, 1))
+    # Carry the last valid heading over stationary samples (and back-fill the start)
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(count), -1))
+    last_valid[last_valid < 0] = np.argmax(valid)
+    return headings[last_valid]
+
+
+def rotation_matrices(
+    headings: np.ndarray,
+    forward_axis: Union[str, Sequence[float]] = 'y',
+    up: Sequence[float] = (0.0, 0.0, 1.0)
+) -> np.ndarray:
+    """
+    Build rotations turning the model's forward axis onto each heading while keeping it upright.
+    
+    :param headings: (N, 3) unit directions of travel
+    :param forward_axis: Model's forward axis ('x', 'y', 'z', '-x', '-y', '-z' or a vector)
+    :param up: World up vector
+    :returns: (N, 3, 3) rotation matrices (model -> world)
+    """
+    headings = np.asarray(headings, dtype=np.float64)
+    model_forward = axis_vector(forward_axis)
+    model_up = AXIS_VECTORS['z'] if abs(model_forward[2]) < 0.9 else AXIS_VECTORS['y']
+    model_up = _normalize((model_up - model_forward * np.dot(model_up, model_forward))[None])[0]
+    model_basis = np.column_stack((model_forward, model_up, np.cross(model_forward, model_up)))
+    
+    world_up = np.broadcast_to(np.asarray(up, dtype=np.float64), headings.shape)
+    right = np.cross(headings, world_up)
+    # Headings parallel to 'up' fall back to the world y axis as reference
+    degenerate = np.linalg.norm(right, axis=1) < 1e-6
+    if degenerate.any():
+        right[degenerate] = np.cross(headings[degenerate], AXIS_VECTORS['y'])
+    right = _normalize(right)
+    true_up = np.cross(right, headings)
+    world_basis = np.stack((headings, true_up, np.cross(headings, true_up)), axis=-1)
+    return world_basis @ model_basis.T
+
+
+def matrices_to_quaternions(matrices: np.ndarray) -> np.ndarray:
+    """
+    Convert rotation matrices to unit quaternions with sign continuity.
+    
+    Consecutive quaternions are kept in the same hemisphere so interpolating
+    between neighbours always takes the short way round.
+    
+    :param matrices: (N, 3, 3) rotation matrices
+    :returns: (N, 4) quaternions as (w, x, y, z)
+    """
+    m = np.asarray(matrices, dtype=np.float64)
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    diagonal = np.stack((trace, m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]), axis=1)
+    case = np.argmax(diagonal, axis=1)
+    q = np.empty((len(m), 4))
+    
+    # Shepperd's method: divide by the largest component for stability
+    rows = case == 0
+    s = np.sqrt(1.0 + trace[rows]) * 2
+    q[rows] = np.column_stack((0.25 * s, (m[rows, 2, 1] - m[rows, 1, 2]) / s,
+                               (m[rows, 0, 2] - m[rows, 2, 0]) / s, (m[rows, 1, 0] - m[rows, 0, 1]) / s))
+    rows = case == 1
+    s = np.sqrt(1.0 + m[rows, 0, 0] - m[rows, 1, 1] - m[rows, 2, 2]) * 2
+    q[rows] = np.column_stack(((m[rows, 2, 1] - m[rows, 1, 2]) / s, 0.25 * s,
+                               (m[rows, 0, 1] + m[rows, 1, 0]) / s, (m[rows, 0, 2] + m[rows, 2, 0]) / s))
+    rows = case == 2
+    s = np.sqrt(1.0 + m[rows, 1, 1] - m[rows, 0, 0] - m[rows, 2, 2]) * 2
+    q[rows] = np.column_stack(((m[rows, 0, 2] - m[rows, 2, 0]) / s, (m[rows, 0, 1] + m[rows, 1, 0]) / s,
+                               0.25 * s, (m[rows, 1, 2] + m[rows, 2, 1]) / s))
+    rows = case == 3
+    s = np.sqrt(1.0 + m[rows, 2, 2] - m[rows, 0, 0] - m[rows, 1, 1]) * 2
+    q[rows] = np.column_stack(((m[rows, 1, 0] - m[rows, 0, 1]) / s, (m[rows, 0, 2] + m[rows, 2, 0]) / s,
+                               (m[rows, 1, 2] + m[rows, 2, 1]) / s, 0.25 * s))
+    
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    if len(q) > 1:
+        flips = np.einsum('ij,ij->i', q[1:], q[:-1]) < 0
+        signs = np.where(np.concatenate(([False], np.cumsum(flips) % 2 == 1)), -1.0, 1.0)
+        q *= signs[:, None]
+    return q
+
+
+def heading_quaternions(
+    positions: np.ndarray,
+    window: int = 5,
+    forward_axis: Union[str, Sequence[float]] = 'y',
+    up: Sequence[float] = (0.0, 0.0, 1.0)
+) -> np.ndarray:
+    """
+    Compute the car orientation for every sample of a trajectory.
+    
+    :param positions: (N, 3) positions
+    :param window: Heading smoothing window in samples
+    :param forward_axis: Model's forward axis ('x', 'y', 'z', '-x', '-y', '-z' or a vector)
+    :param up: World up vector
+    :returns: (N, 4) quaternions as (w, x, y, z)
+    """
+    headings = heading_vectors(positions, window=window)
+    return matrices_to_quaternions(rotation_matrices(headings, forward_axis=forward_axis, up=up))
+
+
+def slerp(q0: np.ndarray, q1: np.ndarray, t: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Spherical linear interpolation between quaternions.
+    
+    :param q0: (..., 4) start quaternions
+    :param q1: (..., 4) end quaternions
+    :param t: Interpolation weight(s) in [0, 1], broadcast against the leading dimensions
+    :returns: (..., 4) unit quaternions
+    """
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.abs(dot)
+    
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_theta = np.sin(theta)
+    close = sin_theta < 1e-6
+    safe = np.where(close, 1.0, sin_theta)
+    w0 = np.where(close, 1.0 - t, np.sin((1.0 - t) * theta) / safe)
+    w1 = np.where(close, t, np.sin(t * theta) / safe)
+    result = w0 * q0 + w1 * q1
+    return result / np.linalg.norm(result, axis=-1, keepdims=True)
+
+
+def quaternions_to_matrices(quaternions: np.ndarray) -> np.ndarray:
+    """
+    Convert quaternions to rotation matrices.
+    
+    :param quaternions: (..., 4) quaternions as (w, x, y, z)
+    :returns: (..., 3, 3) rotation matrices
+    """
+    w, x, y, z = np.moveaxis(np.asarray(quaternions, dtype=np.float64), -1, 0)
+    return np.stack((
+        np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)), axis=-1),
+        np.stack((2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)), axis=-1),
+        np.stack((2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)), axis=-1),
+    ), axis=-2)
+
+
+def matrices_to_eulers(matrices: np.ndarray) -> np.ndarray:
+    """
+    Convert rotation matrices to XYZ Euler angles with angle continuity.
+    
+    Angles follow Blender's 'XYZ' rotation mode (R = Rz @ Ry @ Rx). Each
+    angle is unwrapped along the sequence, so interpolating between
+    neighbours never spins the long way round across +/-pi.
+    
+    :param matrices: (N, 3, 3) rotation matrices
+    :returns: (N, 3) angles in radians (x, y, z)
+    """
+    m = np.asarray(matrices, dtype=np.float64)
+    eulers = np.empty((len(m), 3))
+    eulers[:, 1] = np.arcsin(np.clip(-m[:, 2, 0], -1.0, 1.0))
+    eulers[:, 0] = np.arctan2(m[:, 2, 1], m[:, 2, 2])
+    eulers[:, 2] = np.arctan2(m[:, 1, 0], m[:, 0, 0])
+    # Gimbal lock (pitched straight up or down): only x - z is defined, put it all in z
+    locked = np.abs(m[:, 2, 0]) > 1 - 1e-9
+    if locked.any():
+        eulers[locked, 0] = 0.0
+        eulers[locked, 2] = np.arctan2(-m[locked, 0, 1], m[locked, 1, 1])
+    return np.unwrap(eulers, axis=0) if len(eulers) > 1 else eulers
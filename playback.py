@@ -0,0 +1,218 @@
+"""
+Playback clock shared by the track animations.
+
+PlaybackTimeline maps wall-clock time (or explicit frame steps) to a
+position on a sorted sample time axis. Lookups are binary searches, so
+seeking anywhere in a session is as cheap as advancing by one frame, and
+pause, reverse and speed changes take effect at any time without
+restarting the animation.
+"""
+from typing import Optional, Tuple, Callable
+import time
+
+import numpy as np
+
+
+class PlaybackTimeline:
+    """
+    Seekable playback position over a sorted time axis.
+    
+    Times are in seconds (session-relative or sample indices). Several
+    cars can share one timeline when their samples are on the same axis,
+    e.g. after resampling onto a common grid. ``jumps`` counts seeks and
+    loop wraps, so views can tell when to restart anything that follows the
+    playback path, such as trails.
+    """
+    
+    def __init__(
+        self,
+        times: np.ndarray,
+        speed_multiplier: float = 1.0,
+        loop: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize timeline at the first sample, playing forwards.
+        
+        :param times: Sample times in seconds, sorted ascending (repeats allowed)
+        :param speed_multiplier: Playback speed (1.0 = real-time, 2.0 = 2x speed)
+        :param loop: If True, wrap around at either end; if False, stop there
+        :param clock: Wall-clock source used by update()
+        """
+        self.times = np.asarray(times, dtype=np.float64)
+        if not len(self.times):
+            raise ValueError("times must not be empty")
+        self.start = float(self.times[0])
+        self.end = float(self.times[-1])
+        self.speed_multiplier = speed_multiplier
+        self.loop = loop
+        self.direction = 1
+        self.paused = False
+        self.position = self.start
+        self.wrapped = False
+        self.jumps = 0
+        self.clock = clock
+        self._last_tick: Optional[float] = None
+    
+    @property
+    def duration(self) -> float:
+        """Length of the time axis in seconds."""
+        return self.end - self.start
+    
+    def play(self) -> None:
+        """Resume playback."""
+        self.paused = False
+        self._last_tick = None
+    
+    def pause(self) -> None:
+        """Freeze the playback position."""
+        self.paused = True
+    
+    def toggle_pause(self) -> None:
+        """Switch between playing and paused."""
+        if self.paused:
+            self.play()
+        else:
+            self.pause()
+    
+    def reverse(self) -> None:
+        """Flip the playback direction."""
+        self.direction = -self.direction
+    
+    def seek(self, position: float) -> float:
+        """
+        Jump to a time on the axis.
+        
+        :param position: Target time in seconds (clamped to the axis)
+        :returns: New position
+        """
+        self.position = min(max(float(position), self.start), self.end)
+        self.jumps += 1
+        return self.position
+    
+    def seek_fraction(self, fraction: float) -> float:
+        """
+        Jump to a fraction of the way through the axis.
+        
+        :param fraction: 0.0 = start, 1.0 = end
+        :returns: New position
+        """
+        return self.seek(self.start + fraction * self.duration)
+    
+    def advance(self, seconds: float) -> float:
+        """
+        Move the position by a playback interval, honouring speed, direction and looping.
+        
+        :param seconds: Interval before applying speed_multiplier and direction
+        :returns: New position
+        """
+        self.wrapped = False
+        if self.paused:
+            return self.position
+        position = self.position + seconds * self.speed_multiplier * self.direction
+        if self.start <= position <= self.end:
+            self.position = position
+        elif self.loop and self.duration > 0:
+            self.position = self.start + (position - self.start) % self.duration
+            self.wrapped = True
+            self.jumps += 1
+        else:
+            self.position = min(max(position, self.start), self.end)
+        return self.position
+    
+    def update(self, now: Optional[float] = None) -> float:
+        """
+        Advance by the wall-clock time elapsed since the previous update.
+        
+        :param now: Current clock time (defaults to the timeline's clock)
+        :returns: New position
+        """
+        now = self.clock() if now is None else now
+        elapsed = 0.0 if self._last_tick is None else now - self._last_tick
+        self._last_tick = now
+        return self.advance(elapsed)
+    
+    def index(self, position: Optional[float] = None) -> int:
+        """
+        Find the last sample at or before a time.
+        
+        :param position: Time in seconds (defaults to the current position)
+        :returns: Sample index
+        """
+        position = self.position if position is None else position
+        return max(0, int(np.searchsorted(self.times, position, side="right")) - 1)
+    
+    def bracket(self, position: Optional[float] = None) -> Tuple[int, int, float]:
+        """
+        Find the samples around a time and the interpolation weight between them.
+        
+        :param position: Time in seconds (defaults to the current position)
+        :returns: (lower index, upper index, weight of the upper sample in [0, 1])
+        """
+        position = self.position if position is None else position
+        lower = self.index(position)
+        upper = min(lower + 1, len(self.times) - 1)
+        span = self.times[upper] - self.times[lower]
+        weight = 0.0 if span <= 0 else (position - self.times[lower]) / span
+        return lower, upper, float(min(max(weight, 0.0), 1.0))
+    
+    def interpolate(self, values: np.ndarray, position: Optional[float] = None, axis: int = 0) -> np.ndarray:
+        """
+        Linearly interpolate sample values at a time.
+        
+        :param values: Array with one entry per sample along ``axis`` (e.g. (N, 3) positions
+                       or (n_cars, N) resampled channels with axis=-1)
+        :param position: Time in seconds (defaults to the current position)
+        :param axis: Sample axis of ``values``
+        :returns: Interpolated values with ``axis`` removed
+        """
+        lower, upper, weight = self.bracket(position)
+        values = np.asarray(values)
+        low = np.take(values, lower, axis=axis)
+        if weight == 0.0:
+            return low
+        return low + (np.take(values, upper, axis=axis) - low) * weight
+    
+    def connect_keys(self, fig, seek_step: float = 5.0) -> int:
+        """
+        Bind keyboard controls on a matplotlib figure.
+        
+        space = pause/resume, r = reverse, +/- = double/halve speed,
+        left/right = seek back/forward by ``seek_step`` seconds, home/end = jump to start/end.
+        
+        Matplotlib's default key handler also binds r, home, left and right (to
+        reset and step through the view history), so it is replaced on this figure
+        by one that passes only the remaining keys on to it.
+        
+        :param fig: Matplotlib figure
+        :param seek_step: Seek distance in axis units
+        :returns: Matplotlib callback id
+        """
+        from matplotlib.backend_bases import key_press_handler
+        
+        actions = {
+            " ": self.toggle_pause,
+            "r": self.reverse,
+            "+": lambda: setattr(self, "speed_multiplier", self.speed_multiplier * 2.0),
+            "=": lambda: setattr(self, "speed_multiplier", self.speed_multiplier * 2.0),
+            "-": lambda: setattr(self, "speed_multiplier", self.speed_multiplier / 2.0),
+            "right": lambda: self.seek(self.position + seek_step),
+            "left": lambda: self.seek(self.position - seek_step),
+            "home": lambda: self.seek(self.start),
+            "end": lambda: self.seek(self.end),
+        }
+        
+        manager = fig.canvas.manager
+        default_id = getattr(manager, "key_press_handler_id", None)
+        if default_id is not None:
+            fig.canvas.mpl_disconnect(default_id)
+            manager.key_press_handler_id = None
+        
+        def on_key(event):
+            action = actions.get(event.key)
+            if action is not None:
+                action()
+            elif default_id is not None:
+                key_press_handler(event, fig.canvas)
+        
+        return fig.canvas.mpl_connect("key_press_event", on_key)
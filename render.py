@@ -0,0 +1,306 @@
+"""
+Headless rendering of the track animations to frames or video.
+
+An AnimationScene is the figure and per-frame update function of one of
+the animation methods, built without a window. Offline, frame k shows the
+playback position k / fps seconds (times the speed multiplier) into the
+timeline, so any frame can be rendered independently of wall-clock time.
+render_frames splits the frames into contiguous ranges and renders them
+in a pool of processes on the Agg backend. Each worker builds its scene
+once and either writes PNG frames or pipes raw frames into its own ffmpeg
+encoder, after which the segments are joined without re-encoding.
+"""
+from typing import Optional, Dict, List, Any, Tuple, Callable
+from pathlib import Path
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+from playback import PlaybackTimeline
+
+# Encoder per video container
+VIDEO_CODECS = {".mp4": "libx264", ".mkv": "libx264", ".mov": "libx264", ".webm": "libvpx-vp9"}
+FRAME_PATTERN = "frame_{:06d}.png"
+
+# Scene built once per worker process by _init_worker
+_worker_scene: Optional["AnimationScene"] = None
+
+
+class AnimationScene:
+    """
+    A figure plus the update function that draws one animation frame.
+    """
+    
+    def __init__(
+        self,
+        fig,
+        update: Callable[[int], Any],
+        timeline: PlaybackTimeline,
+        step: Optional[float] = None,
+        warmup: int = 0
+    ):
+        """
+        Wrap a built animation.
+        
+        :param fig: Matplotlib figure
+        :param update: FuncAnimation frame function
+        :param timeline: The timeline update() reads its position from
+        :param step: Timeline advance per frame for animations that step the timeline
+                     themselves (e.g. by frame_skip samples); None for wall-clock animations
+        :param warmup: Frames to run before the first rendered frame of a range so state
+                       built up over earlier frames, such as trails, is complete
+        """
+        self.fig = fig
+        self.update = update
+        self.timeline = timeline
+        self.step = step
+        self.warmup = warmup
+        self._now = 0.0
+    
+    def frame_step(self, fps: float) -> float:
+        """
+        Timeline advance between consecutive rendered frames.
+        
+        :param fps: Output frame rate
+        :returns: Step in timeline units
+        """
+        if self.step is not None:
+            return self.step
+        return self.timeline.speed_multiplier / fps
+    
+    def frame_count(self, fps: float) -> int:
+        """
+        Number of frames covering the whole timeline once.
+        
+        :param fps: Output frame rate
+        :returns: Frame count
+        """
+        return int(np.floor(self.timeline.duration / self.frame_step(fps) + 1e-9)) + 1
+    
+    def seek_frame(self, frame: int, fps: float) -> None:
+        """
+        Put the timeline where the given frame is drawn from.
+        
+        Switches the timeline to the scene's frame clock and stops it looping.
+        
+        :param frame: Frame number
+        :param fps: Output frame rate
+        """
+        self.timeline.clock = lambda: self._now
+        self.timeline.loop = False
+        self.timeline.seek(self.timeline.start + frame * self.frame_step(fps))
+        self.timeline.play()
+        self._now = frame / fps
+    
+    def draw_frame(self, frame: int, fps: float) -> np.ndarray:
+        """
+        Run the update for the next frame and draw the figure.
+        
+        Frames must be drawn in order after seek_frame().
+        
+        :param frame: Frame number
+        :param fps: Output frame rate
+        :returns: (height, width, 4) uint8 RGBA view of the canvas
+        """
+        self._now = frame / fps
+        self.update(frame)
+        self.fig.canvas.draw()
+        return np.asarray(self.fig.canvas.buffer_rgba())
+    
+    def frames(self, start: int, stop: int, fps: float):
+        """
+        Yield RGBA frames for a range, running the warmup first.
+        
+        :param start: First frame number
+        :param stop: Frame number after the last
+        :param fps: Output frame rate
+        :returns: Iterator of (frame number, RGBA array)
+        """
+        first = max(0, start - self.warmup)
+        self.seek_frame(first, fps)
+        for frame in range(first, start):
+            self._now = frame / fps
+            self.update(frame)
+        for frame in range(start, stop):
+            yield frame, self.draw_frame(frame, fps)
+
+
+def frame_ranges(count: int, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Split frame numbers into contiguous, near-equal ranges.
+    
+    :param count: Number of frames
+    :param chunks: Number of ranges
+    :returns: List of (start, stop) ranges, without empty ones
+    """
+    bounds = np.linspace(0, count, max(1, chunks) + 1).round().astype(int)
+    return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+def _ffmpeg() -> str:
+    """
+    Locate the ffmpeg executable.
+    """
+    path = shutil.which("ffmpeg")
+    if path is None:
+        raise RuntimeError("ffmpeg is required to encode video. Install ffmpeg, or render to a frame directory")
+    return path
+
+
+def _encoder(path: Path, width: int, height: int, fps: float) -> subprocess.Popen:
+    """
+    Start an ffmpeg process encoding raw RGBA frames from stdin.
+    """
+    return subprocess.Popen(
+        [
+            _ffmpeg(), "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", f"{fps}", "-i", "-",
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", VIDEO_CODECS[path.suffix.lower()], "-pix_fmt", "yuv420p", str(path)
+        ],
+        stdin=subprocess.PIPE
+    )
+
+
+def _render_range(scene: AnimationScene, start: int, stop: int, fps: float, target: Path, video: bool) -> int:
+    """
+    Render frames [start, stop) to PNG files in a directory, or to one video segment.
+    
+    :returns: Number of frames written
+    """
+    import matplotlib.image as mpimg
+    
+    encoder = None
+    written = 0
+    try:
+        for frame, rgba in scene.frames(start, stop, fps):
+            if video:
+                if encoder is None:
+                    encoder = _encoder(target, rgba.shape[1], rgba.shape[0], fps)
+                encoder.stdin.write(rgba.tobytes())
+            else:
+                mpimg.imsave(target / FRAME_PATTERN.format(frame), rgba)
+            written += 1
+    finally:
+        if encoder is not None:
+            encoder.stdin.close()
+            if encoder.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed to encode {target}")
+    return written
+
+
+def _init_worker(factory: Callable[..., AnimationScene], kwargs: Dict[str, Any], dpi: Optional[float]) -> None:
+    """
+    Build the scene once in a pool process.
+    """
+    global _worker_scene
+    import matplotlib
+    matplotlib.use("Agg")
+    _worker_scene = factory(**kwargs)
+    if dpi:
+        _worker_scene.fig.set_dpi(dpi)
+
+
+def _render_job(job: Tuple[int, int, float, str, bool]) -> int:
+    """
+    Render one frame range with the worker's scene.
+    
+    :returns: Number of frames written
+    """
+    start, stop, fps, target, video = job
+    return _render_range(_worker_scene, start, stop, fps, Path(target), video)
+
+
+def render_frames(
+    factory: Callable[..., AnimationScene],
+    kwargs: Dict[str, Any],
+    output: str,
+    fps: float = 30.0,
+    workers: Optional[int] = None,
+    dpi: Optional[float] = None,
+    frame_range: Optional[Tuple[int, int]] = None,
+    chunks_per_worker: int = 2
+) -> Dict[str, float]:
+    """
+    Render an animation offline in parallel.
+    
+    ``factory(**kwargs)`` is called once in this process to count frames
+    and once in every worker process, so both must be picklable (a
+    module-level function and plain data). Scripts that call this need an
+    ``if __name__ == "__main__":`` guard, as workers are spawned.
+    
+    :param factory: Module-level function returning an AnimationScene
+    :param kwargs: Keyword arguments for factory
+    :param output: Video file (.mp4, .mkv, .mov, .webm; needs ffmpeg) or a directory for PNG frames
+    :param fps: Output frame rate
+    :param workers: Number of processes (None = one per CPU, 1 = render in this process)
+    :param dpi: Figure resolution (None = the figure's own)
+    :param frame_range: Render only frames [start, stop)
+    :param chunks_per_worker: Frame ranges per worker, to even out uneven frame costs
+    :returns: Dictionary with 'frames', 'seconds', 'fps', 'workers' and 'fps_per_worker'
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    
+    output_path = Path(output)
+    video = output_path.suffix.lower() in VIDEO_CODECS
+    if video:
+        _ffmpeg()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        output_path.mkdir(parents=True, exist_ok=True)
+    
+    began = time.perf_counter()
+    scene = factory(**kwargs)
+    if dpi:
+        scene.fig.set_dpi(dpi)
+    start, stop = frame_range if frame_range is not None else (0, scene.frame_count(fps))
+    stop = min(stop, scene.frame_count(fps))
+    workers = max(1, min(workers or os.cpu_count() or 1, stop - start))
+    ranges = [(start + lo, start + hi) for lo, hi in frame_ranges(stop - start, workers * chunks_per_worker)]
+    if workers == 1:
+        ranges = [(start, stop)]
+    
+    segment_dir = Path(tempfile.mkdtemp(prefix=".segments_", dir=output_path.parent)) if video else None
+    targets = [str(segment_dir / f"segment_{i:04d}{output_path.suffix}") if video else str(output_path)
+               for i in range(len(ranges))]
+    jobs = [(lo, hi, fps, target, video) for (lo, hi), target in zip(ranges, targets)]
+    
+    try:
+        if workers == 1:
+            written = [_render_range(scene, lo, hi, fps, Path(target), video) for lo, hi, _, target, _ in jobs]
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            import matplotlib.pyplot as plt
+            plt.close(scene.fig)
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                     initargs=(factory, kwargs, dpi)) as pool:
+                written = list(pool.map(_render_job, jobs))
+        
+        if video:
+            listing = segment_dir / "segments.txt"
+            listing.write_text("".join(f"file '{Path(target).name}'\n" for target in targets), encoding="utf-8")
+            subprocess.run(
+                [_ffmpeg(), "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                 "-i", str(listing), "-c", "copy", str(output_path)],
+                check=True
+            )
+    finally:
+        if segment_dir is not None:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+    
+    seconds = time.perf_counter() - began
+    frames = sum(written)
+    return {
+        "frames": frames,
+        "seconds": seconds,
+        "fps": frames / seconds if seconds > 0 else 0.0,
+        "workers": workers,
+        "fps_per_worker": frames / seconds / workers if seconds > 0 else 0.0,
+    }
@@ -0,0 +1,163 @@
+"""
+Multi-car replay support for the matplotlib views.
+
+Every driver in a session is resampled onto one shared time grid, so a
+frame of the replay is a single (n_cars, 3) slice of an array. CarArtists
+draws all cars with one scatter, one heading-line collection and one
+trail collection, updated in place each frame rather than recreated per
+car, so the cost of a frame grows with the number of points drawn, not
+with the number of artists.
+"""
+from typing import Optional, Dict, List, Any, Union, Sequence
+
+import numpy as np
+
+from telemetry_frame import TelemetryFrame, as_frame, concat_frames
+from telemetry_resample import resample_merged
+from trails import TrailArtist
+
+
+SessionTelemetry = Union[TelemetryFrame, Dict[int, Any]]
+
+
+def session_frame(telemetry: SessionTelemetry) -> TelemetryFrame:
+    """
+    Combine per-driver telemetry into one frame.
+    
+    :param telemetry: A multi-driver TelemetryFrame, or a mapping of driver number to a
+                      TelemetryFrame, a list of location records, or a get_session_telemetry
+                      entry ({'location': [...], ...})
+    :returns: TelemetryFrame with driver_number set on every row
+    """
+    if isinstance(telemetry, TelemetryFrame):
+        return telemetry
+    frames = []
+    for driver_number, data in telemetry.items():
+        if isinstance(data, dict):
+            data = data.get("location", [])
+        frame = as_frame(data)
+        frames.append(TelemetryFrame(
+            frame.time, frame.x, frame.y, frame.z,
+            np.full(len(frame), driver_number), frame.session_key
+        ))
+    return concat_frames(frames)
+
+
+def session_grid(telemetry: SessionTelemetry, rate: float = 10.0) -> Dict[str, Any]:
+    """
+    Resample every driver's positions onto one shared time grid.
+    
+    :param telemetry: Session telemetry (see session_frame)
+    :param rate: Grid rate in Hz
+    :returns: Dictionary with 'time' (n_frames,) seconds from 'origin' (ns), 'drivers' (n_cars,),
+              'positions' (n_cars, n_frames, 3) and 'headings' (n_cars, n_frames, 3) unit vectors;
+              positions are NaN where a driver has no data
+    """
+    frame = session_frame(telemetry).dropna()
+    grid = resample_merged(
+        {"time": frame.time, "driver_number": frame.driver_number, "x": frame.x, "y": frame.y, "z": frame.z},
+        rate=rate
+    )
+    positions = np.stack((grid["x"], grid["y"], grid["z"]), axis=-1)
+    if positions.shape[1] > 1:
+        tangents = np.gradient(positions, axis=1)
+    else:
+        tangents = np.zeros_like(positions)
+    norms = np.linalg.norm(tangents, axis=-1, keepdims=True)
+    headings = np.divide(tangents, norms, out=np.zeros_like(tangents), where=norms > 1e-9)
+    return {
+        "time": grid["time"],
+        "origin": grid["origin"],
+        "drivers": grid["groups"],
+        "positions": positions,
+        "headings": headings,
+    }
+
+
+class CarArtists:
+    """
+    Batched matplotlib artists for many cars on a 2D or 3D axes.
+    """
+    
+    def __init__(
+        self,
+        ax,
+        count: int,
+        colors: Optional[Sequence[Any]] = None,
+        arrow_length: float = 150.0,
+        trails: bool = True,
+        marker_size: float = 40.0,
+        fade: bool = False
+    ):
+        """
+        Create the artists once; update() only changes their data.
+        
+        :param ax: Matplotlib axes (2D, or 3D from projection='3d')
+        :param count: Number of cars
+        :param colors: One colour per car (defaults to the tab20 colormap)
+        :param arrow_length: Length of the heading line drawn from each car
+        :param trails: If True, draw a trail behind each car
+        :param marker_size: Scatter marker size
+        :param fade: If True, trails fade out towards their oldest sample
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+        
+        self.ax = ax
+        self.count = count
+        self.arrow_length = arrow_length
+        self.is_3d = getattr(ax, "name", "") == "3d"
+        if colors is None:
+            colors = plt.get_cmap("tab20")(np.arange(count) % 20)
+        self.colors = colors
+        
+        if self.is_3d:
+            from mpl_toolkits.mplot3d.art3d import Line3DCollection
+            self.cars = ax.scatter(np.zeros(count), np.zeros(count), np.zeros(count),
+                                   c=colors, s=marker_size, depthshade=False, zorder=5)
+            self.headings = Line3DCollection(np.zeros((count, 2, 3)), colors=colors, linewidths=2)
+        else:
+            self.cars = ax.scatter(np.zeros(count), np.zeros(count), c=colors, s=marker_size, zorder=5)
+            self.headings = LineCollection(np.zeros((count, 2, 2)), colors=colors, linewidths=2)
+        ax.add_collection(self.headings)
+        self.trails = TrailArtist(ax, colors, fade=fade) if trails else None
+        self._heading_segments = np.zeros((count, 2, 3))
+    
+    @property
+    def artists(self) -> List[Any]:
+        """Artists changed by update(), e.g. for FuncAnimation blitting."""
+        return [self.cars, self.headings] + ([self.trails.collection] if self.trails else [])
+    
+    def update(
+        self,
+        positions: np.ndarray,
+        headings: Optional[np.ndarray] = None,
+        trails: Optional[Union[np.ndarray, List[np.ndarray]]] = None
+    ) -> List[Any]:
+        """
+        Move every car in one call.
+        
+        :param positions: (n_cars, 3) positions (NaN rows are hidden)
+        :param headings: (n_cars, 3) unit directions of travel (None = no heading lines)
+        :param trails: (n_cars, k, 3) array (e.g. TrailBuffer.window()) or, without fading,
+                       a list of (k, 3) arrays of recent positions
+        :returns: The updated artists
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        segments = self._heading_segments
+        segments[:, 0] = positions
+        if headings is not None:
+            np.multiply(headings, self.arrow_length, out=segments[:, 1])
+            segments[:, 1] += positions
+        else:
+            segments[:, 1] = positions
+        
+        if self.is_3d:
+            self.cars._offsets3d = (positions[:, 0], positions[:, 1], positions[:, 2])
+            self.headings.set_segments(segments)
+        else:
+            self.cars.set_offsets(positions[:, :2])
+            self.headings.set_segments(segments[:, :, :2])
+        if self.trails is not None and trails is not None:
+            self.trails.update(trails)
+        return self.artists
@@ -7,7 +7,7 @@ driving around the Singapore track.
 import asyncio
 from pathlib import Path
 from openf1_client import OpenF1Client
-from http_client_impl import HttpxClient
+from http_client_impl import HttpxClient, is_rate_limit_error
 
 
 async def find_singapore_race_data(client: OpenF1Client, year: int = 2024):
@@ -33,7 +33,6 @@ async def find_singapore_race_data(client: OpenF1Client, year: int = 2024):
     
     for date in singapore_dates:
         try:
-            await asyncio.sleep(0.5)
             sessions = await client.get_sessions(date=date, use_cache=True)
             
             for session in sessions:
@@ -48,9 +47,8 @@ async def find_singapore_race_data(client: OpenF1Client, year: int = 2024):
                     
                     return date, session_key, meeting_key
         except Exception as e:
-            if "429" in str(e) or "Too Many Requests" in str(e):
-                print(f"Rate limit hit, waiting before retry...")
-                await asyncio.sleep(2)
+            if is_rate_limit_error(e):
+                print(f"Rate limit still exceeded after retries, skipping {date}")
             continue
     
     return None, None, None
@@ -107,7 +105,6 @@ async def main(
             print("Trying alternative years...")
             
             for alt_year in [2023, 2022, 2021]:
-                await asyncio.sleep(1)
                 date, session_key, meeting_key = await find_singapore_race_data(client, alt_year)
                 if date is not None:
                     print(f"Using Singapore GP from {alt_year}")
@@ -161,7 +158,7 @@ async def main(
                 use_cache=not force_refresh
             )
         except Exception as e:
-            if "429" in str(e) or "Too Many Requests" in str(e):
+            if is_rate_limit_error(e):
                 print("Rate limit hit. Using cached data only...")
                 location_data = await client.get_time_and_location(
                     driver_number=driver_number,
@@ -184,7 +181,7 @@ async def main(
                     use_cache=not force_refresh
                 )
             except Exception as e:
-                if "429" in str(e) or "Too Many Requests" in str(e):
+                if is_rate_limit_error(e):
                     print("Rate limit hit. Using cached data only...")
                     location_data = await client.get_time_and_location(
                         driver_number=driver_number,
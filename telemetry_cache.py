@@ -0,0 +1,610 @@
+"""
+Columnar on-disk cache format for OpenF1 responses.
+
+Stores each response as a directory holding one typed NumPy array per
+field plus a small schema file, so large telemetry pulls can be
+memory-mapped instead of parsed from JSON on every load.
+"""
+from typing import Optional, Dict, List, Any
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import re
+import shutil
+import struct
+from pathlib import Path
+
+import numpy as np
+
+
+COLUMNAR_SUFFIX = ".cols"
+SCHEMA_FILENAME = "schema.json"
+
+DATE_FIELDS = ("date", "date_start", "date_end")
+
+FIELD_DTYPES = {
+    "driver_number": np.int16,
+    "session_key": np.int32,
+    "meeting_key": np.int32,
+    "x": np.float64,
+    "y": np.float64,
+    "z": np.float64,
+}
+
+NAT = np.iinfo(np.int64).min
+
+# Fixed .npy header size so the row count can be rewritten in place on append
+NPY_HEADER_BYTES = 128
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+_ISO_LAYOUT = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.(?P<fraction>\d+))?(?P<offset>Z|[+-]\d{2}:?\d{2})?$"
+)
+
+
+def _parse_iso_timestamp(value: str) -> int:
+    """
+    Convert a single ISO-8601 timestamp string with datetime.fromisoformat.
+    
+    Strings without an offset are treated as UTC.
+    
+    :param value: Timestamp string
+    :returns: Nanoseconds since the epoch (UTC), truncated to microseconds
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return ((parsed - _EPOCH) // _ONE_MICROSECOND) * 1000
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """
+    Count days since 1970-01-01 for proleptic Gregorian dates.
+    
+    :param year: Years
+    :param month: Months (1-12)
+    :param day: Days of month (1-31)
+    :returns: int64 day numbers
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _parse_iso_layout(
+    matrix: np.ndarray,
+    template: str
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Decode equal-length timestamp strings that share the layout of a template.
+    
+    :param matrix: uint8 array of shape (rows, len(template)) holding ASCII strings
+    :param template: One of the strings, used to locate the fraction and offset
+    :returns: Dictionary with 'ns' (int64 nanoseconds) and 'ok' (rows matching the layout
+              with every field in range), or None if the template is not in a supported layout
+    """
+    match = _ISO_LAYOUT.match(template)
+    if match is None:
+        return None
+    
+    # Every row must have digits where the template has digits and the same separators elsewhere
+    digit_cols = np.array([i for i, ch in enumerate(template) if ch.isdigit()])
+    sign_col = match.start("offset") if match.group("offset") not in (None, "Z") else None
+    fixed_cols = np.array([
+        i for i, ch in enumerate(template)
+        if not ch.isdigit() and i != 10 and i != sign_col
+    ])
+    ok = ((matrix[:, digit_cols] - np.uint8(ord("0"))) < 10).all(axis=1)
+    if len(fixed_cols):
+        expected = np.frombuffer(template.encode("ascii"), dtype=np.uint8)[fixed_cols]
+        ok &= (matrix[:, fixed_cols] == expected).all(axis=1)
+    ok &= (matrix[:, 10] == ord("T")) | (matrix[:, 10] == ord(" "))
+    
+    def number(first, width):
+        digits = matrix[:, first:first + width].astype(np.int64) - ord("0")
+        return digits @ (10 ** np.arange(width - 1, -1, -1, dtype=np.int64))
+    
+    # Out-of-range fields (Feb 30, 25:00, leap second 60, ...) are left to
+    # datetime.fromisoformat, so they raise exactly as with per-row parsing
+    year = number(0, 4)
+    month = number(5, 2)
+    day = number(8, 2)
+    hour = number(11, 2)
+    minute = number(14, 2)
+    second = number(17, 2)
+    month_ok = (month >= 1) & (month <= 12)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = _DAYS_IN_MONTH[np.where(month_ok, month, 0)] + (leap & (month == 2))
+    ok &= (year >= 1) & month_ok & (day >= 1) & (day <= month_days)
+    ok &= (hour <= 23) & (minute <= 59) & (second <= 59)
+    seconds = _days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second
+    
+    nanos = 0
+    if match.group("fraction"):
+        first = match.start("fraction")
+        width = min(9, len(match.group("fraction")))
+        nanos = number(first, width) * 10 ** (9 - width)
+    
+    if sign_col is not None:
+        signs = matrix[:, sign_col]
+        ok &= (signs == ord("+")) | (signs == ord("-"))
+        minute_col = sign_col + (4 if template[sign_col + 3] == ":" else 3)
+        offset_hours = number(sign_col + 1, 2)
+        offset_minutes = number(minute_col, 2)
+        ok &= (offset_hours <= 23) & (offset_minutes <= 59)
+        offset = offset_hours * 3600 + offset_minutes * 60
+        seconds = seconds - np.where(signs == ord("-"), -offset, offset)
+    
+    return {"ns": seconds * 1_000_000_000 + nanos, "ok": ok}
+
+
+def parse_iso_timestamps(values: List[Optional[str]]) -> np.ndarray:
+    """
+    Convert ISO-8601 timestamp strings to int64 nanoseconds since the epoch (UTC).
+    
+    Strings are grouped by length; each group in the usual
+    'YYYY-MM-DDTHH:MM:SS[.f...][Z|+HH:MM]' layout is decoded at once from a
+    fixed-width byte matrix, so mixed fractional-second precision and
+    offsets cost one vectorized pass per distinct layout. Anything else
+    goes through datetime.fromisoformat. Strings without an offset are
+    treated as UTC.
+    
+    :param values: Timestamp strings (None allowed)
+    :returns: int64 array, with missing values stored as NaT
+    :raises ValueError: If a string is not a valid ISO-8601 timestamp
+    """
+    result = np.full(len(values), NAT, dtype=np.int64)
+    if not len(values):
+        return result
+    
+    try:
+        raw = np.array([v or "" for v in values], dtype=np.bytes_)
+        lengths = np.char.str_len(raw)
+    except UnicodeEncodeError:
+        raw = None
+        lengths = np.fromiter((len(v or "") for v in values), dtype=np.int64, count=len(values))
+    
+    slow = lengths > 0
+    if raw is not None and raw.itemsize >= 19:
+        matrix = raw.view(np.uint8).reshape(len(values), raw.itemsize)
+        for length in np.unique(lengths[lengths >= 19]).tolist():
+            rows = np.flatnonzero(lengths == length)
+            group = matrix[:, :length] if len(rows) == len(values) else matrix[rows, :length]
+            decoded = _parse_iso_layout(group, values[rows[0]])
+            if decoded is None:
+                continue
+            matched = rows[decoded["ok"]]
+            result[matched] = decoded["ns"][decoded["ok"]]
+            slow[matched] = False
+    
+    for i in np.flatnonzero(slow).tolist():
+        result[i] = _parse_iso_timestamp(values[i])
+    return result
+
+
+def relative_seconds(timestamps: np.ndarray, origin: Optional[int] = None) -> np.ndarray:
+    """
+    Convert int64 nanosecond timestamps to float seconds from an origin.
+    
+    :param timestamps: int64 nanoseconds since the epoch (NaT allowed)
+    :param origin: Origin in nanoseconds (defaults to the earliest timestamp, e.g. session start)
+    :returns: float64 seconds, NaN for NaT
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    valid = timestamps != NAT
+    if origin is None:
+        if not valid.any():
+            return np.full(len(timestamps), np.nan)
+        origin = int(timestamps[valid].min())
+    result = (timestamps - origin).astype(np.float64) / 1e9
+    result[~valid] = np.nan
+    return result
+
+
+def format_iso_timestamps(values: np.ndarray) -> List[Optional[str]]:
+    """
+    Convert int64 nanosecond timestamps back to OpenF1-style ISO strings.
+    
+    :param values: int64 nanoseconds since the epoch (UTC)
+    :returns: List of ISO strings with '+00:00' offset, None for NaT
+    """
+    as_strings = np.datetime_as_string(np.asarray(values).view("datetime64[ns]"), unit="us")
+    return [None if s == "NaT" else f"{s}+00:00" for s in as_strings.tolist()]
+
+
+def _infer_column(name: str, values: List[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Infer storage kind and array for a single field.
+    
+    :param name: Field name
+    :param values: Field values, one per record
+    :returns: Dictionary with 'kind' and 'array', or None if the field is not numeric
+    """
+    if name in DATE_FIELDS and all(v is None or isinstance(v, str) for v in values):
+        try:
+            return {"kind": "date", "array": parse_iso_timestamps(values)}
+        except ValueError:
+            return None
+    
+    has_none = False
+    all_int = True
+    for v in values:
+        if v is None:
+            has_none = True
+        elif type(v) is int:
+            continue
+        elif type(v) is float:
+            all_int = False
+        else:
+            return None
+    
+    dtype = FIELD_DTYPES.get(name, np.int64 if all_int else np.float64)
+    if all_int and not has_none and np.issubdtype(dtype, np.integer):
+        array = np.array(values, dtype=np.int64)
+        if array.size and (array.min() < np.iinfo(dtype).min or array.max() > np.iinfo(dtype).max):
+            dtype = np.int64
+        return {"kind": "int", "array": array.astype(dtype, copy=False)}
+    
+    array = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if np.issubdtype(dtype, np.floating):
+        array = array.astype(dtype, copy=False)
+    return {"kind": "int" if all_int else "float", "array": array}
+
+
+def records_to_columns(records: List[Dict[str, Any]]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Convert a list of API records into typed columns.
+    
+    Only responses made of numeric and timestamp fields are columnar;
+    anything else (session names, driver metadata) returns None so the
+    caller can fall back to JSON.
+    
+    :param records: List of records as returned by the API
+    :returns: Mapping of field name to {'kind', 'array'}, or None if not columnar
+    """
+    if not records:
+        return None
+    
+    fields = list(records[0].keys())
+    if any(set(record.keys()) != set(fields) for record in records):
+        return None
+    
+    columns = {}
+    for name in fields:
+        column = _infer_column(name, [record[name] for record in records])
+        if column is None:
+            return None
+        columns[name] = column
+    return columns
+
+
+def columns_to_records(columns: Dict[str, np.ndarray], kinds: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Convert typed columns back into the list-of-dicts shape returned by the API.
+    
+    :param columns: Mapping of field name to array
+    :param kinds: Mapping of field name to storage kind ('date', 'int', 'float')
+    :returns: List of records
+    """
+    names = list(columns.keys())
+    values = []
+    for name in names:
+        array = columns[name]
+        kind = kinds.get(name, "float")
+        if kind == "date":
+            values.append(format_iso_timestamps(array))
+        elif kind == "int" and np.issubdtype(array.dtype, np.floating):
+            values.append([None if v != v else int(v) for v in array.tolist()])
+        elif np.issubdtype(array.dtype, np.floating) and np.isnan(array).any():
+            values.append([None if v != v else v for v in array.tolist()])
+        else:
+            values.append(array.tolist())
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def columnar_path(cache_file: Path) -> Path:
+    """
+    Get the columnar cache directory corresponding to a JSON cache filename.
+    
+    :param cache_file: Path to '.json' cache file
+    :returns: Path to '.cols' directory
+    """
+    return cache_file.with_suffix(COLUMNAR_SUFFIX)
+
+
+def _npy_header(dtype: np.dtype, rows: int) -> bytes:
+    """
+    Build a fixed-size version 1.0 .npy header for a 1-D array.
+    
+    :param dtype: Array dtype
+    :param rows: Number of elements
+    :returns: Header bytes, exactly NPY_HEADER_BYTES long
+    """
+    descr = np.lib.format.dtype_to_descr(np.dtype(dtype))
+    text = f"{{'descr': {descr!r}, 'fortran_order': False, 'shape': ({rows},), }}"
+    body_len = NPY_HEADER_BYTES - len(_NPY_MAGIC) - 2
+    body = text.ljust(body_len - 1).encode("latin1") + b"\n"
+    return _NPY_MAGIC + struct.pack("<H", body_len) + body
+
+
+def _write_column(path: Path, array: np.ndarray) -> None:
+    """
+    Write a 1-D array as a .npy file with an appendable fixed-size header.
+    
+    :param path: Target file
+    :param array: Array to write
+    """
+    array = np.ascontiguousarray(array)
+    with open(path, "wb") as f:
+        f.write(_npy_header(array.dtype, len(array)))
+        f.write(array.tobytes())
+
+
+def _write_schema(cache_dir: Path, schema: Dict[str, Any]) -> None:
+    """
+    Atomically replace the schema file of a cache directory.
+    
+    :param cache_dir: '.cols' directory
+    :param schema: Schema dictionary
+    """
+    tmp_file = cache_dir / f"{SCHEMA_FILENAME}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(schema, f)
+    os.replace(tmp_file, cache_dir / SCHEMA_FILENAME)
+
+
+def save_columns(cache_dir: Path, columns: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write typed columns to a cache directory atomically.
+    
+    :param cache_dir: Target '.cols' directory
+    :param columns: Mapping of field name to {'kind', 'array'} from records_to_columns
+    """
+    tmp_dir = cache_dir.with_name(f"{cache_dir.name}.tmp{os.getpid()}")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    
+    rows = 0
+    for name, column in columns.items():
+        _write_column(tmp_dir / f"{name}.npy", column["array"])
+        rows = len(column["array"])
+    
+    _write_schema(tmp_dir, {
+        "version": 1,
+        "rows": rows,
+        "fields": list(columns.keys()),
+        "kinds": {name: column["kind"] for name, column in columns.items()},
+    })
+    
+    if cache_dir.exists():
+        shutil.rmtree(cache_dir)
+    os.replace(tmp_dir, cache_dir)
+
+
+def append_columns(cache_dir: Path, columns: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    Append rows to an existing columnar cache entry without rewriting it.
+    
+    Data is appended to each column file and the row counts are patched in
+    place; the schema's row count is updated last, so a crash midway leaves
+    the entry readable at its previous length.
+    
+    :param cache_dir: Existing '.cols' directory
+    :param columns: New rows as returned by records_to_columns
+    :returns: True if appended; False if the entry cannot be appended to
+              (missing, different fields or incompatible types) and must be rewritten
+    """
+    schema = load_schema(cache_dir)
+    if schema is None or set(schema["fields"]) != set(columns.keys()):
+        return False
+    
+    rows = schema["rows"]
+    new_rows = len(next(iter(columns.values()))["array"])
+    prepared = {}
+    for name in schema["fields"]:
+        path = cache_dir / f"{name}.npy"
+        try:
+            with open(path, "rb") as f:
+                if np.lib.format.read_magic(f) != (1, 0):
+                    return False
+                shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+                offset = f.tell()
+        except (ValueError, IOError):
+            return False
+        
+        kind = schema["kinds"][name]
+        new_kind = columns[name]["kind"]
+        array = columns[name]["array"]
+        if offset != NPY_HEADER_BYTES or shape[0] < rows:
+            return False
+        if new_kind != kind and not (new_kind == "int" and kind == "float"):
+            return False
+        if np.issubdtype(dtype, np.integer) and not np.issubdtype(array.dtype, np.integer):
+            return False
+        if np.issubdtype(dtype, np.integer) and array.size and (
+            array.min() < np.iinfo(dtype).min or array.max() > np.iinfo(dtype).max
+        ):
+            return False
+        prepared[name] = (path, dtype, offset, array.astype(dtype, copy=False))
+    
+    for path, dtype, offset, array in prepared.values():
+        with open(path, "r+b") as f:
+            f.truncate(offset + rows * dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(array).tobytes())
+            f.seek(0)
+            f.write(_npy_header(dtype, rows + new_rows))
+    
+    schema["rows"] = rows + new_rows
+    _write_schema(cache_dir, schema)
+    return True
+
+
+def load_schema(cache_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read the schema of a columnar cache directory.
+    
+    :param cache_dir: '.cols' directory
+    :returns: Schema dictionary or None if missing or unreadable
+    """
+    try:
+        with open(cache_dir / SCHEMA_FILENAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def load_columns(
+    cache_dir: Path,
+    schema: Optional[Dict[str, Any]] = None,
+    mmap: bool = True
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Load typed columns from a cache directory.
+    
+    :param cache_dir: '.cols' directory
+    :param schema: Schema already read with load_schema (read from disk if None)
+    :param mmap: If True, memory-map the arrays instead of reading them into memory
+    :returns: Mapping of field name to array, or None if the entry is missing or corrupt
+    """
+    if schema is None:
+        schema = load_schema(cache_dir)
+    if schema is None:
+        return None
+    
+    columns = {}
+    try:
+        rows = schema["rows"]
+        for name in schema["fields"]:
+            array = np.load(cache_dir / f"{name}.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+            columns[name] = array[:rows]
+    except (ValueError, IOError, KeyError):
+        return None
+    return columns
+
+
+class NonColumnarResponse(ValueError):
+    """
+    A response that is not numeric telemetry, with its records already decoded.
+    
+    Lets callers fall back to the JSON path without downloading the
+    response a second time.
+    """
+    
+    def __init__(self, records: List[Dict[str, Any]], message: str = "Response is not numeric telemetry"):
+        """
+        Initialize with the decoded records.
+        
+        :param records: Every record of the response
+        :param message: Error message
+        """
+        super().__init__(message)
+        self.records = records
+
+
+class ColumnAccumulator:
+    """
+    Growable typed columns filled from batches of records.
+    
+    Used to decode streamed responses straight into arrays: each batch is
+    converted with records_to_columns and copied into preallocated arrays
+    that grow geometrically, so only one copy of the data is kept.
+    """
+    
+    def __init__(self, initial_capacity: int = 16384):
+        """
+        Initialize an empty accumulator.
+        
+        :param initial_capacity: Rows to allocate on the first batch
+        """
+        self.initial_capacity = initial_capacity
+        self.rows = 0
+        self._kinds: Dict[str, str] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+    
+    def _reserve(self, rows: int) -> None:
+        """
+        Ensure capacity for ``rows`` total rows.
+        
+        :param rows: Required capacity
+        """
+        capacity = len(next(iter(self._arrays.values()))) if self._arrays else 0
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, self.initial_capacity)
+        for name, array in self._arrays.items():
+            grown = np.empty(new_capacity, dtype=array.dtype)
+            grown[:self.rows] = array[:self.rows]
+            self._arrays[name] = grown
+    
+    def extend(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Append a batch of records.
+        
+        :param records: Records with the same fields as previous batches
+        :raises ValueError: If the batch is not numeric or doesn't match earlier batches
+        """
+        if not records:
+            return
+        batch = records_to_columns(records)
+        if batch is None:
+            raise ValueError("Batch contains non-numeric or inconsistent fields")
+        
+        if not self._arrays:
+            self._kinds = {name: column["kind"] for name, column in batch.items()}
+            self._arrays = {name: np.empty(0, dtype=column["array"].dtype) for name, column in batch.items()}
+        elif set(batch.keys()) != set(self._arrays.keys()):
+            raise ValueError("Batch fields differ from earlier batches")
+        
+        # Check every field before changing any, so a rejected batch leaves earlier rows intact
+        for name, column in batch.items():
+            kind = self._kinds[name]
+            if column["kind"] != kind and {kind, column["kind"]} != {"int", "float"}:
+                raise ValueError(f"Field '{name}' changed from {kind} to {column['kind']}")
+        
+        for name, column in batch.items():
+            if column["kind"] != self._kinds[name]:
+                self._kinds[name] = "float"
+            dtype = np.result_type(self._arrays[name].dtype, column["array"].dtype)
+            if dtype != self._arrays[name].dtype:
+                self._arrays[name] = self._arrays[name].astype(dtype)
+        
+        start = self.rows
+        self._reserve(start + len(records))
+        for name, column in batch.items():
+            self._arrays[name][start:start + len(records)] = column["array"]
+        self.rows += len(records)
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Convert the rows accumulated so far back into records.
+        
+        Timestamps come back in the normalized form that columnar cache hits return.
+        
+        :returns: List of records
+        """
+        columns = self.finish()
+        return columns_to_records(
+            {name: column["array"] for name, column in columns.items()},
+            {name: column["kind"] for name, column in columns.items()}
+        )
+    
+    def finish(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the accumulated columns, trimmed to the number of rows.
+        
+        :returns: Mapping of field name to {'kind', 'array'}, as from records_to_columns
+        """
+        return {
+            name: {"kind": self._kinds[name], "array": array[:self.rows]}
+            for name, array in self._arrays.items()
+        }
@@ -0,0 +1,200 @@
+"""
+Distance-domain lookup for telemetry.
+
+DistanceIndex keeps a driver's samples on a monotonic cumulative distance
+axis next to their times, so "when was the car at this point of the
+track" and "how far round was it at this time" are binary searches over
+whole arrays of queries. Comparing drivers at the same track point (lap
+deltas, ghost cars) is then two lookups instead of a scan.
+"""
+from typing import Optional, Dict, Any, Union
+
+import numpy as np
+
+from telemetry_cache import NAT, relative_seconds
+
+
+class DistanceIndex:
+    """
+    Monotonic distance <-> time mapping for one driver.
+    
+    Distances are cumulative from the start of the lap the data begins in,
+    so with a lap length set, lap k covers [k * lap_length, (k + 1) * lap_length).
+    """
+    
+    def __init__(
+        self,
+        time: np.ndarray,
+        distance: np.ndarray,
+        lap_length: Optional[float] = None,
+        origin: int = 0
+    ):
+        """
+        Build the index from samples in time order.
+        
+        Distances that wrap at the lap length (e.g. projected track distance)
+        are unwrapped when lap_length is given; small backward steps from
+        noise are flattened so the axis never decreases. Samples with a
+        missing time or distance are dropped.
+        
+        :param time: Sample times in seconds, ascending
+        :param distance: Distance at each sample (cumulative, or wrapping at lap_length)
+        :param lap_length: Track length; if set, distance is treated as wrapping every lap
+        :param origin: Time origin in ns that ``time`` is relative to (for reference)
+        """
+        time = np.asarray(time, dtype=np.float64)
+        distance = np.asarray(distance, dtype=np.float64)
+        present = ~(np.isnan(time) | np.isnan(distance))
+        time = time[present]
+        distance = distance[present]
+        if not len(time):
+            raise ValueError("No samples with both time and distance")
+        
+        if lap_length:
+            steps = (np.diff(distance) + lap_length / 2) % lap_length - lap_length / 2
+            distance = distance[0] % lap_length + np.concatenate(([0.0], np.cumsum(steps)))
+        self.time = time
+        self.distance = np.maximum.accumulate(distance)
+        self.lap_length = lap_length
+        self.origin = origin
+    
+    def __len__(self) -> int:
+        return len(self.time)
+    
+    def __repr__(self) -> str:
+        return (f"DistanceIndex(samples={len(self)}, distance={self.distance[0]:.1f}..{self.distance[-1]:.1f}, "
+                f"time={self.time[0]:.2f}..{self.time[-1]:.2f})")
+    
+    @classmethod
+    def from_tel(cls, tel: Dict[str, Any]) -> "DistanceIndex":
+        """
+        Build from the 'tel' section of a *_tel.json file.
+        
+        Uses the 'distance' channel, or 'rel_distance' (fraction of the lap)
+        if that is missing.
+        
+        :param tel: Dictionary with 'time' and 'distance' (or 'rel_distance') lists
+        :returns: DistanceIndex
+        """
+        def values(name):
+            return np.array([np.nan if v is None else v for v in tel[name]], dtype=np.float64)
+        
+        if "distance" in tel:
+            return cls(values("time"), values("distance"))
+        return cls(values("time"), values("rel_distance"))
+    
+    @classmethod
+    def from_projection(
+        cls,
+        projected: Dict[str, np.ndarray],
+        lap_length: float,
+        origin: Optional[int] = None
+    ) -> "DistanceIndex":
+        """
+        Build from a projected telemetry frame (see OpenF1Client.get_track_position).
+        
+        :param projected: Dictionary with int64 ns 'time' and wrapping track 'distance'
+        :param lap_length: Centerline length
+        :param origin: Time origin in ns (defaults to the earliest sample)
+        :returns: DistanceIndex with times in seconds from the origin
+        """
+        timestamps = np.asarray(projected["time"], dtype=np.int64)
+        present = timestamps != NAT
+        if origin is None:
+            origin = int(timestamps[present].min()) if present.any() else 0
+        order = np.argsort(timestamps, kind="stable")
+        return cls(
+            relative_seconds(timestamps[order], origin),
+            np.asarray(projected["distance"])[order],
+            lap_length=lap_length,
+            origin=origin
+        )
+    
+    def distance_at(self, time: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Cumulative distance at given times.
+        
+        :param time: Time(s) in seconds, any shape
+        :returns: Distances (NaN outside the recorded time range)
+        """
+        return np.interp(time, self.time, self.distance, left=np.nan, right=np.nan)
+    
+    def time_at(self, distance: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Time at which the car first reached given cumulative distances.
+        
+        :param distance: Distance(s), any shape
+        :returns: Times in seconds (NaN outside the recorded distance range)
+        """
+        distance = np.asarray(distance, dtype=np.float64)
+        if len(self) < 2:
+            return np.where(distance == self.distance[0], self.time[0], np.nan)
+        upper = np.clip(np.searchsorted(self.distance, distance, side="left"), 1, len(self) - 1)
+        lower = upper - 1
+        span = self.distance[upper] - self.distance[lower]
+        weight = np.divide(distance - self.distance[lower], span, out=np.ones_like(distance), where=span > 0)
+        time = self.time[lower] + weight * (self.time[upper] - self.time[lower])
+        return np.where((distance >= self.distance[0]) & (distance <= self.distance[-1]), time, np.nan)
+    
+    def lap_distance(self, distance: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Split cumulative distances into lap number and distance into the lap.
+        
+        :param distance: Cumulative distance(s)
+        :returns: Array of shape distance.shape + (2,) with (lap, distance into lap)
+        """
+        if not self.lap_length:
+            raise ValueError("lap_length is required for lap-relative distances")
+        distance = np.asarray(distance, dtype=np.float64)
+        lap, into = np.divmod(distance, self.lap_length)
+        return np.stack((lap, into), axis=-1)
+    
+    def time_at_lap(self, lap: Union[int, np.ndarray], lap_distance: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Time at which the car reached a point on a given lap.
+        
+        :param lap: Lap number(s) counted from the lap the data begins in
+        :param lap_distance: Distance(s) into the lap
+        :returns: Times in seconds (NaN where not recorded)
+        """
+        if not self.lap_length:
+            raise ValueError("lap_length is required for lap-relative lookups")
+        return self.time_at(np.asarray(lap) * self.lap_length + np.asarray(lap_distance, dtype=np.float64))
+    
+    def line_crossings(self) -> np.ndarray:
+        """
+        Times at which the car crossed distance zero of each lap.
+        
+        :returns: Crossing times in seconds, one per completed line crossing
+        """
+        if not self.lap_length:
+            raise ValueError("lap_length is required for line crossings")
+        first = np.floor(self.distance[0] / self.lap_length) + 1
+        last = np.floor(self.distance[-1] / self.lap_length)
+        return self.time_at(np.arange(first, last + 1) * self.lap_length)
+    
+    def delta_to(self, other: "DistanceIndex", distance: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Time gap to another driver at the same cumulative distances.
+        
+        Both indexes should measure distance from the same point, e.g. two
+        *_tel.json laps, or projections onto the same centerline.
+        
+        :param other: The other driver's index
+        :param distance: Cumulative distance(s) to compare at
+        :returns: other's time minus this driver's time (positive = other is behind)
+        """
+        return other.time_at(distance) - self.time_at(distance)
+    
+    def ghost_distance(self, other: "DistanceIndex", time: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Where the other driver was after the same elapsed time, e.g. for a ghost car.
+        
+        Elapsed time is measured from each index's first sample.
+        
+        :param other: The other driver's index
+        :param time: This driver's time(s) in seconds
+        :returns: The other driver's cumulative distance (NaN where not recorded)
+        """
+        elapsed = np.asarray(time, dtype=np.float64) - self.time[0]
+        return other.distance_at(other.time[0] + elapsed)
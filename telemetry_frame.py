@@ -0,0 +1,331 @@
+"""
+Struct-of-arrays container for driver location telemetry.
+
+A TelemetryFrame holds one NumPy array per field (timestamps as int64
+nanoseconds, coordinates as floats, driver/session ids as ints) instead
+of a list of per-sample dicts, so plotting and animation code can use
+the arrays directly. Slicing and time-range selection return views that
+share memory with the parent frame.
+"""
+from typing import Optional, Dict, List, Any, Union
+
+import numpy as np
+
+from telemetry_cache import NAT, format_iso_timestamps, parse_iso_timestamps, relative_seconds
+
+
+FRAME_FIELDS = ("time", "x", "y", "z", "driver_number", "session_key")
+
+FRAME_DTYPES = {
+    "time": np.int64,
+    "x": np.float64,
+    "y": np.float64,
+    "z": np.float64,
+    "driver_number": np.int16,
+    "session_key": np.int32,
+}
+
+# Placeholder for missing ids in integer columns
+MISSING_ID = -1
+
+
+def _as_timestamp_ns(value: Union[int, str, np.datetime64]) -> int:
+    """
+    Convert a time bound to int64 nanoseconds since the epoch.
+    
+    :param value: Nanoseconds, ISO-8601 string or numpy datetime64
+    :returns: Nanoseconds since the epoch (UTC)
+    """
+    if isinstance(value, str):
+        return int(parse_iso_timestamps([value])[0])
+    if isinstance(value, np.datetime64):
+        return int(value.astype("datetime64[ns]").astype(np.int64))
+    return int(value)
+
+
+class TelemetryFrame:
+    """
+    Columnar location telemetry for one or more drivers.
+    
+    Columns are exposed as attributes (``time``, ``x``, ``y``, ``z``,
+    ``driver_number``, ``session_key``). Integer indexing returns a single
+    record dict; slices and boolean/integer arrays return a new frame
+    (a zero-copy view for slices).
+    """
+    
+    __slots__ = FRAME_FIELDS
+    
+    def __init__(
+        self,
+        time: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        z: np.ndarray,
+        driver_number: Optional[np.ndarray] = None,
+        session_key: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize frame from arrays of equal length.
+        
+        Arrays that already have the target dtype are used without copying.
+        
+        :param time: Timestamps as int64 nanoseconds since the epoch (NaT allowed)
+        :param x: X coordinates
+        :param y: Y coordinates
+        :param z: Z coordinates
+        :param driver_number: Driver numbers (None = all missing)
+        :param session_key: Session keys (None = all missing)
+        """
+        rows = len(time)
+        columns = {"time": time, "x": x, "y": y, "z": z,
+                   "driver_number": driver_number, "session_key": session_key}
+        for name in FRAME_FIELDS:
+            values = columns[name]
+            if values is None:
+                values = np.full(rows, MISSING_ID, dtype=FRAME_DTYPES[name])
+            elif name in ("x", "y", "z"):
+                values = np.asarray(values)
+                if not np.issubdtype(values.dtype, np.floating):
+                    values = values.astype(FRAME_DTYPES[name])
+            else:
+                values = np.asarray(values, dtype=FRAME_DTYPES[name])
+            if len(values) != rows:
+                raise ValueError(f"Column '{name}' has {len(values)} rows, expected {rows}")
+            setattr(self, name, values)
+    
+    @classmethod
+    def empty(cls) -> "TelemetryFrame":
+        """
+        Create a frame with no rows.
+        
+        :returns: Empty TelemetryFrame
+        """
+        return cls(*(np.empty(0, dtype=FRAME_DTYPES[name]) for name in FRAME_FIELDS))
+    
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, Dict[str, Any]],
+        time_field: str = "date"
+    ) -> "TelemetryFrame":
+        """
+        Build a frame from typed cache columns without copying matching arrays.
+        
+        :param columns: Mapping of field name to {'kind', 'array'} as returned by the cache
+        :param time_field: Source field holding the sample timestamps
+        :returns: TelemetryFrame (empty if there are no columns)
+        """
+        if not columns or time_field not in columns:
+            return cls.empty()
+        rows = len(columns[time_field]["array"])
+        
+        def column(name):
+            if name in columns:
+                return columns[name]["array"]
+            if name in ("x", "y", "z"):
+                return np.full(rows, np.nan)
+            return None
+        
+        return cls(
+            columns[time_field]["array"],
+            column("x"),
+            column("y"),
+            column("z"),
+            driver_number=column("driver_number"),
+            session_key=column("session_key")
+        )
+    
+    @classmethod
+    def from_records(
+        cls,
+        records: List[Dict[str, Any]],
+        time_field: Optional[str] = None
+    ) -> "TelemetryFrame":
+        """
+        Build a frame from a list of location dicts.
+        
+        :param records: Records from get_location_data or the get_time_and_location dict list
+        :param time_field: Key holding the timestamp (defaults to 'time', else 'date')
+        :returns: TelemetryFrame
+        """
+        if not records:
+            return cls.empty()
+        if time_field is None:
+            time_field = "time" if "time" in records[0] else "date"
+        
+        def floats(name):
+            return np.array([np.nan if r.get(name) is None else r[name] for r in records], dtype=np.float64)
+        
+        def ids(name):
+            return np.array([MISSING_ID if r.get(name) is None else r[name] for r in records],
+                            dtype=FRAME_DTYPES[name])
+        
+        return cls(
+            parse_iso_timestamps([r.get(time_field) for r in records]),
+            floats("x"),
+            floats("y"),
+            floats("z"),
+            driver_number=ids("driver_number"),
+            session_key=ids("session_key")
+        )
+    
+    def __len__(self) -> int:
+        """Number of samples."""
+        return len(self.time)
+    
+    def __iter__(self):
+        """Iterate over samples as record dicts."""
+        return iter(self.to_records())
+    
+    def __getitem__(self, index):
+        """
+        Select samples.
+        
+        :param index: Integer (returns a record dict), slice, boolean mask or index array
+        :returns: Record dict or TelemetryFrame
+        """
+        if isinstance(index, (int, np.integer)):
+            return self.record(int(index))
+        return TelemetryFrame(*(getattr(self, name)[index] for name in FRAME_FIELDS))
+    
+    def __repr__(self) -> str:
+        drivers = sorted(set(np.unique(self.driver_number).tolist()) - {MISSING_ID})
+        return f"TelemetryFrame(rows={len(self)}, drivers={drivers})"
+    
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        Get a single sample as a dict in the get_time_and_location record shape.
+        
+        :param index: Row index (negative allowed)
+        :returns: Dictionary with time, x, y, z, driver_number, session_key
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TelemetryFrame index out of range")
+        return self[index:index + 1].to_records()[0]
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Positions as an (N, 3) array.
+        
+        :returns: Stacked x, y, z coordinates (a copy)
+        """
+        return np.column_stack((self.x, self.y, self.z))
+    
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """
+        Mask of samples with all three coordinates present.
+        
+        :returns: Boolean array
+        """
+        return ~(np.isnan(self.x) | np.isnan(self.y) | np.isnan(self.z))
+    
+    def dropna(self) -> "TelemetryFrame":
+        """
+        Drop samples with any missing coordinate.
+        
+        :returns: Self if nothing is missing, otherwise a filtered frame
+        """
+        mask = self.valid_mask
+        return self if mask.all() else self[mask]
+    
+    def is_sorted(self) -> bool:
+        """
+        Check whether timestamps are in non-decreasing order.
+        
+        :returns: True if sorted
+        """
+        return bool(np.all(self.time[1:] >= self.time[:-1]))
+    
+    def between(
+        self,
+        start: Optional[Union[int, str, np.datetime64]] = None,
+        end: Optional[Union[int, str, np.datetime64]] = None
+    ) -> "TelemetryFrame":
+        """
+        Select samples with start <= time < end.
+        
+        Sorted frames are cut with a binary search and return a zero-copy view;
+        unsorted frames fall back to a boolean mask.
+        
+        :param start: Inclusive lower bound (ns, ISO string or datetime64; None = open)
+        :param end: Exclusive upper bound (ns, ISO string or datetime64; None = open)
+        :returns: TelemetryFrame
+        """
+        lo = _as_timestamp_ns(start) if start is not None else None
+        hi = _as_timestamp_ns(end) if end is not None else None
+        if self.is_sorted():
+            first = 0 if lo is None else int(np.searchsorted(self.time, lo, side="left"))
+            last = len(self) if hi is None else int(np.searchsorted(self.time, hi, side="left"))
+            return self[first:max(first, last)]
+        mask = self.time != NAT
+        if lo is not None:
+            mask &= self.time >= lo
+        if hi is not None:
+            mask &= self.time < hi
+        return self[mask]
+    
+    def for_driver(self, driver_number: int) -> "TelemetryFrame":
+        """
+        Select the samples of one driver.
+        
+        :param driver_number: Driver number
+        :returns: TelemetryFrame
+        """
+        return self[self.driver_number == driver_number]
+    
+    def seconds(self, origin: Optional[int] = None) -> np.ndarray:
+        """
+        Timestamps as float seconds relative to an origin.
+        
+        :param origin: Origin in ns since the epoch (defaults to the earliest sample)
+        :returns: float64 array (NaN for missing timestamps)
+        """
+        return relative_seconds(self.time, origin)
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert to the list-of-dicts shape returned before TelemetryFrame existed.
+        
+        :returns: List of dicts with ISO 'time' strings and None for missing values
+        """
+        times = format_iso_timestamps(self.time)
+        coords = [
+            [None if np.isnan(v) else v for v in getattr(self, name).tolist()]
+            for name in ("x", "y", "z")
+        ]
+        ids = [
+            [None if v == MISSING_ID else v for v in getattr(self, name).tolist()]
+            for name in ("driver_number", "session_key")
+        ]
+        return [
+            {"time": t, "x": x, "y": y, "z": z, "driver_number": d, "session_key": s}
+            for t, x, y, z, d, s in zip(times, *coords, *ids)
+        ]
+
+
+def as_frame(data: Union[TelemetryFrame, List[Dict[str, Any]]]) -> TelemetryFrame:
+    """
+    Accept either a TelemetryFrame or a list of location dicts.
+    
+    :param data: TelemetryFrame or records from get_time_and_location/get_location_data
+    :returns: TelemetryFrame (the same object if one was passed)
+    """
+    if isinstance(data, TelemetryFrame):
+        return data
+    return TelemetryFrame.from_records(data or [])
+
+
+def concat_frames(frames: List[TelemetryFrame]) -> TelemetryFrame:
+    """
+    Stack several frames (e.g. one per driver) into one.
+    
+    :param frames: Frames to concatenate, in order
+    :returns: New TelemetryFrame holding every row
+    """
+    if not frames:
+        return TelemetryFrame.empty()
+    return TelemetryFrame(*(np.concatenate([getattr(f, name) for f in frames]) for name in FRAME_FIELDS))
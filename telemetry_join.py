@@ -0,0 +1,273 @@
+"""
+Time alignment of OpenF1 location and car_data streams.
+
+Both endpoints sample at roughly 3.7 Hz but on independent clocks. The
+as-of join here matches every location sample to a car_data sample
+(nearest, previous or next within a tolerance) with binary searches over
+sorted int64 timestamps, so a full race for the whole grid is a handful
+of array operations rather than a Python loop. The merged columns can be
+written in the {"tel": {...}} layout read by the animation scripts.
+"""
+from typing import Optional, Dict, List, Any
+import json
+from pathlib import Path
+
+import numpy as np
+
+from telemetry_cache import NAT, relative_seconds
+from telemetry_frame import MISSING_ID, TelemetryFrame
+
+
+# car_data field -> merged column name, in the order used by the *_tel.json files
+CAR_DATA_FIELDS = {
+    "rpm": "rpm",
+    "speed": "speed",
+    "n_gear": "gear",
+    "throttle": "throttle",
+    "brake": "brake",
+    "drs": "drs",
+}
+
+JOIN_DIRECTIONS = ("nearest", "backward", "forward")
+
+
+def asof_indices(
+    left: np.ndarray,
+    right: np.ndarray,
+    tolerance: Optional[int] = None,
+    direction: str = "nearest"
+) -> np.ndarray:
+    """
+    Match each left timestamp to a right timestamp.
+    
+    Both arrays must be sorted ascending.
+    
+    :param left: Sorted int64 timestamps to match
+    :param right: Sorted int64 timestamps to match against
+    :param tolerance: Maximum allowed time difference (same units; None = unlimited)
+    :param direction: 'nearest', 'backward' (latest right <= left) or 'forward' (earliest right >= left)
+    :returns: int64 index into right for each left timestamp, -1 where there is no match
+    """
+    if direction not in JOIN_DIRECTIONS:
+        raise ValueError(f"Unknown join direction: {direction}")
+    left = np.asarray(left, dtype=np.int64)
+    right = np.asarray(right, dtype=np.int64)
+    if not len(right):
+        return np.full(len(left), -1, dtype=np.int64)
+    
+    after = np.searchsorted(right, left, side="left")
+    before = np.searchsorted(right, left, side="right") - 1
+    has_before = before >= 0
+    has_after = after < len(right)
+    gap_before = np.where(has_before, left - right[np.clip(before, 0, None)], np.iinfo(np.int64).max)
+    gap_after = np.where(has_after, right[np.clip(after, None, len(right) - 1)] - left, np.iinfo(np.int64).max)
+    
+    if direction == "backward":
+        index, gap = np.where(has_before, before, -1), gap_before
+    elif direction == "forward":
+        index, gap = np.where(has_after, after, -1), gap_after
+    else:
+        use_after = gap_after < gap_before
+        index = np.where(use_after, after, before)
+        index = np.where(has_before | has_after, index, -1)
+        gap = np.minimum(gap_before, gap_after)
+    
+    index = index.astype(np.int64)
+    missing = (left == NAT) | (index < 0)
+    if tolerance is not None:
+        missing |= gap > tolerance
+    index[missing] = -1
+    return index
+
+
+def _grouped_asof_indices(
+    left_time: np.ndarray,
+    right_time: np.ndarray,
+    left_by: Optional[np.ndarray],
+    right_by: Optional[np.ndarray],
+    tolerance: Optional[int],
+    direction: str
+) -> np.ndarray:
+    """
+    As-of match within groups (e.g. per driver), for inputs in any order.
+    
+    :param left_time: int64 timestamps to match
+    :param right_time: int64 timestamps to match against
+    :param left_by: Group key per left row (None = single group)
+    :param right_by: Group key per right row (None = single group)
+    :param tolerance: Maximum allowed time difference in ns (None = unlimited)
+    :param direction: 'nearest', 'backward' or 'forward'
+    :returns: int64 index into the right arrays for each left row, -1 where unmatched
+    """
+    if left_by is None or right_by is None:
+        left_by = np.zeros(len(left_time), dtype=np.int64)
+        right_by = np.zeros(len(right_time), dtype=np.int64)
+    
+    left_order = np.lexsort((left_time, left_by))
+    right_order = np.lexsort((right_time, right_by))
+    left_groups = left_by[left_order]
+    right_groups = right_by[right_order]
+    
+    result = np.full(len(left_time), -1, dtype=np.int64)
+    for group in np.unique(left_groups):
+        lo, hi = np.searchsorted(left_groups, group, side="left"), np.searchsorted(left_groups, group, side="right")
+        rlo, rhi = np.searchsorted(right_groups, group, side="left"), np.searchsorted(right_groups, group, side="right")
+        rows = left_order[lo:hi]
+        candidates = right_order[rlo:rhi]
+        matched = asof_indices(left_time[rows], right_time[candidates], tolerance, direction)
+        result[rows] = np.where(matched >= 0, candidates[np.clip(matched, 0, None)], -1)
+    return result
+
+
+def join_car_data(
+    location: TelemetryFrame,
+    car_data: Dict[str, Dict[str, Any]],
+    tolerance: Optional[float] = 0.3,
+    direction: str = "nearest"
+) -> Dict[str, np.ndarray]:
+    """
+    Attach car_data channels to every location sample.
+    
+    Matching is done per driver when both sides carry driver numbers. Integer
+    channels stay integers when every sample matched; otherwise they become
+    floats with NaN for unmatched samples.
+    
+    :param location: Location samples (one or many drivers, any order)
+    :param car_data: car_data columns as returned by the cache, mapping field to {'kind', 'array'}
+    :param tolerance: Maximum time difference in seconds (None = unlimited)
+    :param direction: 'nearest', 'backward' or 'forward'
+    :returns: Merged columns: 'time' (int64 ns), 'x', 'y', 'z', 'driver_number', 'session_key',
+              then the car_data channels ('rpm', 'speed', 'gear', 'throttle', 'brake', 'drs')
+    """
+    merged = {
+        "time": location.time,
+        "x": location.x,
+        "y": location.y,
+        "z": location.z,
+        "driver_number": location.driver_number,
+        "session_key": location.session_key,
+    }
+    if not car_data or "date" not in car_data:
+        matched = np.full(len(location), -1, dtype=np.int64)
+    else:
+        left_by = right_by = None
+        if "driver_number" in car_data and np.any(location.driver_number != MISSING_ID):
+            left_by = location.driver_number.astype(np.int64)
+            right_by = car_data["driver_number"]["array"].astype(np.int64)
+        matched = _grouped_asof_indices(
+            location.time,
+            car_data["date"]["array"],
+            left_by,
+            right_by,
+            None if tolerance is None else int(tolerance * 1e9),
+            direction
+        )
+    
+    hit = matched >= 0
+    take = np.clip(matched, 0, None)
+    for field, name in CAR_DATA_FIELDS.items():
+        if not car_data or field not in car_data:
+            merged[name] = np.full(len(location), np.nan)
+            continue
+        source = car_data[field]["array"]
+        if hit.all():
+            merged[name] = source[take]
+        else:
+            merged[name] = np.where(hit, source[take] if len(source) else np.nan, np.nan)
+    return merged
+
+
+def integrate_distance(time: np.ndarray, speed: np.ndarray) -> np.ndarray:
+    """
+    Integrate speed over time into distance travelled.
+    
+    :param time: int64 nanosecond timestamps, sorted
+    :param speed: Speed in km/h (NaN treated as 0)
+    :returns: Distance in metres at each sample, starting at 0
+    """
+    if not len(time):
+        return np.empty(0)
+    seconds = relative_seconds(time, int(time[0]))
+    metres_per_second = np.nan_to_num(np.asarray(speed, dtype=np.float64)) / 3.6
+    steps = np.diff(seconds) * (metres_per_second[1:] + metres_per_second[:-1]) / 2
+    return np.concatenate(([0.0], np.cumsum(np.nan_to_num(steps))))
+
+
+def _json_values(values: np.ndarray) -> List[Any]:
+    """
+    Convert an array to a JSON-ready list, NaN becoming None.
+    
+    :param values: Numeric array
+    :returns: List of Python numbers
+    """
+    if np.issubdtype(values.dtype, np.floating):
+        return [None if v != v else v for v in values.tolist()]
+    return values.tolist()
+
+
+def to_tel_dict(
+    merged: Dict[str, np.ndarray],
+    data_key: Optional[str] = None,
+    origin: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Convert one driver's merged columns to the {"tel": {...}} layout of the *_tel.json files.
+    
+    :param merged: Columns from join_car_data for a single driver
+    :param data_key: Optional 'dataKey' label (e.g. '2025-Monaco Grand Prix-Race-PIA-10')
+    :param origin: Time origin in ns for the 'time' array (defaults to the first sample)
+    :returns: Dictionary with a 'tel' key holding time (s), car channels, distance and x, y, z
+    """
+    order = np.argsort(merged["time"], kind="stable")
+    time = merged["time"][order]
+    if origin is None and len(time):
+        origin = int(time[0])
+    
+    distance = integrate_distance(time, merged["speed"][order])
+    total = distance[-1] if len(distance) else 0.0
+    tel = {"time": _json_values(relative_seconds(time, origin))}
+    for name in CAR_DATA_FIELDS.values():
+        tel[name] = _json_values(merged[name][order])
+    tel["distance"] = distance.tolist()
+    tel["rel_distance"] = (distance / total if total > 0 else np.zeros_like(distance)).tolist()
+    for name in ("x", "y", "z"):
+        tel[name] = _json_values(merged[name][order])
+    if data_key is not None:
+        tel["dataKey"] = data_key
+    return {"tel": tel}
+
+
+def write_tel_json(
+    path: Path,
+    merged: Dict[str, np.ndarray],
+    data_key: Optional[str] = None
+) -> Path:
+    """
+    Write one driver's merged columns as a *_tel.json file.
+    
+    :param path: Output file
+    :param merged: Columns from join_car_data for a single driver
+    :param data_key: Optional 'dataKey' label
+    :returns: The written path
+    """
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_tel_dict(merged, data_key=data_key), f, separators=(",", ":"))
+    return path
+
+
+def split_by_driver(merged: Dict[str, np.ndarray]) -> Dict[int, Dict[str, np.ndarray]]:
+    """
+    Split merged columns for several drivers into one set of columns per driver.
+    
+    :param merged: Columns from join_car_data
+    :returns: Dictionary mapping driver number to its columns, each sorted by time
+    """
+    order = np.lexsort((merged["time"], merged["driver_number"]))
+    drivers = merged["driver_number"][order]
+    result = {}
+    for driver in np.unique(drivers).tolist():
+        lo, hi = np.searchsorted(drivers, driver, side="left"), np.searchsorted(drivers, driver, side="right")
+        rows = order[lo:hi]
+        result[driver] = {name: values[rows] for name, values in merged.items()}
+    return result
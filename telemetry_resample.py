@@ -0,0 +1,208 @@
+"""
+Uniform-rate resampling of telemetry.
+
+OpenF1 samples arrive at irregular intervals (1 ms to several hundred ms
+apart) and sometimes with duplicate timestamps. The functions here put
+one or many drivers onto a shared fixed-rate time grid in a single
+batched pass: continuous channels (position, speed, throttle, ...) are
+linearly interpolated and discrete ones (gear, DRS, brake) hold their
+last value.
+"""
+from typing import Optional, Dict, Any, Iterable
+
+import numpy as np
+
+from telemetry_cache import NAT, relative_seconds
+
+
+# Channels that change in steps and must not be interpolated
+STEP_CHANNELS = frozenset({"gear", "n_gear", "drs", "brake", "driver_number", "session_key", "meeting_key"})
+
+
+def dedupe_timestamps(time: np.ndarray, by: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Get the row order that sorts samples by (group, time) and drops repeated timestamps.
+    
+    When several samples share a timestamp the last one is kept. Rows with a
+    missing (NaN) time are dropped.
+    
+    :param time: Sample times in seconds
+    :param by: Optional group key per sample (e.g. driver number)
+    :returns: int64 row indices into the inputs
+    """
+    time = np.asarray(time, dtype=np.float64)
+    if by is None:
+        by = np.zeros(len(time), dtype=np.int64)
+    rows = np.flatnonzero(~np.isnan(time))
+    rows = rows[np.lexsort((time[rows], by[rows]))]
+    if len(rows) < 2:
+        return rows
+    sorted_time = time[rows]
+    sorted_by = by[rows]
+    keep = np.ones(len(rows), dtype=bool)
+    keep[:-1] = (sorted_time[1:] != sorted_time[:-1]) | (sorted_by[1:] != sorted_by[:-1])
+    return rows[keep]
+
+
+def resample_grouped(
+    time: np.ndarray,
+    channels: Dict[str, np.ndarray],
+    by: Optional[np.ndarray] = None,
+    rate: float = 60.0,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    step_channels: Iterable[str] = STEP_CHANNELS
+) -> Dict[str, Any]:
+    """
+    Resample several groups (e.g. drivers) onto one fixed-rate grid in a single pass.
+    
+    Groups are laid end to end on a shifted time axis so every channel needs
+    one np.interp (or one searchsorted for step channels) regardless of how
+    many groups there are. Grid points outside a group's first/last sample
+    are NaN and flagged in 'valid'.
+    
+    :param time: Sample times in seconds, any order
+    :param channels: Mapping of channel name to per-sample values
+    :param by: Group key per sample (None = a single group)
+    :param rate: Output rate in Hz
+    :param start: First grid time (defaults to the earliest sample)
+    :param end: Last grid time (defaults to the latest sample)
+    :param step_channels: Channels resampled by holding the previous value
+    :returns: Dictionary with 'time' (n_frames,), 'groups' (n_groups,), 'valid' (n_groups, n_frames)
+              and each channel as a float64 (n_groups, n_frames) array
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    time = np.asarray(time, dtype=np.float64)
+    if by is None:
+        by = np.zeros(len(time), dtype=np.int64)
+    by = np.asarray(by)
+    
+    rows = dedupe_timestamps(time, by)
+    sample_time = time[rows]
+    sample_by = by[rows]
+    groups, group_index = np.unique(sample_by, return_inverse=True)
+    
+    if not len(rows):
+        grid = np.empty(0)
+    else:
+        first = sample_time.min() if start is None else start
+        last = sample_time.max() if end is None else end
+        grid = first + np.arange(int(np.floor((last - first) * rate + 1e-9)) + 1) / rate
+    
+    result = {
+        "time": grid,
+        "groups": groups,
+        "valid": np.zeros((len(groups), len(grid)), dtype=bool),
+    }
+    if not len(groups) or not len(grid):
+        for name in channels:
+            result[name] = np.full((len(groups), len(grid)), np.nan)
+        return result
+    
+    # Shift every group onto its own stretch of the time axis
+    low = min(grid[0], sample_time.min())
+    stride = max(grid[-1], sample_time.max()) - low + 1.0
+    shifted_time = sample_time - low + group_index * stride
+    offsets = np.arange(len(groups))[:, None] * stride
+    shifted_grid = (grid - low)[None, :] + offsets
+    
+    bounds = np.searchsorted(group_index, np.arange(len(groups) + 1))
+    group_first = shifted_time[bounds[:-1]]
+    group_last = shifted_time[bounds[1:] - 1]
+    valid = (shifted_grid >= group_first[:, None]) & (shifted_grid <= group_last[:, None])
+    result["valid"] = valid
+    
+    flat_grid = shifted_grid.ravel()
+    step_index = None
+    step_channels = set(step_channels)
+    for name, values in channels.items():
+        values = np.asarray(values, dtype=np.float64)[rows]
+        if name in step_channels:
+            if step_index is None:
+                step_index = np.clip(np.searchsorted(shifted_time, flat_grid, side="right") - 1, 0, None)
+            resampled = values[step_index]
+        else:
+            resampled = np.interp(flat_grid, shifted_time, values)
+        resampled = resampled.reshape(valid.shape)
+        resampled[~valid] = np.nan
+        result[name] = resampled
+    return result
+
+
+def resample_series(
+    time: np.ndarray,
+    channels: Dict[str, np.ndarray],
+    rate: float = 60.0,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    step_channels: Iterable[str] = STEP_CHANNELS
+) -> Dict[str, np.ndarray]:
+    """
+    Resample a single driver's channels onto a fixed-rate grid.
+    
+    :param time: Sample times in seconds, any order
+    :param channels: Mapping of channel name to per-sample values
+    :param rate: Output rate in Hz
+    :param start: First grid time (defaults to the earliest sample)
+    :param end: Last grid time (defaults to the latest sample)
+    :param step_channels: Channels resampled by holding the previous value
+    :returns: Dictionary with 'time' and each channel as 1-D float64 arrays
+    """
+    grouped = resample_grouped(
+        time, channels, rate=rate, start=start, end=end, step_channels=step_channels
+    )
+    result = {"time": grouped["time"]}
+    for name in channels:
+        values = grouped[name]
+        result[name] = values[0] if len(values) else np.full(len(grouped["time"]), np.nan)
+    return result
+
+
+def resample_tel(tel: Dict[str, Any], rate: float = 60.0) -> Dict[str, np.ndarray]:
+    """
+    Resample the 'tel' section of a *_tel.json file.
+    
+    :param tel: Dictionary with a 'time' list in seconds and per-sample channel lists
+    :param rate: Output rate in Hz
+    :returns: Dictionary with 'time' and every numeric channel at the new rate
+    """
+    time = np.asarray(tel["time"], dtype=np.float64)
+    channels = {
+        name: np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        for name, values in tel.items()
+        if name != "time" and isinstance(values, list) and len(values) == len(time)
+    }
+    return resample_series(time, channels, rate=rate)
+
+
+def resample_merged(
+    merged: Dict[str, np.ndarray],
+    rate: float = 60.0,
+    origin: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Resample merged or location columns for every driver onto one shared grid.
+    
+    :param merged: Columns with int64 ns 'time' and 'driver_number' (e.g. from join_car_data)
+    :param rate: Output rate in Hz
+    :param origin: Time origin in ns (defaults to the earliest sample)
+    :returns: As resample_grouped, with 'groups' holding driver numbers, 'time' in seconds
+              from the origin and 'origin' in ns
+    """
+    timestamps = np.asarray(merged["time"], dtype=np.int64)
+    present = timestamps != NAT
+    if origin is None:
+        origin = int(timestamps[present].min()) if present.any() else 0
+    channels = {
+        name: values for name, values in merged.items()
+        if name not in ("time", "driver_number")
+    }
+    result = resample_grouped(
+        relative_seconds(timestamps, origin),
+        channels,
+        by=np.asarray(merged["driver_number"], dtype=np.int64),
+        rate=rate
+    )
+    result["origin"] = origin
+    return result
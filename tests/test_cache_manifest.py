@@ -0,0 +1,43 @@
+"""
+Tests for the SQLite cache manifest.
+"""
+import sqlite3
+
+from cache_manifest import CacheManifest, manifest_key
+
+PARAMS = {"driver_number": 1, "session_key": 9}
+
+
+def stored_access_count(db_path) -> int:
+    with sqlite3.connect(str(db_path)) as conn:
+        return conn.execute(
+            "SELECT access_count FROM entries WHERE key = ?", (manifest_key("location", PARAMS),)
+        ).fetchone()[0]
+
+
+def test_touches_are_buffered_until_flush(tmp_path):
+    db_path = tmp_path / "manifest.sqlite"
+    manifest = CacheManifest(db_path, touch_batch_size=1000, touch_flush_interval=3600)
+    manifest.record("location", PARAMS, tmp_path / "location.json", 10, 1)
+    
+    for _ in range(50):
+        manifest.touch("location", PARAMS)
+    assert stored_access_count(db_path) == 0
+    assert manifest.get("location", PARAMS)["access_count"] == 50
+    
+    manifest.flush()
+    assert stored_access_count(db_path) == 50
+    
+    manifest.touch("location", PARAMS)
+    manifest.close()
+    assert stored_access_count(db_path) == 51
+
+
+def test_full_touch_buffer_is_flushed(tmp_path):
+    db_path = tmp_path / "manifest.sqlite"
+    manifest = CacheManifest(db_path, touch_batch_size=1, touch_flush_interval=3600)
+    manifest.record("location", PARAMS, tmp_path / "location.json", 10, 1)
+    
+    manifest.touch("location", PARAMS)
+    assert stored_access_count(db_path) == 1
+    manifest.close()
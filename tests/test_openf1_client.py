@@ -0,0 +1,184 @@
+"""
+Tests for OpenF1Client against a mock OpenF1 API and a temporary cache directory.
+
+The mock decodes the query string the way the API does, so the comparison
+operators in parameter names are checked as they reach the server.
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import unquote
+
+import httpx
+import numpy as np
+import pytest
+
+from http_client_impl import HttpxClient
+from mesh_lod import load_mesh_lods
+from openf1_client import OpenF1Client
+from telemetry_cache import parse_iso_timestamps
+from track_centerline import load_centerline
+
+START = datetime(2023, 9, 17, 12, 0, tzinfo=timezone.utc)
+_FILTER = re.compile(r"^([a-z_]+)(>=|<=|>|<|=)(.*)$")
+
+
+class MockOpenF1:
+    """
+    Location endpoint serving one sample per second, filtered like the API.
+    """
+    
+    def __init__(self, seconds: int = 60):
+        self.dates = [START + timedelta(seconds=i) for i in range(seconds)]
+        self.queries = []
+    
+    def add_samples(self, count: int) -> None:
+        last = self.dates[-1]
+        self.dates += [last + timedelta(seconds=i + 1) for i in range(count)]
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        query = request.url.query.decode("ascii")
+        self.queries.append(query)
+        filters = [_FILTER.match(unquote(part)).groups() for part in query.split("&") if part]
+        rows = []
+        for i, date in enumerate(self.dates):
+            keep = True
+            for name, op, value in filters:
+                if name != "date":
+                    continue
+                bound = parse_iso_timestamps([value])[0]
+                stamp = parse_iso_timestamps([date.isoformat()])[0]
+                keep &= {">=": stamp >= bound, "<=": stamp <= bound, ">": stamp > bound,
+                         "<": stamp < bound, "=": stamp == bound}[op]
+            if keep:
+                rows.append({"date": date.isoformat(), "x": float(i), "y": 0.0, "z": 0.0,
+                             "driver_number": 1, "session_key": 9})
+        return httpx.Response(200, json=rows)
+
+
+def make_client(api: MockOpenF1, cache_dir) -> OpenF1Client:
+    http = HttpxClient(rate_limit=None)
+    http._create_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    return OpenF1Client(http, cache_dir=str(cache_dir))
+
+
+def test_windowed_download_encodes_bounds_and_has_no_duplicates(tmp_path):
+    api = MockOpenF1(seconds=60)
+    client = make_client(api, tmp_path)
+    
+    records = asyncio.run(client.get_location_data(
+        driver_number=1,
+        date_start=START.isoformat(),
+        date_end=(START + timedelta(seconds=60)).isoformat(),
+        windows=4
+    ))
+    
+    assert len(api.queries) == 4
+    for query in api.queries:
+        assert "date%3E=" in query and "date%3C=" in query
+        assert "date%3E%3D" not in query
+    dates = [record["date"] for record in records]
+    assert len(dates) == 60
+    assert len(set(dates)) == 60
+    assert dates == sorted(dates)
+
+
+def test_refresh_appends_only_new_samples(tmp_path):
+    api = MockOpenF1(seconds=30)
+    client = make_client(api, tmp_path)
+    
+    async def poll():
+        return await client.get_location_data(driver_number=1, session_key=9, refresh=True)
+    
+    first = asyncio.run(client.get_location_data(driver_number=1, session_key=9))
+    assert len(first) == 30
+    assert len(asyncio.run(poll())) == 30
+    assert len(asyncio.run(poll())) == 30
+    
+    api.add_samples(5)
+    dates = [record["date"] for record in asyncio.run(poll())]
+    assert len(dates) == 35
+    assert len(set(dates)) == 35
+    assert dates == sorted(dates)
+
+
+def test_memoized_results_are_private_and_byte_bounded(tmp_path):
+    api = MockOpenF1(seconds=30)
+    client = make_client(api, tmp_path)
+    
+    async def scenario():
+        records = await client.get_location_data(driver_number=1, session_key=9)
+        records[0]["x"] = -1.0
+        records.clear()
+        again = await client.get_location_data(driver_number=1, session_key=9)
+        assert len(again) == 30 and again[0]["x"] == 0.0
+        
+        columns = await client._fetch_columns("location", {"driver_number": 1, "session_key": 9})
+        with pytest.raises(ValueError):
+            columns["x"]["array"][0] = -1.0
+        
+        client.memory_cache_max_bytes = client.get_cache_stats()["memory_bytes"]
+        await client.get_location_data(driver_number=1, session_key=10)
+        stats = client.get_cache_stats()
+        assert stats["memory_bytes"] <= client.memory_cache_max_bytes
+        assert stats["memory_hits"] >= 1
+    
+    asyncio.run(scenario())
+
+
+class JsonOnlyClient:
+    """
+    HTTP client without get_columns, so every endpoint takes the JSON path.
+    """
+    
+    def __init__(self, http: HttpxClient):
+        self.http = http
+    
+    async def get(self, url, params=None):
+        return await self.http.get(url, params)
+
+
+def test_fresh_and_cached_records_match(tmp_path):
+    api = MockOpenF1(seconds=10)
+    http = make_client(api, tmp_path).http_client
+    params = {"driver_number": 1, "session_key": 9}
+    
+    fresh = asyncio.run(OpenF1Client(JsonOnlyClient(http), cache_dir=str(tmp_path))._fetch("location", params))
+    cached = asyncio.run(OpenF1Client(JsonOnlyClient(http), cache_dir=str(tmp_path))._fetch("location", params))
+    
+    assert len(api.queries) == 1
+    assert fresh == cached
+
+
+def test_cached_meshes_count_toward_the_budget(tmp_path):
+    trimesh = pytest.importorskip("trimesh")
+    model = tmp_path / "box.stl"
+    trimesh.creation.box().export(str(model))
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    load_mesh_lods(model, cache_dir=cache_dir / OpenF1Client.MESH_CACHE_SUBDIR)
+    
+    client = OpenF1Client(None, cache_dir=str(cache_dir), cache_max_bytes=1 << 30)
+    entries = client.list_cached()
+    assert len(entries) == 1 and entries[0]["size_bytes"] > 0
+    
+    client.cache_max_bytes = 0
+    assert client.enforce_cache_budget() == 1
+    assert not any((cache_dir / OpenF1Client.MESH_CACHE_SUBDIR).iterdir())
+
+
+def test_cached_centerlines_count_toward_the_budget(tmp_path):
+    angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    lap = np.column_stack((np.cos(angles) * 1000, np.sin(angles) * 600, np.zeros_like(angles)))
+    cache_dir = tmp_path / "cache"
+    centerline_dir = cache_dir / OpenF1Client.CENTERLINE_CACHE_SUBDIR
+    load_centerline("Test Circuit", positions=lap, cache_dir=centerline_dir)
+    
+    client = OpenF1Client(None, cache_dir=str(cache_dir), cache_max_bytes=1 << 30)
+    entries = client.list_cached()
+    assert [Path(entry["path"]).parent for entry in entries] == [centerline_dir]
+    
+    client.cache_max_bytes = 0
+    assert client.enforce_cache_budget() == 1
+    assert not any(centerline_dir.iterdir())
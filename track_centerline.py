@@ -0,0 +1,418 @@
+"""
+Closed track centerlines with arc-length parametrization.
+
+A circuit's centerline is a periodic cubic B-spline fitted to evenly
+spaced control points taken either from a clean reference lap or from the
+track mesh. An arc-length lookup table built once at construction maps a
+distance along the track to a spline parameter with one np.interp, so the
+position and tangent of any number of cars at any track distance are a
+few vectorized array operations. Centerlines are cached per circuit as
+.npz files.
+"""
+from typing import Optional, Tuple, Union
+from pathlib import Path
+import itertools
+import os
+import re
+from collections import deque
+
+import numpy as np
+
+
+# Resolved against this module, not the working directory; OpenF1Client uses its own cache_dir
+CENTERLINE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "centerlines"
+
+# Segment offsets of the four control points that shape each B-spline segment
+_SEGMENT_OFFSETS = np.arange(-1, 3)
+
+
+def _bspline_weights(t: np.ndarray) -> np.ndarray:
+    """
+    Uniform cubic B-spline basis weights.
+    
+    :param t: Position within each segment in [0, 1)
+    :returns: (N, 4) weights for the control points at offsets -1, 0, 1, 2
+    """
+    t2 = t * t
+    t3 = t2 * t
+    return np.stack((
+        (1 - t) ** 3,
+        3 * t3 - 6 * t2 + 4,
+        -3 * t3 + 3 * t2 + 3 * t + 1,
+        t3,
+    ), axis=1) / 6.0
+
+
+def _bspline_derivative_weights(t: np.ndarray) -> np.ndarray:
+    """
+    Derivatives of the uniform cubic B-spline basis weights.
+    
+    :param t: Position within each segment in [0, 1)
+    :returns: (N, 4) weights for the control points at offsets -1, 0, 1, 2
+    """
+    t2 = t * t
+    return np.stack((
+        -3 * (1 - t) ** 2,
+        9 * t2 - 12 * t,
+        -9 * t2 + 6 * t + 3,
+        3 * t2,
+    ), axis=1) / 6.0
+
+
+class Centerline:
+    """
+    Closed spline through a circuit, evaluated by distance along the track.
+    
+    Distances wrap around, so lap distances and running race distances can
+    be passed directly.
+    """
+    
+    def __init__(self, control_points: np.ndarray, samples_per_segment: int = 16):
+        """
+        Fit the spline and build its arc-length lookup table.
+        
+        :param control_points: (M, D) control points around the loop (D = 2 or 3), M >= 4
+        :param samples_per_segment: Lookup table resolution per spline segment
+        """
+        self.control_points = np.ascontiguousarray(control_points, dtype=np.float64)
+        if self.control_points.ndim != 2 or len(self.control_points) < 4:
+            raise ValueError("A centerline needs at least 4 control points")
+        self.samples_per_segment = int(samples_per_segment)
+        
+        segments = len(self.control_points)
+        self.lut_parameter = np.arange(segments * self.samples_per_segment + 1) / self.samples_per_segment
+        points = self._evaluate(self.lut_parameter, _bspline_weights)
+        steps = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        self.lut_distance = np.concatenate(([0.0], np.cumsum(steps)))
+        self.length = float(self.lut_distance[-1])
+    
+    def __len__(self) -> int:
+        return len(self.control_points)
+    
+    def __repr__(self) -> str:
+        return f"Centerline(length={self.length:.1f}, control_points={len(self)})"
+    
+    def _evaluate(self, parameter: np.ndarray, basis) -> np.ndarray:
+        """
+        Evaluate the spline (or its derivative) at spline parameters.
+        
+        :param parameter: 1-D parameters, one unit per segment (wrapped to the loop)
+        :param basis: _bspline_weights or _bspline_derivative_weights
+        :returns: (N, D) values
+        """
+        segments = len(self.control_points)
+        parameter = np.mod(parameter, segments)
+        segment = np.minimum(np.floor(parameter).astype(np.int64), segments - 1)
+        weights = basis(parameter - segment)
+        indices = (segment[:, None] + _SEGMENT_OFFSETS) % segments
+        return np.einsum("nk,nkd->nd", weights, self.control_points[indices])
+    
+    def parameter(self, distance: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Map track distances to spline parameters.
+        
+        :param distance: Distance(s) along the track, any shape (wrapped to one lap)
+        :returns: Spline parameters with the same shape
+        """
+        distance = np.mod(np.asarray(distance, dtype=np.float64), self.length)
+        return np.interp(distance, self.lut_distance, self.lut_parameter)
+    
+    def position(self, distance: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Get points on the centerline.
+        
+        :param distance: Distance(s) along the track, any shape
+        :returns: Array of shape distance.shape + (D,)
+        """
+        distance = np.asarray(distance, dtype=np.float64)
+        values = self._evaluate(self.parameter(distance).ravel(), _bspline_weights)
+        return values.reshape(distance.shape + (self.control_points.shape[1],))
+    
+    def tangent(self, distance: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Get unit directions of travel along the centerline.
+        
+        :param distance: Distance(s) along the track, any shape
+        :returns: Array of shape distance.shape + (D,)
+        """
+        distance = np.asarray(distance, dtype=np.float64)
+        values = self._evaluate(self.parameter(distance).ravel(), _bspline_derivative_weights)
+        values /= np.maximum(np.linalg.norm(values, axis=1, keepdims=True), 1e-12)
+        return values.reshape(distance.shape + (self.control_points.shape[1],))
+    
+    def evaluate(self, distance: Union[float, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get positions and unit tangents together.
+        
+        :param distance: Distance(s) along the track, any shape
+        :returns: (positions, tangents), each of shape distance.shape + (D,)
+        """
+        return self.position(distance), self.tangent(distance)
+    
+    def sample(self, spacing: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sample the whole loop at a fixed spacing, e.g. for drawing.
+        
+        :param spacing: Distance between samples
+        :returns: (distances, positions) with the first point repeated at the end
+        """
+        count = max(4, int(np.ceil(self.length / spacing)))
+        distances = np.linspace(0.0, self.length, count + 1)
+        points = self.position(distances[:-1])
+        return distances, np.vstack((points, points[:1]))
+    
+    def save(self, path: Path) -> Path:
+        """
+        Write the centerline to an .npz file, replacing it atomically.
+        
+        :param path: Output file
+        :returns: The written path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_name(f"{path.name}.tmp{os.getpid()}")
+        with open(tmp_file, "wb") as f:
+            np.savez(f, control_points=self.control_points, samples_per_segment=self.samples_per_segment)
+        os.replace(tmp_file, path)
+        return path
+    
+    @classmethod
+    def load(cls, path: Path) -> "Centerline":
+        """
+        Read a centerline written by save().
+        
+        :param path: .npz file
+        :returns: Centerline
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["control_points"], int(data["samples_per_segment"]))
+
+
+def resample_closed(points: np.ndarray, spacing: float) -> np.ndarray:
+    """
+    Resample a closed polyline to evenly spaced points.
+    
+    :param points: (N, D) points in loop order (the closing segment is implied)
+    :param spacing: Target distance between output points
+    :returns: (M, D) points, M >= 4
+    """
+    loop = np.vstack((points, points[:1]))
+    distance = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(loop, axis=0), axis=1))))
+    count = max(4, int(round(distance[-1] / spacing)))
+    targets = np.arange(count) * (distance[-1] / count)
+    return np.column_stack([np.interp(targets, distance, loop[:, axis]) for axis in range(loop.shape[1])])
+
+
+def smooth_closed(points: np.ndarray, window: int) -> np.ndarray:
+    """
+    Circular moving average of a closed polyline.
+    
+    :param points: (N, D) points in loop order
+    :param window: Window in points (odd; 1 = no smoothing)
+    :returns: (N, D) smoothed points
+    """
+    half = window // 2
+    if half < 1 or len(points) <= window:
+        return points
+    padded = np.concatenate((points[-half:], points, points[:half]))
+    summed = np.cumsum(np.concatenate((np.zeros((1, points.shape[1])), padded)), axis=0)
+    return (summed[2 * half + 1:] - summed[:len(points)]) / (2 * half + 1)
+
+
+def centerline_from_lap(
+    positions: np.ndarray,
+    spacing: float = 50.0,
+    smoothing: int = 3,
+    samples_per_segment: int = 16
+) -> Centerline:
+    """
+    Fit a centerline to one clean lap of position samples.
+    
+    :param positions: (N, D) positions covering a single lap in driving order
+    :param spacing: Control point spacing in position units (OpenF1 units are ~0.1 m)
+    :param smoothing: Moving-average window over the control points
+    :param samples_per_segment: Lookup table resolution per spline segment
+    :returns: Centerline starting at the lap's first sample
+    """
+    points = np.asarray(positions, dtype=np.float64)
+    points = points[~np.isnan(points).any(axis=1)]
+    if len(points) > 1:
+        moving = np.concatenate(([True], np.any(np.diff(points, axis=0) != 0, axis=1)))
+        points = points[moving]
+    if len(points) < 4:
+        raise ValueError("A reference lap needs at least 4 distinct positions")
+    control = smooth_closed(resample_closed(points, spacing), smoothing)
+    return Centerline(control, samples_per_segment)
+
+
+def _trace_ribbon(cells: np.ndarray, cut: int = 3) -> np.ndarray:
+    """
+    Number the cells of a closed ribbon of grid cells in order around the loop.
+    
+    Cells within ``cut`` steps of a start cell are removed, which opens the
+    loop into a strip; a breadth-first search from one end of the strip then
+    gives every cell its step count along the track. Cells not connected to
+    the start cell (stray geometry) are left out.
+    
+    :param cells: (N, D) integer grid cells
+    :param cut: Size of the gap opened in the loop, in cells
+    :returns: int64 step count per cell, -1 for cells left out
+    """
+    index = {cell: i for i, cell in enumerate(map(tuple, cells.tolist()))}
+    offsets = [offset for offset in itertools.product((-1, 0, 1), repeat=cells.shape[1]) if any(offset)]
+    neighbours = []
+    for cell in cells.tolist():
+        adjacent = (tuple(c + o for c, o in zip(cell, offset)) for offset in offsets)
+        neighbours.append([index[key] for key in adjacent if key in index])
+    
+    def steps_from(start, blocked):
+        steps = np.full(len(cells), -1, dtype=np.int64)
+        steps[start] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for neighbour in neighbours[cell]:
+                if steps[neighbour] < 0 and not blocked[neighbour]:
+                    steps[neighbour] = steps[cell] + 1
+                    queue.append(neighbour)
+        return steps
+    
+    around_start = steps_from(int(np.argmin(cells[:, 0])), np.zeros(len(cells), dtype=bool))
+    gap = (around_start >= 0) & (around_start <= cut)
+    strip_end = np.flatnonzero(around_start == cut + 1)
+    if not len(strip_end):
+        return np.full(len(cells), -1, dtype=np.int64)
+    return steps_from(int(strip_end[0]), gap)
+
+
+def sample_surface(vertices: np.ndarray, faces: np.ndarray, spacing: float, seed: int = 0) -> np.ndarray:
+    """
+    Scatter points over a mesh's triangles at roughly uniform density.
+    
+    Long thin triangles (typical of track models on straights) have few
+    vertices, so the surface is sampled instead of using vertices directly.
+    
+    :param vertices: (V, 3) mesh vertices
+    :param faces: (F, 3) triangle vertex indices
+    :param spacing: Approximate distance between points
+    :param seed: Random seed, so the same mesh always gives the same points
+    :returns: (P, 3) points, at least one per triangle
+    """
+    triangles = np.asarray(vertices, dtype=np.float64)[np.asarray(faces, dtype=np.int64)]
+    areas = 0.5 * np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1)
+    counts = np.maximum(1, np.ceil(areas / (spacing * spacing)).astype(np.int64))
+    owner = np.repeat(np.arange(len(triangles)), counts)
+    u, v = np.random.default_rng(seed).random((2, len(owner)))
+    flip = u + v > 1
+    u[flip], v[flip] = 1 - u[flip], 1 - v[flip]
+    corners = triangles[owner]
+    return corners[:, 0] + u[:, None] * (corners[:, 1] - corners[:, 0]) + v[:, None] * (corners[:, 2] - corners[:, 0])
+
+
+def centerline_from_mesh(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    spacing: Optional[float] = None,
+    up_axis: Optional[int] = None,
+    smoothing: int = 5,
+    samples_per_segment: int = 16
+) -> Centerline:
+    """
+    Derive a centerline from a track mesh.
+    
+    Points sampled over the driving surface are binned into square cells on
+    the ground plane, the cells are traced around the loop, and the points
+    at each step along it are averaged, which puts them in the middle of the
+    road. The spacing should be below the gap between neighbouring parts of
+    the circuit. The direction of travel is arbitrary; pit lanes and other
+    branches pull the line towards them where they run alongside.
+    
+    :param vertices: (V, 3) mesh vertices
+    :param faces: (F, 3) triangle vertex indices
+    :param spacing: Cell size and control point spacing in mesh units (None = 0.5% of the ground diagonal)
+    :param up_axis: Index of the vertical axis (None = the axis with the smallest extent)
+    :param smoothing: Moving-average window over the control points
+    :param samples_per_segment: Lookup table resolution per spline segment
+    :returns: Centerline in mesh coordinates
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    extent = np.ptp(vertices, axis=0)
+    if up_axis is None:
+        up_axis = int(np.argmin(extent))
+    plane = [axis for axis in range(3) if axis != up_axis]
+    if spacing is None:
+        spacing = float(np.linalg.norm(extent[plane])) / 200.0
+    
+    # Only the driving surface: drop walls, undersides and other steep faces
+    triangles = vertices[faces]
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    upward = normals[:, up_axis] > 0.7 * np.linalg.norm(normals, axis=1)
+    if upward.any():
+        faces = faces[upward]
+    
+    # Finer vertical cells keep roads that cross over each other (bridges, tunnels) apart
+    points = sample_surface(vertices, faces, spacing / 4.0)
+    cells = np.floor(np.column_stack((points[:, plane] / spacing, points[:, up_axis] / (spacing / 4.0))))
+    cells, cell_index = np.unique(cells.astype(np.int64), axis=0, return_inverse=True)
+    
+    # Average the points at each step along the loop, which centres them across the road
+    steps = _trace_ribbon(cells)[cell_index.ravel()]
+    keep = steps >= 0
+    if steps.max() < 4:
+        raise ValueError("Could not trace a loop through the track mesh")
+    step = steps[keep]
+    totals = np.bincount(step)
+    present = totals > 0
+    ordered = np.column_stack([
+        np.bincount(step, weights=points[keep, axis])[present] / totals[present] for axis in range(3)
+    ])
+    control = smooth_closed(resample_closed(ordered, spacing), smoothing)
+    return Centerline(control, samples_per_segment)
+
+
+def _circuit_filename(circuit: str) -> str:
+    """
+    Turn a circuit name into a cache file name.
+    
+    :param circuit: Circuit name (e.g. 'Monte Carlo')
+    :returns: File name such as 'monte_carlo.npz'
+    """
+    return re.sub(r"[^a-z0-9]+", "_", circuit.lower()).strip("_") + ".npz"
+
+
+def load_centerline(
+    circuit: str,
+    positions: Optional[np.ndarray] = None,
+    mesh_path: Optional[Path] = None,
+    spacing: Optional[float] = None,
+    cache_dir: Path = CENTERLINE_CACHE_DIR,
+    rebuild: bool = False
+) -> Centerline:
+    """
+    Get a circuit's centerline from the cache, building and caching it if needed.
+    
+    :param circuit: Circuit name used as the cache key
+    :param positions: Reference lap positions to build from on a cache miss
+    :param mesh_path: Track STL/OBJ to build from when no positions are given
+    :param spacing: Control point spacing (None = the builder's default)
+    :param cache_dir: Directory holding cached centerlines
+    :param rebuild: If True, ignore any cached centerline
+    :returns: Centerline
+    """
+    path = Path(cache_dir) / _circuit_filename(circuit)
+    if not rebuild and path.exists():
+        return Centerline.load(path)
+    
+    options = {} if spacing is None else {"spacing": spacing}
+    if positions is not None:
+        centerline = centerline_from_lap(positions, **options)
+    elif mesh_path is not None:
+        from mesh_lod import load_mesh_lods
+        vertices, faces = load_mesh_lods(Path(mesh_path)).level()
+        centerline = centerline_from_mesh(vertices, faces, **options)
+    else:
+        raise FileNotFoundError(f"No cached centerline for {circuit}; pass a reference lap or track mesh")
+    
+    centerline.save(path)
+    return centerline
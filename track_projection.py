@@ -0,0 +1,276 @@
+"""
+Projection of raw positions onto a track centerline.
+
+CenterlineIndex splits a Centerline into short straight segments and
+buckets them in a uniform grid, so finding the nearest segment for a
+whole array of samples only compares each sample against the segments
+in its own 3x3 neighbourhood of cells instead of the full lap. Results
+are track distance, signed lateral offset and segment index per sample.
+
+For time-ordered samples there is a continuity-aware mode: short runs of
+hits that jump along the track (e.g. where two parts of the circuit pass
+close to each other) are searched again, only near the track distance
+expected from the surrounding samples.
+"""
+from typing import Optional, Dict, Sequence
+
+import numpy as np
+
+from track_centerline import Centerline
+from telemetry_frame import TelemetryFrame
+
+# Samples per chunk when building candidate matrices, to bound memory use
+_CHUNK = 16384
+
+
+class CenterlineIndex:
+    """
+    Uniform-grid spatial index over a centerline's segments.
+    """
+    
+    def __init__(
+        self,
+        centerline: Centerline,
+        spacing: float = 20.0,
+        cell_size: Optional[float] = None,
+        axes: Sequence[int] = (0, 1)
+    ):
+        """
+        Sample the centerline into segments and bucket them in a grid.
+        
+        :param centerline: Track centerline
+        :param spacing: Segment length in position units (the spline is close to straight at this scale)
+        :param cell_size: Grid cell size (None = 5x the segment length)
+        :param axes: Position axes of the ground plane (OpenF1 x, y)
+        """
+        self.centerline = centerline
+        self.axes = list(axes)
+        self.segment_distance, points = centerline.sample(spacing)
+        points = points[:, self.axes]
+        self.starts = points[:-1]
+        self.vectors = np.diff(points, axis=0)
+        self.lengths_squared = np.maximum(np.einsum("ij,ij->i", self.vectors, self.vectors), 1e-12)
+        self.cell_size = float(cell_size if cell_size is not None else 5.0 * spacing)
+        self._build_grid()
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def _build_grid(self) -> None:
+        """
+        Build, for every grid cell, the padded list of segments touching it or its 8 neighbours.
+        """
+        low = np.minimum(self.starts, self.starts + self.vectors)
+        high = np.maximum(self.starts, self.starts + self.vectors)
+        # One empty cell of margin so every sample near the track has a full neighbourhood
+        self.origin = low.min(axis=0) - self.cell_size
+        self.shape = np.floor((high.max(axis=0) - self.origin) / self.cell_size).astype(np.int64) + 2
+        
+        first = np.floor((low - self.origin) / self.cell_size).astype(np.int64)
+        last = np.floor((high - self.origin) / self.cell_size).astype(np.int64)
+        cells, segments = [], []
+        # Register each segment in every cell of its bounding box, spread to the 3x3 neighbourhood
+        for dx in range(-1, int((last - first)[:, 0].max()) + 2):
+            for dy in range(-1, int((last - first)[:, 1].max()) + 2):
+                inside = (dx <= last[:, 0] - first[:, 0] + 1) & (dy <= last[:, 1] - first[:, 1] + 1)
+                rows = np.flatnonzero(inside)
+                cells.append((first[rows, 0] + dx) * self.shape[1] + first[rows, 1] + dy)
+                segments.append(rows)
+        pairs = np.unique(np.column_stack((np.concatenate(cells), np.concatenate(segments))), axis=0)
+        
+        counts = np.bincount(pairs[:, 0], minlength=int(self.shape.prod()))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        rank = np.arange(len(pairs)) - offsets[pairs[:, 0]]
+        self.candidates = np.full((len(counts), max(1, int(counts.max()))), -1, dtype=np.int64)
+        self.candidates[pairs[:, 0], rank] = pairs[:, 1]
+    
+    def _nearest(self, points: np.ndarray, candidates: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Find the nearest of each sample's candidate segments.
+        
+        :param points: (N, 2) ground-plane positions
+        :param candidates: (N, K) segment indices, -1 for padding
+        :returns: Dictionary with 'segment', 't' (position along the segment) and 'distance_squared'
+        """
+        take = np.clip(candidates, 0, None)
+        starts = self.starts[take]
+        vectors = self.vectors[take]
+        relative = points[:, None, :] - starts
+        t = np.clip(np.einsum("nkd,nkd->nk", relative, vectors) / self.lengths_squared[take], 0.0, 1.0)
+        gap = relative - t[..., None] * vectors
+        distance_squared = np.einsum("nkd,nkd->nk", gap, gap)
+        distance_squared[candidates < 0] = np.inf
+        best = np.argmin(distance_squared, axis=1)
+        rows = np.arange(len(points))
+        return {
+            "segment": candidates[rows, best],
+            "t": t[rows, best],
+            "distance_squared": distance_squared[rows, best],
+        }
+    
+    def _search_grid(self, points: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Exact nearest-segment search for any number of samples.
+        
+        Samples further than one cell from every candidate (or outside the
+        grid) are compared against all segments.
+        
+        :param points: (N, 2) ground-plane positions without NaN
+        :returns: As _nearest
+        """
+        result = {
+            "segment": np.empty(len(points), dtype=np.int64),
+            "t": np.empty(len(points)),
+            "distance_squared": np.empty(len(points)),
+        }
+        cell = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        inside = np.all((cell >= 0) & (cell < self.shape), axis=1)
+        cell_id = np.where(inside, cell[:, 0] * self.shape[1] + cell[:, 1], 0)
+        for lo in range(0, len(points), _CHUNK):
+            hi = min(lo + _CHUNK, len(points))
+            found = self._nearest(points[lo:hi], self.candidates[cell_id[lo:hi]])
+            for name, values in found.items():
+                result[name][lo:hi] = values
+        
+        # Anything within one cell size was guaranteed to be a candidate
+        missed = np.flatnonzero(~inside | (result["distance_squared"] > self.cell_size ** 2))
+        every = np.arange(len(self))
+        step = max(1, _CHUNK * 16 // max(1, len(self)))
+        for lo in range(0, len(missed), step):
+            rows = missed[lo:lo + step]
+            found = self._nearest(points[rows], np.broadcast_to(every, (len(rows), len(every))))
+            for name, values in found.items():
+                result[name][rows] = values
+        return result
+    
+    def _search_window(self, points: np.ndarray, centers: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+        """
+        Nearest-segment search restricted to segments around an expected one.
+        
+        :param points: (N, 2) ground-plane positions
+        :param centers: Expected segment index per sample
+        :param window: Segments searched on either side of the expected one
+        :returns: As _nearest
+        """
+        candidates = (centers[:, None] + np.arange(-window, window + 1)) % len(self)
+        return self._nearest(points, candidates)
+    
+    def _wrapped_steps(self, distance: np.ndarray) -> np.ndarray:
+        """
+        Signed change in track distance between consecutive samples, taking the short way round.
+        
+        :param distance: Track distances in [0, length)
+        :returns: Array one shorter than distance
+        """
+        length = self.centerline.length
+        return (np.diff(distance) + length / 2) % length - length / 2
+    
+    def project(
+        self,
+        positions: np.ndarray,
+        continuous: bool = False,
+        max_jump: float = 500.0,
+        min_run: int = 5
+    ) -> Dict[str, np.ndarray]:
+        """
+        Project positions onto the centerline.
+        
+        :param positions: (N, D) positions (the index's ground-plane axes are used)
+        :param continuous: If True, treat samples as one car's time-ordered path and re-search
+                           runs shorter than ``min_run`` samples that jump more than ``max_jump``
+                           along the track, near the distance implied by their neighbours
+        :param max_jump: Largest plausible change in track distance between consecutive samples
+        :param min_run: Runs of hits at least this long are trusted in continuous mode
+        :returns: Dictionary with 'distance' (track distance in [0, length)), 'offset' (signed
+                  lateral distance, positive to the left of the direction of travel) and
+                  'segment' (int64, -1 where the position is missing); NaN where missing
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        points = positions[:, self.axes] if positions.ndim == 2 else np.empty((0, 2))
+        valid = ~np.isnan(points).any(axis=1)
+        rows = np.flatnonzero(valid)
+        points = points[rows]
+        found = self._search_grid(points)
+        
+        if continuous and len(rows) > min_run:
+            distance = self._distance(found)
+            jumps = np.abs(self._wrapped_steps(distance)) > max_jump
+            run = np.concatenate(([0], np.cumsum(jumps)))
+            trusted = np.bincount(run)[run] >= min_run
+            if trusted.any() and not trusted.all():
+                # Expected distance from the trusted samples, unwrapped so laps keep counting up
+                good = np.flatnonzero(trusted)
+                unwrapped = distance[good[0]] + np.concatenate(([0.0], np.cumsum(self._wrapped_steps(distance[good]))))
+                suspect = np.flatnonzero(~trusted)
+                expected = np.interp(suspect, good, unwrapped) % self.centerline.length
+                centers = np.clip(np.searchsorted(self.segment_distance, expected, side="right") - 1, 0, len(self) - 1)
+                # Half a jump either side: hits further out would be a jump from a neighbour
+                window = int(np.ceil(max_jump / 2 / max(np.diff(self.segment_distance).min(), 1e-9)))
+                refound = self._search_window(points[suspect], centers, min(window, len(self) // 2))
+                for name, values in refound.items():
+                    found[name][suspect] = values
+        
+        segment = found["segment"]
+        vectors = self.vectors[segment]
+        feet = self.starts[segment] + found["t"][:, None] * vectors
+        side = np.sign(vectors[:, 0] * (points[:, 1] - feet[:, 1]) - vectors[:, 1] * (points[:, 0] - feet[:, 0]))
+        
+        result = {
+            "distance": np.full(len(positions), np.nan),
+            "offset": np.full(len(positions), np.nan),
+            "segment": np.full(len(positions), -1, dtype=np.int64),
+        }
+        result["distance"][rows] = self._distance(found)
+        result["offset"][rows] = side * np.sqrt(found["distance_squared"])
+        result["segment"][rows] = segment
+        return result
+    
+    def _distance(self, found: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Convert segment hits to track distances.
+        
+        :param found: Result of a search
+        :returns: Track distances in [0, length)
+        """
+        segment = found["segment"]
+        start = self.segment_distance[segment]
+        distance = start + found["t"] * (self.segment_distance[segment + 1] - start)
+        return distance % self.centerline.length
+    
+    def project_frame(
+        self,
+        frame: TelemetryFrame,
+        continuous: bool = True,
+        max_jump: float = 500.0,
+        min_run: int = 5
+    ) -> Dict[str, np.ndarray]:
+        """
+        Project a telemetry frame, e.g. from get_time_and_location.
+        
+        In continuous mode each driver's samples are taken in time order.
+        
+        :param frame: Samples for one or more drivers
+        :param continuous: Use the continuity-aware mode (see project())
+        :param max_jump: Largest plausible change in track distance between consecutive samples
+        :param min_run: Runs of hits at least this long are trusted in continuous mode
+        :returns: As project(), plus the frame's 'time' and 'driver_number', in the frame's row order
+        """
+        positions = frame.positions
+        if not continuous:
+            result = self.project(positions)
+        else:
+            result = {
+                "distance": np.full(len(frame), np.nan),
+                "offset": np.full(len(frame), np.nan),
+                "segment": np.full(len(frame), -1, dtype=np.int64),
+            }
+            order = np.lexsort((frame.time, frame.driver_number))
+            drivers = frame.driver_number[order]
+            bounds = np.flatnonzero(np.diff(drivers)) + 1
+            for rows in np.split(order, bounds):
+                projected = self.project(positions[rows], continuous=True, max_jump=max_jump, min_run=min_run)
+                for name, values in projected.items():
+                    result[name][rows] = values
+        result["time"] = frame.time
+        result["driver_number"] = frame.driver_number
+        return result
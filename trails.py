@@ -0,0 +1,238 @@
+"""
+Bounded trails behind moving cars.
+
+TrailBuffer keeps the most recent positions of every car in one
+preallocated NumPy ring buffer. Each sample is written twice, at its slot
+and one capacity further on, so the trail in oldest-to-newest order is
+always a contiguous view of the buffer: a push is O(1) per car, reading
+the trail copies nothing, and memory is fixed by the capacity rather than
+growing with the length of the race.
+"""
+from typing import Optional, Tuple, Any, Sequence
+
+import numpy as np
+
+
+def trail_capacity(samples: Optional[int] = None, seconds: Optional[float] = None, rate: float = 60.0) -> int:
+    """
+    Number of slots needed for a trail given by samples or by time.
+    
+    :param samples: Trail length in samples (takes precedence)
+    :param seconds: Trail length in seconds of playback
+    :param rate: Expected pushes per second of playback, for a trail given in seconds
+    :returns: Capacity of at least 2
+    """
+    if samples is not None:
+        return max(2, int(samples))
+    if seconds is not None:
+        return max(2, int(np.ceil(seconds * rate)) + 1)
+    raise ValueError("Either samples or seconds is required")
+
+
+class TrailBuffer:
+    """
+    Fixed-size ring buffer of recent positions for one or more cars.
+    """
+    
+    def __init__(self, cars: int, capacity: int, dims: int = 3, seconds: Optional[float] = None):
+        """
+        Allocate the buffer; all cars are pushed together, one sample per call.
+        
+        :param cars: Number of cars
+        :param capacity: Maximum samples kept per car
+        :param dims: Position dimensions
+        :param seconds: If set, also drop samples older than this (push() then needs a time)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.cars = cars
+        self.capacity = capacity
+        self.dims = dims
+        self.seconds = seconds
+        self._positions = np.full((cars, 2 * capacity, dims), np.nan)
+        self._times = np.full(2 * capacity, np.nan)
+        self._next = 0
+        self._count = 0
+    
+    @classmethod
+    def for_duration(cls, cars: int, seconds: float, rate: float, dims: int = 3) -> "TrailBuffer":
+        """
+        Create a buffer for a trail measured in seconds.
+        
+        :param cars: Number of cars
+        :param seconds: Trail length in seconds of playback
+        :param rate: Expected pushes per second of playback (e.g. frame rate / speed multiplier)
+        :param dims: Position dimensions
+        :returns: TrailBuffer sized for the expected rate and trimmed by time
+        """
+        return cls(cars, trail_capacity(seconds=seconds, rate=rate), dims=dims, seconds=seconds)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def clear(self) -> None:
+        """Drop every sample, e.g. after a seek."""
+        self._next = 0
+        self._count = 0
+    
+    def push(self, positions: np.ndarray, time: Optional[float] = None) -> None:
+        """
+        Append one sample per car, overwriting the oldest when full.
+        
+        :param positions: (cars, dims) positions, or (dims,) for a single car; NaN leaves a gap
+        :param time: Sample time in seconds (required when the buffer trims by seconds)
+        """
+        if self.seconds is not None and time is None:
+            raise ValueError("time is required for a trail measured in seconds")
+        positions = np.reshape(positions, (self.cars, self.dims))
+        slot = self._next
+        self._positions[:, slot] = positions
+        self._positions[:, slot + self.capacity] = positions
+        self._times[slot] = self._times[slot + self.capacity] = np.nan if time is None else time
+        self._next = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+    
+    def extend(self, positions: np.ndarray, times: Optional[np.ndarray] = None) -> None:
+        """
+        Append several samples per car, e.g. every sample skipped over since the last frame.
+        
+        Only the newest ``capacity`` samples are written.
+        
+        :param positions: (cars, k, dims) positions, or (k, dims) for a single car
+        :param times: (k,) sample times in seconds
+        """
+        if self.seconds is not None and times is None:
+            raise ValueError("times are required for a trail measured in seconds")
+        positions = np.reshape(positions, (self.cars, -1, self.dims))
+        start = max(0, positions.shape[1] - self.capacity)
+        count = positions.shape[1] - start
+        slots = (self._next + np.arange(count)) % self.capacity
+        for offset in (0, self.capacity):
+            self._positions[:, slots + offset] = positions[:, start:]
+            self._times[slots + offset] = np.nan if times is None else np.asarray(times)[start:]
+        self._next = (self._next + count) % self.capacity
+        self._count = min(self._count + count, self.capacity)
+    
+    def _start(self) -> int:
+        """
+        Slot of the oldest sample kept, after trimming by seconds.
+        """
+        start = (self._next - self._count) % self.capacity
+        if self.seconds is None or self._count < 2:
+            return start
+        times = self._times[start:start + self._count]
+        # Age from the newest sample either way round, so reverse playback keeps its trail
+        stale = np.flatnonzero(np.abs(times - times[-1]) > self.seconds)
+        return start + (stale[-1] + 1 if len(stale) else 0)
+    
+    def window(self) -> np.ndarray:
+        """
+        Current trail of every car, oldest sample first.
+        
+        :returns: (cars, n, dims) read-only view into the buffer (valid until the next push)
+        """
+        end = (self._next - self._count) % self.capacity + self._count
+        view = self._positions[:, self._start():end]
+        view.flags.writeable = False
+        return view
+    
+    def times(self) -> np.ndarray:
+        """
+        Times of the samples in window().
+        
+        :returns: (n,) view of sample times (NaN where pushed without a time)
+        """
+        end = (self._next - self._count) % self.capacity + self._count
+        return self._times[self._start():end]
+
+
+def trail_segments(
+    trails: np.ndarray,
+    colors: Sequence[Any],
+    alpha: float = 0.6,
+    fade: bool = True,
+    min_alpha: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split trails into line segments with per-segment colours, for a (Line3D)Collection.
+    
+    :param trails: (cars, n, dims) positions, oldest first (e.g. TrailBuffer.window())
+    :param colors: One colour per car (any matplotlib colour spec)
+    :param alpha: Opacity of the newest segment
+    :param fade: If True, fade linearly to ``min_alpha`` at the oldest segment
+    :param min_alpha: Opacity of the oldest segment when fading
+    :returns: (segments, rgba) with shapes (cars * (n - 1), 2, dims) and (cars * (n - 1), 4)
+    """
+    from matplotlib.colors import to_rgba_array
+    
+    trails = np.asarray(trails)
+    cars, count, dims = trails.shape
+    steps = max(count - 1, 0)
+    segments = np.stack((trails[:, :-1], trails[:, 1:]), axis=2).reshape(cars * steps, 2, dims)
+    rgba = np.repeat(to_rgba_array(colors), steps, axis=0)
+    if fade and steps:
+        rgba[:, 3] = np.tile(np.linspace(min_alpha, alpha, steps), cars)
+    else:
+        rgba[:, 3] = alpha
+    return segments, rgba
+
+
+class TrailArtist:
+    """
+    One line collection drawing the trails of any number of cars.
+    """
+    
+    def __init__(
+        self,
+        ax,
+        colors: Sequence[Any],
+        linewidth: float = 1.5,
+        alpha: float = 0.6,
+        fade: bool = False,
+        label: Optional[str] = None
+    ):
+        """
+        Create the collection once; update() only replaces its segments.
+        
+        :param ax: Matplotlib axes (2D, or 3D from projection='3d')
+        :param colors: One colour per car (any matplotlib colour spec)
+        :param linewidth: Line width
+        :param alpha: Trail opacity (of the newest segment when fading)
+        :param fade: If True, trails fade out towards their oldest sample
+        :param label: Legend label
+        """
+        from matplotlib.collections import LineCollection
+        
+        self.is_3d = getattr(ax, "name", "") == "3d"
+        self.dims = 3 if self.is_3d else 2
+        self.colors = colors
+        self.alpha = alpha
+        self.fade = fade
+        # Faded trails carry their opacity in the per-segment colours
+        collection_alpha = None if fade else alpha
+        empty = np.zeros((0, 2, self.dims))
+        if self.is_3d:
+            from mpl_toolkits.mplot3d.art3d import Line3DCollection
+            self.collection = Line3DCollection(empty, colors=colors, linewidths=linewidth,
+                                               alpha=collection_alpha, label=label)
+        else:
+            self.collection = LineCollection(empty, colors=colors, linewidths=linewidth,
+                                             alpha=collection_alpha, label=label)
+        ax.add_collection(self.collection, autolim=False)
+    
+    def update(self, trails: Any) -> Any:
+        """
+        Replace the drawn trails.
+        
+        :param trails: (cars, n, dims) array oldest first (e.g. TrailBuffer.window()) or,
+                       without fading, a list of (n, dims) arrays
+        :returns: The collection
+        """
+        if self.fade:
+            segments, rgba = trail_segments(np.asarray(trails)[:, :, :self.dims], self.colors,
+                                            alpha=self.alpha)
+            self.collection.set_segments(segments)
+            self.collection.set_color(rgba)
+        else:
+            self.collection.set_segments([trail[:, :self.dims] for trail in trails])
+        return self.collection